@@ -0,0 +1,18 @@
+"""
+ASGI config for the tictactoe project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+The session event streams need this entry point, e.g.
+``uvicorn asgi:application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'settings.settings_docker')
+
+application = get_asgi_application()
@@ -0,0 +1,3 @@
+#!/bin/bash
+
+python manage.py benchmark --settings=settings.settings_benchmark "$@"
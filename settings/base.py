@@ -52,6 +52,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'tictactoe.middleware.PlayerTokenMiddleware',
 ]
 
 ROOT_URLCONF = 'urls'
@@ -75,6 +76,8 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'wsgi.application'
 
+ASGI_APPLICATION = 'asgi.application'
+
 
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
@@ -135,6 +138,11 @@ EMAIL_PORT = env.int('EMAIL_PORT', 587)
 
 FROM_EMAIL = env.str("FROM_EMAIL", "admin@localhost.tld")
 
+# Attempts to send an outbox mail, the delay before the second one doubles after every failure
+TICTACTOE_OUTBOX_MAX_ATTEMPTS = env.int('TICTACTOE_OUTBOX_MAX_ATTEMPTS', 5)
+
+TICTACTOE_OUTBOX_RETRY_DELAY = env.int('TICTACTOE_OUTBOX_RETRY_DELAY', 60)
+
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': (
         'djangorestframework_camel_case.render.CamelCaseJSONRenderer',
@@ -151,3 +159,106 @@ REST_FRAMEWORK = {
 }
 
 TICTACTOE_PLAYER_SYMBOLS = ('X', 'O')
+
+TICTACTOE_MAX_BOARD_SIZE = 19
+
+# Maximum number of sessions created by one provisioning request
+TICTACTOE_PROVISION_MAX_SESSIONS = env.int('TICTACTOE_PROVISION_MAX_SESSIONS', 10000)
+
+TICTACTOE_ENGINES = {
+    'basic': 'tictactoe.engines.basic.BasicEngine',
+    'negamax': 'tictactoe.engines.negamax.NegamaxEngine',
+    'search': 'tictactoe.engines.search.SearchEngine',
+    'mcts': 'tictactoe.engines.mcts.MonteCarloEngine',
+    'tablebase': 'tictactoe.engines.tablebase.TablebaseEngine',
+}
+
+TICTACTOE_ENGINE = env.str('TICTACTOE_ENGINE', 'basic')
+
+# Seconds the search engine may think per computer move
+TICTACTOE_ENGINE_MOVE_TIME = env.float('TICTACTOE_ENGINE_MOVE_TIME', 0.5)
+
+# Maximum number of positions kept in the search engine's transposition table
+TICTACTOE_ENGINE_TABLE_SIZE = env.int('TICTACTOE_ENGINE_TABLE_SIZE', 200000)
+
+# Seed for reproducible engine moves, random when unset
+TICTACTOE_ENGINE_SEED = env.int('TICTACTOE_ENGINE_SEED', None)
+
+# Playouts per computer move and the number of processes running them
+TICTACTOE_MCTS_SIMULATIONS = env.int('TICTACTOE_MCTS_SIMULATIONS', 2000)
+
+TICTACTOE_MCTS_WORKERS = env.int('TICTACTOE_MCTS_WORKERS', 1)
+
+# Threads replying to human moves after the move is committed, 0 replies within the request.
+# Replies beyond the queue size are played within the request that made the move.
+TICTACTOE_COMPUTER_MOVE_WORKERS = env.int('TICTACTOE_COMPUTER_MOVE_WORKERS', 0)
+
+TICTACTOE_COMPUTER_MOVE_QUEUE_SIZE = env.int('TICTACTOE_COMPUTER_MOVE_QUEUE_SIZE', 100)
+
+# Seconds after which a computer reply that was not played is queued again
+TICTACTOE_COMPUTER_MOVE_TIMEOUT = env.int('TICTACTOE_COMPUTER_MOVE_TIMEOUT', 30)
+
+# Threads computing the replies to the likely human moves while the human thinks, 0 disables pondering
+TICTACTOE_PONDER_WORKERS = env.int('TICTACTOE_PONDER_WORKERS', 0)
+
+TICTACTOE_PONDER_QUEUE_SIZE = env.int('TICTACTOE_PONDER_QUEUE_SIZE', 100)
+
+TICTACTOE_PONDER_MIN_BOARD_SIZE = env.int('TICTACTOE_PONDER_MIN_BOARD_SIZE', 7)
+
+# Human moves pondered per position and the replies kept across all games
+TICTACTOE_PONDER_MOVES = env.int('TICTACTOE_PONDER_MOVES', 4)
+
+TICTACTOE_PONDER_CACHE_SIZE = env.int('TICTACTOE_PONDER_CACHE_SIZE', 10000)
+
+# Directory holding the files written by the build_tablebase command
+TICTACTOE_TABLEBASE_DIR = env.str('TICTACTOE_TABLEBASE_DIR', str(PROJECT_DIR.path('tablebases')))
+
+# Baseline numbers the benchmark command compares against
+TICTACTOE_BENCHMARK_BASELINE = str(PROJECT_DIR.path('benchmarks', 'baseline.json'))
+
+# Delivers session events to the event streams of every worker
+TICTACTOE_NOTIFICATION_BACKEND = env.str(
+    'TICTACTOE_NOTIFICATION_BACKEND', 'tictactoe.notifications.memory.InMemoryBackend'
+)
+
+# Seconds between keep-alive comments on idle event streams
+TICTACTOE_EVENTS_KEEPALIVE = env.float('TICTACTOE_EVENTS_KEEPALIVE', 15)
+
+# Seconds after which an event stream is closed and the client reconnects
+TICTACTOE_EVENTS_TIMEOUT = env.float('TICTACTOE_EVENTS_TIMEOUT', 300)
+
+# Cache of serialized game states: entries and seconds kept in each process,
+# the Django cache behind it and seconds kept there
+TICTACTOE_GAME_CACHE_SIZE = env.int('TICTACTOE_GAME_CACHE_SIZE', 10000)
+
+TICTACTOE_GAME_CACHE_TTL = env.float('TICTACTOE_GAME_CACHE_TTL', 2)
+
+TICTACTOE_GAME_CACHE_ALIAS = env.str('TICTACTOE_GAME_CACHE_ALIAS', 'default')
+
+TICTACTOE_GAME_CACHE_TIMEOUT = env.int('TICTACTOE_GAME_CACHE_TIMEOUT', 300)
+
+TICTACTOE_SESSION_HANDLERS = {
+    'session': 'tictactoe.session.SessionHandler',
+    'token': 'tictactoe.session.TokenSessionHandler',
+}
+
+# Keep the player of a game session in the Django session or in a signed token
+TICTACTOE_SESSION_HANDLER = env.str('TICTACTOE_SESSION_HANDLER', 'session')
+
+# Seconds a player token stays valid
+TICTACTOE_PLAYER_TOKEN_MAX_AGE = env.int('TICTACTOE_PLAYER_TOKEN_MAX_AGE', 60 * 60 * 24 * 30)
+
+# Days after which the archive_games command archives finished games and
+# deletes sessions without activity
+TICTACTOE_ARCHIVE_AFTER_DAYS = env.int('TICTACTOE_ARCHIVE_AFTER_DAYS', 30)
+
+TICTACTOE_SESSION_RETENTION_DAYS = env.int('TICTACTOE_SESSION_RETENTION_DAYS', 90)
+
+# Pairs the players waiting for a human opponent
+TICTACTOE_MATCHMAKER = env.str('TICTACTOE_MATCHMAKER', 'tictactoe.matchmaking.memory.InMemoryMatchmaker')
+
+# Seconds a waiting player stays in the queue without polling the ticket,
+# and seconds a matched ticket can still be read
+TICTACTOE_MATCHMAKING_TICKET_TTL = env.float('TICTACTOE_MATCHMAKING_TICKET_TTL', 30)
+
+TICTACTOE_MATCHMAKING_MATCHED_TTL = env.float('TICTACTOE_MATCHMAKING_MATCHED_TTL', 300)
@@ -12,6 +12,12 @@ DATABASES = {
     }
 }
 
+TICTACTOE_NOTIFICATION_BACKEND = env.str(
+    'TICTACTOE_NOTIFICATION_BACKEND', 'tictactoe.notifications.postgres.PostgresBackend'
+)
+
+TICTACTOE_MATCHMAKER = env.str('TICTACTOE_MATCHMAKER', 'tictactoe.matchmaking.database.DatabaseMatchmaker')
+
 MEDIA_ROOT = '/home/media'
 MEDIA_URL = '/media/'
 STATIC_ROOT = '/home/static'
@@ -4,4 +4,6 @@ DEBUG = False
 
 TEST = True
 
+TICTACTOE_NOTIFICATION_BACKEND = 'tictactoe.notifications.memory.InMemoryBackend'
+
 MEDIA_ROOT = '/home/media/tests'
@@ -0,0 +1,86 @@
+import uuid
+
+import factory
+from django.conf import settings
+
+from tictactoe import models
+from tictactoe.fields import BitBoard, Symbol
+
+
+class GameSessionFactory(factory.django.DjangoModelFactory):
+
+    name = factory.Sequence(lambda n: f'Board {n}')
+
+    session_id = factory.LazyFunction(uuid.uuid4)
+
+    class Meta:
+        model = models.GameSession
+
+
+class PlayerFactory(factory.django.DjangoModelFactory):
+
+    name = factory.Sequence(lambda n: f'Player {n}')
+
+    player_id = factory.LazyFunction(uuid.uuid4)
+
+    symbol = Symbol(settings.TICTACTOE_PLAYER_SYMBOLS[0])
+
+    class Meta:
+        model = models.Player
+
+
+class SessionPlayerFactory(factory.django.DjangoModelFactory):
+
+    session = factory.SubFactory(GameSessionFactory)
+
+    player = factory.SubFactory(PlayerFactory)
+
+    class Meta:
+        model = models.SessionPlayer
+
+
+class ComputerPlayerFactory(factory.django.DjangoModelFactory):
+
+    session = factory.SubFactory(GameSessionFactory)
+
+    player = factory.SubFactory(
+        PlayerFactory, name='Computer', symbol=Symbol(settings.TICTACTOE_PLAYER_SYMBOLS[1])
+    )
+
+    engine = 'negamax'
+
+    class Meta:
+        model = models.ComputerPlayer
+
+
+class GameFactory(factory.django.DjangoModelFactory):
+
+    session = factory.SubFactory(GameSessionFactory)
+
+    board_size = factory.SelfAttribute('session.board_size')
+
+    win_length = factory.SelfAttribute('session.win_length')
+
+    board = factory.LazyAttribute(lambda o: BitBoard.empty(o.board_size, o.win_length))
+
+    is_active = True
+
+    class Meta:
+        model = models.Game
+
+
+def create_session(computer: bool = True, **kwargs):
+    """
+    Create a session with an owner and a computer or human opponent, and an
+    active game started by the owner.
+    """
+    session = GameSessionFactory(**kwargs)
+    owner = SessionPlayerFactory(session=session, owner=True).player
+    if computer:
+        opponent = ComputerPlayerFactory(session=session).player
+    else:
+        opponent = SessionPlayerFactory(
+            session=session, player__symbol=Symbol(settings.TICTACTOE_PLAYER_SYMBOLS[1])
+        ).player
+    GameFactory(session=session, active_player=owner)
+    return session, owner, opponent
@@ -0,0 +1,163 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tests.tictactoe.factories import create_session
+from tictactoe.cache import game_cache
+from tictactoe.models import Game
+from tictactoe.session import SessionHandlerFactory
+from tictactoe.workers import BoundedExecutor
+
+
+class ApiTestCase(TestCase):
+
+    def login(self, session, player):
+        client_session = self.client.session
+        client_session[SessionHandlerFactory.create(session, None)._make_key('player_id')] = str(player.player_id)
+        client_session.save()
+
+
+class TestQueryBudget(ApiTestCase):
+
+    budget = 3
+
+    session_budget = 2
+
+    def test_session_handler_get(self):
+        for computer in (True, False):
+            session, owner, opponent = create_session(computer=computer)
+            self.login(session, owner)
+            with self.assertNumQueries(self.session_budget):
+                response = self.client.get(reverse('tictactoe:api:session_handler', args=[session.session_id]))
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.json()['isReady'])
+
+    def test_game_handler_get(self):
+        for computer in (True, False):
+            session, owner, opponent = create_session(computer=computer)
+            self.login(session, owner)
+            url = reverse('tictactoe:api:game_handler', args=[session.session_id])
+            self.client.post(url, {'coords': [0, 0]}, content_type='application/json')
+            if not computer:
+                self.login(session, opponent)
+                self.client.post(url, {'coords': [1, 1]}, content_type='application/json')
+            with self.assertNumQueries(self.budget):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertEqual(data['numSymbols'], 2)
+            self.assertEqual(data['isActivePlayer'], computer)
+
+    def test_game_handler_get_winner(self):
+        session, owner, opponent = create_session(computer=False)
+        url = reverse('tictactoe:api:game_handler', args=[session.session_id])
+        for player, coords in zip([owner, opponent] * 3, [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]):
+            self.login(session, player)
+            self.client.post(url, {'coords': coords}, content_type='application/json')
+        with self.assertNumQueries(self.budget):
+            response = self.client.get(url)
+        self.assertEqual(response.json()['winner'], owner.name)
+
+
+class TestNewGame(ApiTestCase):
+
+    def test_stale_game_conflicts(self):
+        session, owner, opponent = create_session(computer=False)
+        self.login(session, owner)
+        game = session.game
+        Game.objects.filter(pk=game.pk).update(version=5)
+        with mock.patch('tictactoe.api.loaders.GameSessionLoader.game', game):
+            response = self.client.post(reverse('tictactoe:api:session_handler', args=[session.session_id]))
+        self.assertEqual(response.status_code, 409)
+        game.refresh_from_db()
+        self.assertEqual((game.is_active, game.version), (True, 5))
+
+        response = self.client.post(reverse('tictactoe:api:session_handler', args=[session.session_id]))
+        self.assertEqual(response.status_code, 201)
+        game.refresh_from_db()
+        self.assertEqual((game.is_active, game.version), (False, 6))
+
+
+class TestMoves(ApiTestCase):
+
+    def test_since(self):
+        session, owner, opponent = create_session(computer=True)
+        self.login(session, owner)
+        url = reverse('tictactoe:api:game_handler', args=[session.session_id])
+        self.client.post(url, {'coords': [1, 1]}, content_type='application/json')
+        coords = next(
+            (x, y) for x, row in enumerate(session.game.board.as_list) for y, value in enumerate(row) if value is None
+        )
+        self.client.post(url, {'coords': coords}, content_type='application/json')
+
+        game = session.game
+        self.assertEqual(list(game.moves.values_list('number', flat=True)), [1, 2, 3, 4])
+        self.assertEqual(game.replay().board.as_list, game.board.as_list)
+
+        data = self.client.get(url, {'since': 2}).json()
+        self.assertNotIn('board', data)
+        self.assertEqual([move['coords'] for move in data['moves']], [list(coords), list(game.moves.get(number=4).coords)])
+        self.assertEqual([move['symbol'] for move in data['moves']], ['X', 'O'])
+        self.assertEqual(self.client.get(url, {'since': 4}).json()['moves'], [])
+        self.assertEqual(self.client.get(url, {'since': -1}).status_code, 400)
+
+    @override_settings(TICTACTOE_COMPUTER_MOVE_WORKERS=1, TICTACTOE_COMPUTER_MOVE_TIMEOUT=30)
+    def test_resume_lost_reply(self):
+        session, owner, opponent = create_session(computer=True)
+        self.login(session, owner)
+        url = reverse('tictactoe:api:game_handler', args=[session.session_id])
+        # The reply is never queued, as if the worker exited before replying
+        with self.captureOnCommitCallbacks():
+            self.client.post(url, {'coords': [1, 1]}, content_type='application/json')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(session.game.num_symbols, 1)
+
+        executor = BoundedExecutor('computer_moves', 0, 0)
+        with override_settings(TICTACTOE_COMPUTER_MOVE_TIMEOUT=-1), \
+                mock.patch('tictactoe.game.get_computer_moves', return_value=executor):
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(session.game.num_symbols, 2)
+
+
+class TestConditionalGet(ApiTestCase):
+
+    def test_game_handler(self):
+        session, owner, opponent = create_session(computer=False)
+        self.login(session, owner)
+        url = reverse('tictactoe:api:game_handler', args=[session.session_id])
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        game_cache.invalidate(session.session_id)
+        with self.assertNumQueries(2):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertNotEqual(self.client.get(url, {'since': 0})['ETag'], etag)
+
+        self.client.post(url, {'coords': [0, 0]}, content_type='application/json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        self.login(session, opponent)
+        self.assertNotEqual(self.client.get(url)['ETag'], response['ETag'])
+
+    def test_session_handler(self):
+        session, owner, opponent = create_session(computer=False)
+        self.login(session, owner)
+        url = reverse('tictactoe:api:session_handler', args=[session.session_id])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        session.player_session.filter(owner=False).delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()['isReady'])
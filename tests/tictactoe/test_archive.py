@@ -0,0 +1,87 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from tests.tictactoe.factories import GameFactory, create_session
+from tictactoe.fields import Symbol, pack_moves, unpack_moves
+from tictactoe.game import GameHandlerFactory
+from tictactoe.models import ArchivedGame, Game, GameSession, Move, Player
+
+
+class TestArchive(TestCase):
+
+    def age(self, days, sessions=(), games=()):
+        time = timezone.now() - timedelta(days=days)
+        GameSession.objects.filter(pk__in=[session.pk for session in sessions]).update(session_time=time)
+        Game.objects.filter(pk__in=[game.pk for game in games]).update(game_time=time)
+
+    def test_pack_moves(self):
+        moves = [((0, 0), Symbol.X), ((18, 18), Symbol.O), ((3, 7), Symbol.X)]
+        self.assertEqual(unpack_moves(pack_moves(moves, 19), 19), moves)
+
+    def test_archive_games(self):
+        session, owner, opponent = create_session(computer=False)
+        game = session.game
+        for coords in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+            GameHandlerFactory.create(session.game).add_symbol(coords)
+        game.refresh_from_db()
+        game.is_active = False
+        game.save()
+        active = GameFactory(session=session, active_player=owner)
+        self.age(60, sessions=[session], games=[game, active])
+
+        stdout = io.StringIO()
+        call_command('archive_games', '--batch-size', '1', stdout=stdout)
+        self.assertIn('Archived 1 games in 1 batches', stdout.getvalue())
+        self.assertIn('rows/s', stdout.getvalue())
+
+        self.assertEqual(list(Game.objects.all()), [active])
+        self.assertFalse(Move.objects.exists())
+        archived = ArchivedGame.objects.get()
+        self.assertEqual((archived.game_id, archived.session_id), (game.pk, session.session_id))
+        self.assertEqual(archived.winner, Symbol.X)
+        self.assertEqual(archived.board.as_list, game.board.as_list)
+        self.assertEqual(archived.replay().board.as_list, game.board.as_list)
+
+        call_command('archive_games', stdout=io.StringIO())
+        self.assertEqual(ArchivedGame.objects.count(), 1)
+
+    def test_keeps_active_ended_game(self):
+        session, owner, opponent = create_session(computer=False)
+        for coords in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+            GameHandlerFactory.create(session.game).add_symbol(coords)
+        self.age(60, sessions=[session], games=[session.game])
+        call_command('archive_games', '--expire-after', '365', stdout=io.StringIO())
+        self.assertTrue(session.game.is_ended)
+        self.assertFalse(ArchivedGame.objects.exists())
+
+    def test_rebuild_scores_counts_archived_games(self):
+        session, owner, opponent = create_session(computer=False)
+        for coords in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+            GameHandlerFactory.create(session.game).add_symbol(coords)
+        Game.objects.update(is_active=False)
+        GameFactory(session=session, active_player=opponent)
+        for coords in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+            GameHandlerFactory.create(session.game).add_symbol(coords)
+        self.age(60, sessions=[session], games=Game.objects.filter(is_active=False))
+        call_command('archive_games', '--expire-after', '365', stdout=io.StringIO())
+        self.assertEqual(ArchivedGame.objects.count(), 1)
+
+        GameSession.objects.update(owner_score=0, opponent_score=0)
+        call_command('rebuild_scores', stdout=io.StringIO())
+        session.refresh_from_db()
+        self.assertEqual((session.owner_score, session.opponent_score), (1, 1))
+
+    def test_expire_sessions(self):
+        sessions = [create_session(computer=computer)[0] for computer in (True, False, True)]
+        self.age(120, sessions=sessions, games=[sessions[0].game, sessions[1].game])
+        self.age(120, sessions=[sessions[2]])
+
+        stdout = io.StringIO()
+        call_command('archive_games', '--batch-size', '1', '--limit', '5', stdout=stdout)
+        self.assertIn('Deleted 2 sessions in 2 batches', stdout.getvalue())
+        self.assertEqual(list(GameSession.objects.all()), [sessions[2]])
+        self.assertEqual(Player.objects.count(), 2)
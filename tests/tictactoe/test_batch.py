@@ -0,0 +1,41 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from tictactoe import batch
+from tictactoe.fields import Board, Symbol
+
+
+class TestBatch(SimpleTestCase):
+
+    def assert_matches_boards(self, boards, win_length):
+        result = batch.evaluate(boards, win_length)
+        for index, board in enumerate(batch.to_boards(boards, win_length)):
+            x_wins, o_wins = board.has_series_complete(Symbol.X), board.has_series_complete(Symbol.O)
+            expected = batch.X if x_wins else batch.O if o_wins else batch.EMPTY
+            self.assertEqual(result.winners[index], expected)
+            self.assertEqual(result.draws[index], not x_wins and not o_wins and board.is_full)
+            legal = [
+                [symbol == Symbol.N and not x_wins and not o_wins for symbol in row]
+                for row in board.rows
+            ]
+            self.assertEqual(result.legal_moves[index].tolist(), legal)
+
+    def test_evaluate(self):
+        rng = np.random.default_rng(0)
+        self.assert_matches_boards(rng.integers(0, 3, size=(500, 3, 3), dtype=np.int8), 3)
+
+    def test_evaluate_large_boards(self):
+        rng = np.random.default_rng(1)
+        boards = rng.choice([0, 0, 0, 1, 2], size=(200, 7, 7)).astype(np.int8)
+        self.assert_matches_boards(boards, 4)
+
+    def test_converters(self):
+        rng = np.random.default_rng(2)
+        boards = rng.integers(0, 3, size=(50, 5, 5), dtype=np.int8)
+        bit_boards = batch.to_boards(boards, 4)
+        np.testing.assert_array_equal(batch.from_boards(bit_boards), boards)
+        np.testing.assert_array_equal(batch.from_boards(Board(board.rows) for board in bit_boards), boards)
+        np.testing.assert_array_equal(batch.from_serialized(board.serialize() for board in bit_boards), boards)
+        packed = batch.to_packed(boards)
+        self.assertEqual(packed, [board.pack() for board in bit_boards])
+        np.testing.assert_array_equal(batch.from_packed(packed), boards)
@@ -0,0 +1,21 @@
+from dataclasses import replace
+
+from django.test import TestCase
+
+from tictactoe import benchmarks
+
+
+class TestBenchmarks(TestCase):
+
+    def run_benchmark(self, name):
+        return benchmarks.run(replace(benchmarks.registry[name], number=2), repeat=1)
+
+    def test_board_benchmark(self):
+        result = self.run_benchmark('board.add_symbol')
+        self.assertGreater(result.time_us, 0)
+        self.assertEqual(result.queries, 0)
+
+    def test_counts_queries_per_request(self):
+        result = self.run_benchmark('api.game_handler.get')
+        self.assertGreater(result.queries, 0)
+        self.assertGreater(result.peak_kib, 0)
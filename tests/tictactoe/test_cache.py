@@ -0,0 +1,103 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from tests.tictactoe.factories import create_session
+from tictactoe.cache import LRUCache, game_cache
+from tictactoe.metrics import registry
+from tictactoe.session import SessionHandlerFactory
+
+
+class TestLRUCache(TestCase):
+
+    def test_eviction(self):
+        lru = LRUCache('test.lru', max_size=2, ttl=60)
+        evictions = lru.evictions.value
+        lru.set('a', 1)
+        lru.set('b', 2)
+        self.assertEqual(lru.get('a'), 1)
+        lru.set('c', 3)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual((lru.get('a'), lru.get('c')), (1, 3))
+        self.assertEqual(lru.evictions.value - evictions, 1)
+
+    def test_ttl(self):
+        lru = LRUCache('test.lru', max_size=2, ttl=10)
+        with mock.patch('tictactoe.cache.time.monotonic', return_value=100):
+            lru.set('a', 1)
+        with mock.patch('tictactoe.cache.time.monotonic', return_value=105):
+            self.assertEqual(lru.get('a'), 1)
+        with mock.patch('tictactoe.cache.time.monotonic', return_value=111):
+            self.assertIsNone(lru.get('a'))
+
+
+class TestGameStateCache(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.session, self.owner, self.opponent = create_session(computer=False)
+        client_session = self.client.session
+        key = SessionHandlerFactory.create(self.session, None)._make_key('player_id')
+        client_session[key] = str(self.owner.player_id)
+        client_session.save()
+        self.url = reverse('tictactoe:api:game_handler', args=[self.session.session_id])
+
+    def test_read_through(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.json()['isActivePlayer'])
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertTrue(response.json()['isActivePlayer'])
+
+        game_cache.local.clear()
+        hits = registry.counter('game_cache.shared.hits').value
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        self.assertEqual(registry.counter('game_cache.shared.hits').value - hits, 2)
+
+        cache.clear()
+        game_cache.local.clear()
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+
+    def test_superseded_by_move(self):
+        self.client.get(self.url)
+        response = self.client.post(self.url, {'coords': [0, 0]}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = self.client.get(self.url).json()
+        self.assertEqual(data['numSymbols'], 1)
+        self.assertFalse(data['isActivePlayer'])
+
+    def test_pointer_only_shared(self):
+        self.client.get(self.url)
+        self.assertIsNone(game_cache.local.get(game_cache.get_pointer_key(self.session.session_id)))
+        # Another worker moved: the next read sees it without waiting for the local entries to expire
+        cache.set(game_cache.get_pointer_key(self.session.session_id), (self.session.game.pk, 7))
+        self.assertEqual(game_cache.get_pointer(self.session.session_id), (self.session.game.pk, 7))
+
+    def test_stale_reader_keeps_new_pointer(self):
+        self.client.get(self.url)
+        game = self.session.game
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, {'coords': [0, 0]}, content_type='application/json')
+        self.assertEqual(game_cache.get_pointer(self.session.session_id), (game.pk, 1))
+
+        # A request that loaded the game before the move caches it afterwards
+        game_cache.set(self.session.session_id, game.pk, 0, {'stale': True})
+        self.assertEqual(game_cache.get_pointer(self.session.session_id), (game.pk, 1))
+        self.assertEqual(self.client.get(self.url).json()['numSymbols'], 1)
+
+    def test_metrics(self):
+        self.client.get(self.url)
+        metrics_url = reverse('tictactoe:api:metrics')
+        self.assertEqual(self.client.get(metrics_url).status_code, 403)
+
+        User.objects.create_superuser('admin', 'admin@example.org', 'secret')
+        self.client.login(username='admin', password='secret')
+        metrics = self.client.get(metrics_url).json()
+        self.assertIn('game_cache.local.hits', metrics)
+        self.assertIn('game_cache.shared.misses', metrics)
@@ -0,0 +1,173 @@
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from tictactoe.engines.mcts import MonteCarloEngine
+from tictactoe.engines.negamax import NegamaxEngine
+from tictactoe.engines.search import SearchEngine, TranspositionTable
+from tictactoe.fields import BitBoard, Board, Symbol
+
+
+def make_board(rows):
+    return BitBoard([[Symbol(x) for x in row] for row in rows])
+
+
+class TestNegamaxEngine(SimpleTestCase):
+
+    def setUp(self):
+        self.engine = NegamaxEngine()
+
+    def test_takes_win(self):
+        board = make_board([
+            ['X', 'X', None],
+            ['O', 'O', None],
+            ['X', None, None],
+        ])
+        self.assertEqual(self.engine.select_move(board, Symbol.O, Symbol.X), (1, 2))
+
+    def test_blocks(self):
+        board = make_board([
+            ['X', None, None],
+            [None, 'O', None],
+            [None, None, 'X'],
+        ])
+        x, y = self.engine.select_move(board, Symbol.O, Symbol.X)
+        self.assertIn((x, y), [(0, 1), (1, 0), (1, 2), (2, 1)])
+
+    def test_symmetric_positions_share_key(self):
+        board = make_board([['X', 'O', None], [None, None, None], [None, None, None]])
+        rotated = make_board([[None, None, 'X'], [None, None, 'O'], [None, None, None]])
+        self.assertEqual(
+            self.engine.get_key(3, board.masks[Symbol.X], board.masks[Symbol.O]),
+            self.engine.get_key(3, rotated.masks[Symbol.X], rotated.masks[Symbol.O])
+        )
+
+    def test_never_loses(self):
+        def play(board):
+            if board.has_series_complete(Symbol.X):
+                self.fail(f'Engine lost: {board}')
+            if board.has_series_complete(Symbol.O) or board.is_full:
+                return
+            for x in range(3):
+                for y in range(3):
+                    if board.rows[x][y] != Symbol.N:
+                        continue
+                    child = BitBoard(board.rows)
+                    child.add_symbol(x, y, Symbol.X)
+                    if not child.has_series_complete(Symbol.X) and not child.is_full:
+                        child.add_symbol(*self.engine.select_move(child, Symbol.O, Symbol.X), Symbol.O)
+                    play(child)
+
+        play(make_board([[None] * 3] * 3))
+
+    def test_larger_boards_use_search(self):
+        board = BitBoard.empty(4, 4)
+        board.add_symbol(0, 0, Symbol.X)
+        started = time.monotonic()
+        x, y = NegamaxEngine().select_move(board, Symbol.O, Symbol.X)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(board.get_symbol(x, y), Symbol.N)
+        self.assertNotIn((4, 4), NegamaxEngine.transposition_tables)
+
+
+class TestSearchEngine(SimpleTestCase):
+
+    def make_board(self, stones):
+        board = BitBoard.empty(15, 5)
+        for symbol, coords in stones.items():
+            for x, y in coords:
+                board.add_symbol(x, y, symbol)
+        return board
+
+    def test_takes_win(self):
+        board = self.make_board({
+            Symbol.O: [(7, 3), (7, 4), (7, 5), (7, 6)],
+            Symbol.X: [(8, 3), (8, 4), (8, 5), (9, 9)],
+        })
+        self.assertIn(
+            SearchEngine(move_time=1).select_move(board, Symbol.O, Symbol.X),
+            [(7, 2), (7, 7)]
+        )
+
+    def test_blocks_four(self):
+        board = self.make_board({
+            Symbol.X: [(2, 2), (3, 3), (4, 4), (5, 5)],
+            Symbol.O: [(1, 1), (10, 10), (10, 11)],
+        })
+        self.assertEqual(SearchEngine(move_time=1).select_move(board, Symbol.O, Symbol.X), (6, 6))
+
+    def test_respects_move_time(self):
+        board = self.make_board({
+            Symbol.X: [(7, 7), (8, 8), (6, 8)],
+            Symbol.O: [(7, 8), (6, 6)],
+        })
+        start = time.monotonic()
+        x, y = SearchEngine(move_time=0.3).select_move(board, Symbol.O, Symbol.X)
+        self.assertLess(time.monotonic() - start, 0.6)
+        self.assertEqual(board.get_symbol(x, y), Symbol.N)
+
+    def test_small_board_never_loses_obvious_block(self):
+        board = make_board([
+            ['X', 'X', None],
+            [None, 'O', None],
+            [None, None, None],
+        ])
+        self.assertEqual(SearchEngine(move_time=1).select_move(board, Symbol.O, Symbol.X), (0, 2))
+
+    def test_plain_board_keeps_win_length(self):
+        board = Board([[Symbol.N] * 5 for _ in range(5)], win_length=4)
+        self.assertEqual(SearchEngine.get_bit_board(board).win_length, 4)
+
+    def test_table_shared_between_threads(self):
+        table = TranspositionTable(8)
+        errors = []
+
+        def fill(offset):
+            try:
+                for key in range(offset, offset + 20000):
+                    table.put(key % 32, (1, 0, 0, None))
+                    table.get((key + 1) % 32)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=fill, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(table), 8)
+
+
+class TestMonteCarloEngine(SimpleTestCase):
+
+    def make_board(self):
+        board = BitBoard.empty(7, 4)
+        for x, y, symbol in [(3, 3, Symbol.X), (3, 4, Symbol.O), (4, 4, Symbol.X), (2, 2, Symbol.O)]:
+            board.add_symbol(x, y, symbol)
+        return board
+
+    def test_seeded_moves_are_reproducible(self):
+        board = self.make_board()
+        self.assertEqual(
+            MonteCarloEngine(simulations=300, workers=1, seed=7).select_move(board, Symbol.O, Symbol.X),
+            MonteCarloEngine(simulations=300, workers=1, seed=7).select_move(board, Symbol.O, Symbol.X)
+        )
+        self.assertEqual(
+            MonteCarloEngine(simulations=300, workers=2, seed=7).select_move(board, Symbol.O, Symbol.X),
+            MonteCarloEngine(simulations=300, workers=2, seed=7).select_move(board, Symbol.O, Symbol.X)
+        )
+
+    def test_takes_win(self):
+        board = make_board([
+            ['X', 'X', None],
+            ['O', 'O', None],
+            ['X', None, None],
+        ])
+        self.assertEqual(MonteCarloEngine(simulations=50, workers=1, seed=1).select_move(board, Symbol.O, Symbol.X), (1, 2))
+
+    def test_merges_root_statistics(self):
+        board = self.make_board()
+        stats = MonteCarloEngine(simulations=400, workers=2, seed=3).get_stats(7, 4, board.masks[Symbol.O], board.masks[Symbol.X])
+        self.assertEqual(sum(visits for visits, _ in stats.values()), 400)
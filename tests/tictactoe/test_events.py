@@ -0,0 +1,131 @@
+import asyncio
+import threading
+from unittest import skipUnless
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from tests.tictactoe.factories import create_session
+from tictactoe.events import get_channel
+from tictactoe.game import GameHandlerFactory
+from tictactoe.notifications import get_backend
+from tictactoe.notifications.memory import InMemoryBackend
+
+
+@override_settings(TICTACTOE_EVENTS_KEEPALIVE=0.05, TICTACTOE_EVENTS_TIMEOUT=0.5)
+class TestSessionEvents(TestCase):
+
+    async def test_stream(self):
+        session, owner, opponent = await sync_to_async(create_session)(computer=False)
+        hub = get_backend().hub
+        url = reverse('tictactoe:api:session_events', args=[session.session_id])
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        content = aiter(response.streaming_content)
+        self.assertEqual(await anext(content), b'retry: 1000\n\n')
+        self.assertEqual(hub.num_subscriptions, 1)
+        self.assertEqual(await anext(content), b': keepalive\n\n')
+
+        hub.publish(get_channel(session.session_id), {'type': 'game', 'version': 1})
+        self.assertEqual(await anext(content), b'event: game\ndata: {"type": "game", "version": 1}\n\n')
+
+        self.assertEqual({part async for part in content}, {b': keepalive\n\n'})
+        self.assertEqual(hub.num_subscriptions, 0)
+
+    async def test_not_found(self):
+        response = await self.async_client.get(reverse('tictactoe:api:session_events', args=[
+            '00000000-0000-0000-0000-000000000000'
+        ]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_wsgi(self):
+        session, owner, opponent = create_session(computer=False)
+        response = self.client.get(reverse('tictactoe:api:session_events', args=[session.session_id]))
+        self.assertEqual(response.status_code, 204)
+
+    def test_publish_on_commit(self):
+        session, owner, opponent = create_session(computer=False)
+        hub = get_backend().hub
+        published = []
+        with self.captureOnCommitCallbacks() as callbacks:
+            GameHandlerFactory.create(session.game).add_symbol((0, 0))
+        original, hub.publish = hub.publish, lambda channel, event: published.append((channel, event))
+        try:
+            for callback in callbacks:
+                callback()
+        finally:
+            hub.publish = original
+        self.assertEqual(published, [
+            (get_channel(session.session_id), {'type': 'game', 'version': 1, 'numSymbols': 1, 'isEnded': False})
+        ])
+
+
+class BackendTestMixin:
+
+    def receive(self, backend, channel, event):
+        """
+        Subscribe to the channel on an event loop in another thread, like the
+        event stream does, and notify until the event is received.
+        """
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+
+        async def subscribe():
+            return backend.subscribe(channel)
+
+        try:
+            subscription = asyncio.run_coroutine_threadsafe(subscribe(), loop).result()
+            try:
+                for _ in range(50):
+                    backend.notify(channel, event)
+                    try:
+                        return asyncio.run_coroutine_threadsafe(
+                            asyncio.wait_for(subscription.get(), 0.1), loop
+                        ).result()
+                    except TimeoutError:
+                        ...
+            finally:
+                backend.unsubscribe(subscription)
+                self.assertFalse(backend.hub.has_subscriptions(channel))
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+class TestInMemoryBackend(BackendTestMixin, TransactionTestCase):
+
+    def test_notify(self):
+        event = {'type': 'session'}
+        self.assertEqual(self.receive(InMemoryBackend(), 'session-test', event), event)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'LISTEN/NOTIFY needs PostgreSQL')
+class TestPostgresBackend(BackendTestMixin, TransactionTestCase):
+
+    def test_notify(self):
+        from tictactoe.notifications.postgres import PostgresBackend
+
+        backend = PostgresBackend()
+        try:
+            event = {'type': 'game', 'version': 1}
+            self.assertEqual(self.receive(backend, 'session-test', event), event)
+        finally:
+            backend.close()
+
+    def test_restart_listener(self):
+        from tictactoe.notifications.postgres import PostgresBackend
+
+        backend = PostgresBackend()
+        try:
+            event = {'type': 'game', 'version': 1}
+            self.assertEqual(self.receive(backend, 'session-test', event), event)
+            backend.close()
+            self.assertEqual(self.receive(backend, 'session-test', event), event)
+        finally:
+            backend.close()
@@ -0,0 +1,83 @@
+import itertools
+import random
+
+from django.test import SimpleTestCase
+
+from tictactoe.exceptions import SlotNotAvailableError, SlotOutOfRangeError
+from tictactoe.fields import BitBoard, Board, Symbol
+
+
+class TestBitBoard(SimpleTestCase):
+
+    def make_rows(self, cells):
+        return [[Symbol(cells[x * 3 + y]) for y in range(3)] for x in range(3)]
+
+    def test_matches_board(self):
+        for cells in itertools.islice(itertools.product(('X', 'O', None), repeat=9), 0, None, 7):
+            board = Board(self.make_rows(cells))
+            bit_board = BitBoard(self.make_rows(cells))
+            self.assertEqual(bit_board.serialize(), board.serialize())
+            self.assertEqual(bit_board.is_full, board.is_full)
+            for symbol in (Symbol.X, Symbol.O):
+                self.assertEqual(bit_board.has_series_complete(symbol), board.has_series_complete(symbol))
+            self.assertEqual(list(bit_board.get_series()), list(board.get_series()))
+
+    def test_pack(self):
+        for cells in itertools.islice(itertools.product(('X', 'O', None), repeat=9), 0, None, 11):
+            board = Board(self.make_rows(cells))
+            bit_board = BitBoard(self.make_rows(cells))
+            self.assertEqual(bit_board.pack(), board.pack())
+            self.assertEqual(len(bit_board.pack()), 5)
+            unpacked = BitBoard.unpack(bit_board.pack())
+            self.assertEqual(unpacked.as_list, board.as_list)
+            self.assertEqual(unpacked.num_symbols, bit_board.num_symbols)
+
+    def test_add_symbol(self):
+        board = BitBoard.deserialize('[[null, null, null], [null, null, null], [null, null, null]]')
+        coords = [(x, y) for x in range(3) for y in range(3)]
+        random.Random(1).shuffle(coords)
+        for index, (x, y) in enumerate(coords):
+            board.add_symbol(x, y, Symbol.X if index % 2 == 0 else Symbol.O)
+            self.assertEqual(board.rows[x][y], Symbol.X if index % 2 == 0 else Symbol.O)
+        self.assertTrue(board.is_full)
+
+    def test_add_symbol_errors(self):
+        board = BitBoard.deserialize('[["X", null, null], [null, null, null], [null, null, null]]')
+        with self.assertRaises(SlotNotAvailableError):
+            board.add_symbol(0, 0, Symbol.O)
+        with self.assertRaises(SlotOutOfRangeError):
+            board.add_symbol(3, 0, Symbol.O)
+        with self.assertRaises(SlotOutOfRangeError):
+            board.add_symbol(-1, 0, Symbol.O)
+
+
+class TestLargeBoard(SimpleTestCase):
+
+    def test_incremental_win_detection(self):
+        rng = random.Random(5)
+        for _ in range(3):
+            board = Board.empty(15, 5)
+            bit_board = BitBoard.empty(15, 5)
+            coords = [(x, y) for x in range(15) for y in range(15)]
+            rng.shuffle(coords)
+            for index, (x, y) in enumerate(coords):
+                symbol = Symbol.X if index % 2 == 0 else Symbol.O
+                board.add_symbol(x, y, symbol)
+                bit_board.add_symbol(x, y, symbol)
+                expected = board.has_series_complete(symbol)
+                self.assertEqual(board.has_series_complete(symbol, (x, y)), expected)
+                self.assertEqual(bit_board.has_series_complete(symbol, (x, y)), expected)
+                self.assertEqual(bit_board.has_series_complete(symbol), expected)
+                if expected:
+                    break
+            self.assertEqual(bit_board.serialize(), board.serialize())
+
+    def test_five_in_a_row(self):
+        board = BitBoard.empty(15, 5)
+        for i in range(4):
+            board.add_symbol(3 + i, 10 - i, Symbol.X)
+            self.assertFalse(board.has_series_complete(Symbol.X, (3 + i, 10 - i)))
+        board.add_symbol(7, 6, Symbol.X)
+        self.assertTrue(board.has_series_complete(Symbol.X, (7, 6)))
+        self.assertEqual(board.num_symbols, 5)
+        self.assertFalse(board.is_full)
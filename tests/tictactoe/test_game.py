@@ -0,0 +1,167 @@
+import io
+import threading
+from datetime import timedelta
+from unittest import mock, skipIf
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from tests.tictactoe.factories import GameFactory, create_session
+from tictactoe.exceptions import PlayerNotActiveError, VersionConflictError
+from tictactoe.game import GameHandlerFactory, play_computer_move, resume_stale_computer_moves
+from tictactoe.models import Game, GameSession
+from tictactoe.workers import BoundedExecutor
+
+
+class TestScores(TestCase):
+
+    def play(self, session, moves):
+        for coords in moves:
+            GameHandlerFactory.create(session.game).add_symbol(coords)
+
+    def test_scores_counted_at_game_end(self):
+        session, owner, opponent = create_session(computer=False)
+        self.play(session, [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)])
+        session.refresh_from_db()
+        self.assertEqual((session.owner_score, session.opponent_score), (1, 0))
+
+        game = session.game
+        game.is_active = False
+        game.save()
+        GameFactory(session=session, active_player=opponent)
+        self.play(session, [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)])
+        session.refresh_from_db()
+        self.assertEqual((session.owner_score, session.opponent_score), (1, 1))
+
+    def test_rebuild_scores(self):
+        session, owner, opponent = create_session(computer=False)
+        self.play(session, [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)])
+        other, owner, opponent = create_session(computer=False)
+        self.play(other, [(1, 1), (0, 0), (2, 2), (0, 1), (2, 1), (0, 2)])
+        GameSession.objects.update(owner_score=5, opponent_score=3)
+        stdout = io.StringIO()
+        call_command('rebuild_scores', '--batch-size=1', stdout=stdout)
+        self.assertEqual(stdout.getvalue().strip(), 'Rebuilt the scores of 2 sessions')
+        session.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((session.owner_score, session.opponent_score), (1, 0))
+        self.assertEqual((other.owner_score, other.opponent_score), (0, 1))
+
+    def test_stale_game_conflicts(self):
+        session, owner, opponent = create_session(computer=False)
+        first, second = session.game, session.game
+        GameHandlerFactory.create(first).add_symbol((0, 0))
+        with self.assertRaises(VersionConflictError):
+            GameHandlerFactory.create(second).add_symbol((1, 1))
+        game = session.game
+        self.assertEqual((game.num_symbols, game.version), (1, 1))
+        self.assertIsNone(game.board.as_list[1][1])
+
+
+@override_settings(TICTACTOE_COMPUTER_MOVE_WORKERS=1, TICTACTOE_COMPUTER_MOVE_TIMEOUT=30)
+class TestComputerMoves(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Without workers the replies run in the test thread, within the test transaction
+        patcher = mock.patch(
+            'tictactoe.game.get_computer_moves', return_value=BoundedExecutor('computer_moves', 0, 0)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.session, self.owner, self.computer = create_session()
+
+    def play(self, coords):
+        with self.captureOnCommitCallbacks() as callbacks:
+            GameHandlerFactory.create(self.session.game).add_symbol(coords)
+        return callbacks
+
+    def test_reply_after_commit(self):
+        callbacks = self.play((1, 1))
+        game = self.session.game
+        self.assertEqual((game.num_symbols, game.active_player), (1, self.computer))
+        with self.assertRaises(PlayerNotActiveError):
+            self.play((0, 0))
+
+        for callback in callbacks:
+            callback()
+        game = self.session.game
+        self.assertEqual((game.num_symbols, game.active_player), (2, self.owner))
+
+    def test_stale_version_skipped(self):
+        self.play((1, 1))
+        game = self.session.game
+        play_computer_move(game.pk, game.version - 1)
+        self.assertEqual(self.session.game.num_symbols, 1)
+        play_computer_move(game.pk, game.version)
+        self.assertEqual(self.session.game.num_symbols, 2)
+
+    def test_resume_lost_reply(self):
+        # The callbacks are dropped, as if the worker exited before replying
+        self.play((1, 1))
+        with self.assertRaises(PlayerNotActiveError):
+            self.play((0, 0))
+        self.assertEqual(self.session.game.num_symbols, 1)
+
+        Game.objects.update(game_time=timezone.now() - timedelta(seconds=60))
+        with self.assertRaises(PlayerNotActiveError):
+            self.play((0, 0))
+        game = self.session.game
+        self.assertEqual((game.num_symbols, game.active_player), (2, self.owner))
+        coords = next((x, y) for x, row in enumerate(game.board.as_list) for y, slot in enumerate(row) if slot is None)
+        self.play(coords)
+        self.assertEqual(self.session.game.num_symbols, 3)
+
+    def test_resume_stale_computer_moves(self):
+        self.play((1, 1))
+        other, owner, computer = create_session()
+        self.assertEqual(resume_stale_computer_moves(), 0)
+
+        Game.objects.update(game_time=timezone.now() - timedelta(seconds=60))
+        self.assertEqual(resume_stale_computer_moves(), 1)
+        game = self.session.game
+        self.assertEqual((game.num_symbols, game.active_player), (2, self.owner))
+        self.assertEqual(other.game.num_symbols, 0)
+
+
+@skipIf(connection.vendor == 'sqlite', 'SQLite does not support concurrent writers')
+class TestConcurrentMoves(TransactionTestCase):
+
+    num_threads = 4
+
+    num_moves = 5
+
+    def play(self, session, moves, conflicts):
+        try:
+            for coords in moves:
+                while True:
+                    game = Game.objects.select_related('session').get(session=session, is_active=True)
+                    try:
+                        GameHandlerFactory.create(game).add_symbol(coords)
+                        break
+                    except VersionConflictError:
+                        conflicts.append(coords)
+        finally:
+            connection.close()
+
+    def test_no_lost_moves(self):
+        session, owner, opponent = create_session(computer=False, board_size=10, win_length=10)
+        conflicts = []
+        threads = [
+            threading.Thread(
+                target=self.play, args=(session, [(row, col) for col in range(self.num_moves)], conflicts)
+            )
+            for row in range(self.num_threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        game = session.game
+        total = self.num_threads * self.num_moves
+        self.assertEqual(game.num_symbols, total)
+        self.assertEqual(game.version, total)
+        self.assertEqual(sum(slot is not None for row in game.board.as_list for slot in row), total)
@@ -0,0 +1,108 @@
+import io
+import smtplib
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from tictactoe.exceptions import OutboxConnectionError
+from tictactoe.mail import send_invite_mail, send_outbox
+from tictactoe.models import OutboxMail
+
+
+@override_settings(TICTACTOE_OUTBOX_MAX_ATTEMPTS=3, TICTACTOE_OUTBOX_RETRY_DELAY=60)
+class TestOutbox(TestCase):
+
+    def invite(self, count=1):
+        for number in range(count):
+            send_invite_mail(f'player{number}@example.org', 'http://testserver/tictactoe/session')
+
+    def test_invite_is_queued(self):
+        with self.assertNumQueries(1):
+            self.invite()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxMail.objects.get().status, OutboxMail.PENDING)
+
+    def test_send_over_one_connection(self):
+        self.invite(5)
+        with mock.patch('tictactoe.mail.get_connection', wraps=get_connection) as connect:
+            self.assertEqual(send_outbox(batch_size=2), (5, 0))
+        self.assertEqual(connect.call_count, 1)
+        self.assertEqual(len(mail.outbox), 5)
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ['player0@example.org'])
+        self.assertEqual(message.alternatives[0][1], 'text/html')
+        self.assertFalse(OutboxMail.objects.exclude(status=OutboxMail.SENT).exists())
+        self.assertEqual(send_outbox(), (0, 0))
+
+    def test_retry_with_backoff(self):
+        self.invite()
+        with mock.patch.object(EmailBackend, 'send_messages', side_effect=smtplib.SMTPException('Relay down')):
+            self.assertEqual(send_outbox(), (0, 1))
+            outbox_mail = OutboxMail.objects.get()
+            self.assertEqual((outbox_mail.status, outbox_mail.attempts, outbox_mail.error), ('pending', 1, 'Relay down'))
+            self.assertAlmostEqual(
+                outbox_mail.next_attempt, timezone.now() + timedelta(seconds=60), delta=timedelta(seconds=5)
+            )
+            # Not due yet
+            self.assertEqual(send_outbox(), (0, 0))
+
+            OutboxMail.objects.update(next_attempt=timezone.now())
+            send_outbox()
+            outbox_mail.refresh_from_db()
+            self.assertAlmostEqual(
+                outbox_mail.next_attempt, timezone.now() + timedelta(seconds=120), delta=timedelta(seconds=5)
+            )
+
+            OutboxMail.objects.update(next_attempt=timezone.now())
+            send_outbox()
+            self.assertEqual(OutboxMail.objects.get().status, OutboxMail.FAILED)
+
+        OutboxMail.objects.update(status=OutboxMail.PENDING, next_attempt=timezone.now())
+        self.assertEqual(send_outbox(), (1, 0))
+        self.assertEqual(OutboxMail.objects.get().error, '')
+
+    def test_empty_outbox_opens_no_connection(self):
+        with mock.patch('tictactoe.mail.get_connection', wraps=get_connection) as connect:
+            self.assertEqual(send_outbox(), (0, 0))
+        connect.assert_not_called()
+
+    def test_reopen_after_disconnect(self):
+        self.invite(3)
+        with mock.patch.object(EmailBackend, 'open') as open_connection, mock.patch.object(
+            EmailBackend, 'send_messages', side_effect=[1, smtplib.SMTPServerDisconnected(), 1, 1]
+        ):
+            self.assertEqual(send_outbox(), (3, 0))
+        self.assertEqual(open_connection.call_count, 2)
+        self.assertEqual(set(OutboxMail.objects.values_list('attempts', flat=True)), {1})
+
+    def test_unreachable_server_leaves_mails_pending(self):
+        self.invite(3)
+        with mock.patch.object(EmailBackend, 'open', side_effect=[None, ConnectionRefusedError()]), \
+                mock.patch.object(EmailBackend, 'send_messages', side_effect=[1, smtplib.SMTPServerDisconnected()]):
+            with self.assertRaises(OutboxConnectionError):
+                send_outbox()
+        self.assertEqual(
+            list(OutboxMail.objects.order_by('pk').values_list('status', 'attempts')),
+            [(OutboxMail.SENT, 1), (OutboxMail.PENDING, 0), (OutboxMail.PENDING, 0)]
+        )
+
+    def test_command_waits_for_server(self):
+        self.invite()
+        with mock.patch.object(EmailBackend, 'open', side_effect=ConnectionRefusedError()):
+            with self.assertRaises(CommandError):
+                call_command('send_outbox', stdout=io.StringIO())
+
+        stop = Exception('Stop')
+        with mock.patch.object(EmailBackend, 'open', side_effect=[ConnectionRefusedError()] * 2 + [None]), \
+                mock.patch('time.sleep', side_effect=[None, None, stop]) as sleep:
+            with self.assertRaises(Exception) as context:
+                call_command('send_outbox', '--loop', '--interval=5', stdout=io.StringIO(), stderr=io.StringIO())
+        self.assertIs(context.exception, stop)
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [5, 10, 5])
+        self.assertEqual(OutboxMail.objects.get().status, OutboxMail.SENT)
@@ -0,0 +1,147 @@
+import threading
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from tictactoe.matchmaking import get_matchmaker
+from tictactoe.matchmaking.database import DatabaseMatchmaker
+from tictactoe.matchmaking.memory import InMemoryMatchmaker
+from tictactoe.models import GameSession, MatchTicket
+
+
+class MatchmakerTestMixin:
+
+    def create_matchmaker(self):
+        raise NotImplementedError()
+
+    def setUp(self):
+        super().setUp()
+        self.matchmaker = self.create_matchmaker()
+
+    def test_pairs_in_order(self):
+        first = self.matchmaker.enqueue('First')
+        second = self.matchmaker.enqueue('Second', board_size=5, win_length=4)
+        third = self.matchmaker.enqueue('Third')
+        self.assertEqual(third.status, 'matched')
+        self.assertEqual(self.matchmaker.get(second.ticket_id).status, 'waiting')
+
+        first = self.matchmaker.get(first.ticket_id)
+        self.assertEqual(first.status, 'matched')
+        self.assertEqual(first.session_id, third.session_id)
+        session = GameSession.objects.get(session_id=first.session_id)
+        self.assertEqual(session.owner.player_id, first.player_id)
+        self.assertEqual(session.opponent.player_id, third.player_id)
+        self.assertTrue(session.is_ready)
+
+        fourth = self.matchmaker.enqueue('Fourth', board_size=5, win_length=4)
+        session = GameSession.objects.get(session_id=fourth.session_id)
+        self.assertEqual((session.board_size, session.win_length), (5, 4))
+
+    def test_matched_grace_period(self):
+        first = self.matchmaker.enqueue('First')
+        self.matchmaker.enqueue('Second')
+        # A lost response can be fetched again
+        for _ in range(2):
+            self.assertEqual(self.matchmaker.get(first.ticket_id).status, 'matched')
+        with override_settings(TICTACTOE_MATCHMAKING_MATCHED_TTL=-1):
+            self.assertIsNone(self.matchmaker.get(first.ticket_id))
+
+    def test_expired_ticket_not_paired(self):
+        first = self.matchmaker.enqueue('First')
+        with override_settings(TICTACTOE_MATCHMAKING_TICKET_TTL=-1):
+            self.assertEqual(self.matchmaker.get(first.ticket_id).status, 'expired')
+        second = self.matchmaker.enqueue('Second')
+        self.assertEqual(second.status, 'waiting')
+        third = self.matchmaker.enqueue('Third')
+        self.assertEqual(third.session_id, self.matchmaker.get(second.ticket_id).session_id)
+
+    def test_abandoned_ticket_skipped(self):
+        self.matchmaker.enqueue('First')
+        with override_settings(TICTACTOE_MATCHMAKING_TICKET_TTL=-1):
+            self.assertEqual(self.matchmaker.enqueue('Second').status, 'waiting')
+        self.assertEqual(GameSession.objects.count(), 0)
+
+    def test_cancel(self):
+        first = self.matchmaker.enqueue('First')
+        self.assertTrue(self.matchmaker.cancel(first.ticket_id))
+        self.assertFalse(self.matchmaker.cancel(first.ticket_id))
+        self.assertEqual(self.matchmaker.enqueue('Second').status, 'waiting')
+        self.assertEqual(GameSession.objects.count(), 0)
+
+
+class TestInMemoryMatchmaker(MatchmakerTestMixin, TestCase):
+
+    def create_matchmaker(self):
+        return InMemoryMatchmaker()
+
+
+class TestDatabaseMatchmaker(MatchmakerTestMixin, TestCase):
+
+    def create_matchmaker(self):
+        return DatabaseMatchmaker()
+
+
+@skipUnless(connection.vendor == 'postgresql', 'SKIP LOCKED needs PostgreSQL')
+class TestDatabaseMatchmakerConcurrency(TransactionTestCase):
+
+    def test_concurrent_enqueue(self):
+        matchmaker = DatabaseMatchmaker()
+
+        def enqueue(number):
+            try:
+                matchmaker.enqueue(f'Player {number}')
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=enqueue, args=(number,)) for number in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for ticket in MatchTicket.objects.filter(status=MatchTicket.WAITING):
+            matchmaker.get(ticket.ticket_id)
+
+        self.assertEqual(MatchTicket.objects.filter(status=MatchTicket.MATCHED).count(), 20)
+        self.assertEqual(GameSession.objects.count(), 10)
+        self.assertEqual(MatchTicket.objects.filter(session__isnull=False).values('session').distinct().count(), 10)
+
+
+@override_settings(TICTACTOE_MATCHMAKER='tictactoe.matchmaking.database.DatabaseMatchmaker')
+class TestMatchmakingApi(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        get_matchmaker.cache_clear()
+        self.addCleanup(get_matchmaker.cache_clear)
+
+    def test_match(self):
+        url = reverse('tictactoe:api:matchmaking')
+        self.assertEqual(
+            self.client.post(url, {'name': 'First', 'boardSize': 3, 'winLength': 4}, content_type='application/json').status_code,
+            400
+        )
+        response = self.client.post(url, {'name': 'First'}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        first = response.json()
+        self.assertEqual(first['status'], 'waiting')
+        self.assertIsNone(first['gameUrl'])
+
+        response = self.client_class().post(url, {'name': 'Second'}, content_type='application/json')
+        second = response.json()
+        self.assertEqual(second['status'], 'matched')
+        self.assertEqual(second['gameUrl'], reverse('tictactoe:session_game', args=[second['sessionId']]))
+
+        response = self.client.get(reverse('tictactoe:api:match_ticket', args=[first['ticketId']]))
+        self.assertEqual(response.json()['sessionId'], second['sessionId'])
+        self.client.post(reverse('tictactoe:api:session_handler', args=[second['sessionId']]))
+        game = GameSession.objects.get(session_id=second['sessionId']).game
+        self.assertEqual(game.active_player.player_id, MatchTicket.objects.get(ticket_id=first['ticketId']).player.player_id)
+
+    def test_cancel(self):
+        response = self.client.post(reverse('tictactoe:api:matchmaking'), {'name': 'First'}, content_type='application/json')
+        url = reverse('tictactoe:api:match_ticket', args=[response.json()['ticketId']])
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self.client.delete(url).status_code, 404)
+        self.assertEqual(MatchTicket.objects.get().status, MatchTicket.CANCELLED)
@@ -0,0 +1,83 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from tests.tictactoe.factories import create_session
+from tictactoe.fields import BitBoard, Symbol
+from tictactoe.game import GameHandlerFactory
+from tictactoe.metrics import registry
+from tictactoe.ponder import PonderCache, get_likely_moves, get_ponder_cache, get_ponder_workers
+
+
+def make_board(moves, size=3, win_length=3):
+    board = BitBoard.empty(size, win_length)
+    for (x, y), symbol in moves:
+        board.add_symbol(x, y, symbol)
+    return board
+
+
+class TestPonderCache(SimpleTestCase):
+
+    def test_pop(self):
+        cache = PonderCache(10)
+        board = make_board([((1, 1), Symbol.X)])
+        self.assertFalse(cache.put(1, board, (0, 0)))
+        cache.start(1)
+        self.assertTrue(cache.put(1, board, (0, 0)))
+        self.assertTrue(cache.put(1, make_board([((0, 0), Symbol.X)]), (1, 1)))
+
+        hits = registry.snapshot()['ponder.hits']
+        self.assertEqual(cache.pop(1, board), (0, 0))
+        self.assertEqual(registry.snapshot()['ponder.hits'], hits + 1)
+        # The replies to the other moves are dropped with the position
+        self.assertIsNone(cache.pop(1, make_board([((0, 0), Symbol.X)])))
+        self.assertFalse(cache.put(1, board, (0, 0)))
+        self.assertEqual(cache.size, 0)
+
+    def test_eviction(self):
+        cache = PonderCache(2)
+        board = make_board([((1, 1), Symbol.X)])
+        for game_id in (1, 2):
+            cache.start(game_id)
+            cache.put(game_id, board, (0, 0))
+        cache.start(3)
+        cache.put(3, board, (0, 0))
+        self.assertEqual(list(cache.games), [2, 3])
+        cache.discard(3)
+        self.assertEqual((list(cache.games), cache.size), ([2], 1))
+
+
+class TestLikelyMoves(SimpleTestCase):
+
+    def test_blocks_series(self):
+        board = make_board([((0, 0), Symbol.X), ((0, 1), Symbol.X), ((1, 1), Symbol.O)], size=5, win_length=3)
+        self.assertEqual(get_likely_moves(board, Symbol.O, Symbol.X, 1), [(0, 2)])
+        self.assertEqual(len(get_likely_moves(board, Symbol.O, Symbol.X, 4)), 4)
+
+
+@override_settings(TICTACTOE_PONDER_WORKERS=1, TICTACTOE_PONDER_MIN_BOARD_SIZE=3)
+class TestPondering(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        get_ponder_cache.cache_clear()
+        get_ponder_workers.cache_clear()
+        self.addCleanup(get_ponder_cache.cache_clear)
+        self.addCleanup(get_ponder_workers.cache_clear)
+
+    def play(self, session, coords):
+        with self.captureOnCommitCallbacks(execute=True):
+            GameHandlerFactory.create(session.game).add_symbol(coords)
+        get_ponder_workers().shutdown()
+
+    def test_pondered_reply(self):
+        session, owner, computer = create_session()
+        self.play(session, (1, 1))
+        game = session.game
+        replies = get_ponder_cache().games[game.pk]
+        self.assertTrue(replies)
+
+        coords = get_likely_moves(game.board, Symbol.X, Symbol.O, 1)[0]
+        board = make_board([(coords, Symbol.X)] + [(move.coords, move.symbol) for move in game.moves.all()])
+        hits = registry.snapshot()['ponder.hits']
+        self.play(session, coords)
+        self.assertEqual(registry.snapshot()['ponder.hits'], hits + 1)
+        self.assertEqual(session.game.moves.order_by('number').last().coords, replies[board.pack()])
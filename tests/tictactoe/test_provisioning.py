@@ -0,0 +1,67 @@
+import io
+import json
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tictactoe.models import ComputerPlayer, GameSession, Player, SessionPlayer
+from tictactoe.provisioning import provision_sessions
+
+
+class TestProvisioning(TestCase):
+
+    def test_provision_sessions(self):
+        with self.assertNumQueries(6):
+            sessions = provision_sessions(20, 'Round', 'Player', game_mode='computer', board_size=5, win_length=4)
+        self.assertEqual(len(sessions), 20)
+        self.assertEqual(GameSession.objects.filter(board_size=5, win_length=4).count(), 20)
+        self.assertEqual(ComputerPlayer.objects.count(), 20)
+        self.assertEqual(SessionPlayer.objects.filter(owner=True).count(), 20)
+        self.assertTrue(all(session.opponent is None for session in sessions))
+        self.assertTrue(GameSession.objects.get(session_id=sessions[0].session_id).is_ready)
+
+        sessions = provision_sessions(5, 'Pairing', 'White', opponent_name='Black')
+        session = GameSession.objects.get(session_id=sessions[4].session_id)
+        self.assertEqual(session.owner.name, 'White 5')
+        self.assertEqual(session.opponent.player_id, sessions[4].opponent.player_id)
+
+    @override_settings(TICTACTOE_SESSION_HANDLER='token')
+    def test_api(self):
+        url = reverse('tictactoe:api:provision')
+        data = {'count': 3, 'name': 'Lobby', 'playerName': 'Player', 'opponentName': 'Guest'}
+        self.assertEqual(self.client.post(url, data, content_type='application/json').status_code, 403)
+
+        User.objects.create_superuser('admin', 'admin@example.org', 'secret')
+        self.client.login(username='admin', password='secret')
+        self.assertEqual(
+            self.client.post(url, dict(data, boardSize=3, winLength=4), content_type='application/json').status_code,
+            400
+        )
+        response = self.client.post(url, data, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        sessions = response.json()
+        self.assertEqual(len(sessions), 3)
+        self.client.logout()
+
+        session = sessions[0]
+        response = self.client.post(
+            reverse('tictactoe:api:session_handler', args=[session['sessionId']]),
+            HTTP_X_PLAYER_TOKEN=session['owner']['token']
+        )
+        self.assertEqual(response.status_code, 201)
+        game = GameSession.objects.get(session_id=session['sessionId']).game
+        self.assertEqual(str(game.active_player.player_id), session['owner']['playerId'])
+
+    def test_command(self):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command('provision_sessions', '10', '--game-mode', 'computer', stdout=stdout, stderr=stderr)
+        self.assertEqual(len(json.loads(stdout.getvalue())), 10)
+        self.assertIn('sessions/s', stderr.getvalue())
+        self.assertEqual(Player.objects.count(), 20)
+
+    def test_command_default_win_length(self):
+        call_command('provision_sessions', '1', '--board-size', '15', stdout=io.StringIO(), stderr=io.StringIO())
+        session = GameSession.objects.get()
+        self.assertEqual((session.board_size, session.win_length), (15, 3))
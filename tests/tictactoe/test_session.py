@@ -0,0 +1,57 @@
+from unittest import mock
+
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import RequestFactory, TestCase, override_settings
+
+from tests.tictactoe.factories import create_session
+from tictactoe.session import SessionHandler, SessionHandlerFactory, TokenSessionHandler
+
+
+@override_settings(TICTACTOE_SESSION_HANDLER='token')
+class TestTokenSessionHandler(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.session, self.owner, self.opponent = create_session(computer=False)
+        self.factory = RequestFactory()
+
+    def issue(self, session=None, value=None):
+        request = self.factory.get('/')
+        SessionHandlerFactory.create(session or self.session, request).set('player_id', value or self.owner.player_id)
+        return request.player_tokens
+
+    def get(self, **kwargs):
+        request = self.factory.get('/', **kwargs)
+        request.session = SessionStore()
+        return SessionHandlerFactory.create(self.session, request).get('player_id')
+
+    def test_cookie(self):
+        for key, token in self.issue().items():
+            self.factory.cookies[key] = token
+        self.assertEqual(self.get(), str(self.owner.player_id))
+
+    def test_header(self):
+        token, = self.issue().values()
+        self.assertEqual(self.get(HTTP_X_PLAYER_TOKEN=token), str(self.owner.player_id))
+
+    def test_invalid(self):
+        token, = self.issue().values()
+        self.assertIsNone(self.get(HTTP_X_PLAYER_TOKEN=token[:-1]))
+
+        other_session, _, _ = create_session()
+        token, = self.issue(session=other_session).values()
+        self.assertIsNone(self.get(HTTP_X_PLAYER_TOKEN=token))
+
+    def test_expired(self):
+        token, = self.issue().values()
+        with mock.patch('django.core.signing.time.time', return_value=10 ** 11):
+            self.assertIsNone(self.get(HTTP_X_PLAYER_TOKEN=token))
+
+    def test_legacy_session(self):
+        request = self.factory.get('/')
+        request.session = SessionStore()
+        SessionHandler(self.session, request).set('player_id', self.opponent.player_id)
+        handler = SessionHandlerFactory.create(self.session, request)
+        self.assertIsInstance(handler, TokenSessionHandler)
+        self.assertEqual(handler.get('player_id'), str(self.opponent.player_id))
+        self.assertEqual(list(request.player_tokens), [handler._make_key('player_id')])
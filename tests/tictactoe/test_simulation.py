@@ -0,0 +1,77 @@
+import io
+import json
+import os
+import random
+import tempfile
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from tictactoe.core import GameCore
+from tictactoe.exceptions import GameEndedError
+from tictactoe.fields import BitBoard, Symbol
+from tictactoe.simulation import Histogram, play_game
+
+
+class TestGameCore(SimpleTestCase):
+
+    def test_play(self):
+        core = GameCore(BitBoard.empty())
+        for coords, symbol in [((0, 0), Symbol.X), ((1, 0), Symbol.O), ((0, 1), Symbol.X), ((1, 1), Symbol.O)]:
+            core.play(coords, symbol)
+            self.assertFalse(core.is_ended)
+        core.play((0, 2), Symbol.X)
+        self.assertTrue(core.is_ended)
+        self.assertEqual(core.winner, Symbol.X)
+        self.assertEqual(core.num_symbols, 5)
+        with self.assertRaises(GameEndedError):
+            core.play((2, 2), Symbol.O)
+
+
+class TestSimulation(SimpleTestCase):
+
+    def test_play_game_is_reproducible(self):
+        self.assertEqual(
+            play_game(('basic', 'basic'), 3, 3, 42)['moves'],
+            play_game(('basic', 'basic'), 3, 3, 42)['moves']
+        )
+
+    def test_global_random_untouched(self):
+        state = random.getstate()
+        play_game(('basic', 'mcts'), 3, 3, 42)
+        self.assertEqual(random.getstate(), state)
+
+    def test_negamax_never_loses(self):
+        for seed in range(20):
+            result = play_game(('basic', 'negamax'), 3, 3, seed)
+            self.assertNotEqual(result['winner'], 'basic')
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.jsonl')
+            out = io.StringIO()
+            call_command('simulate_games', 'basic', 'negamax', '--games', '20', '--swap', '--output', path, stdout=out)
+            with open(path) as fh:
+                results = [json.loads(line) for line in fh]
+        self.assertEqual(len(results), 20)
+        self.assertIn('Played 20 games', out.getvalue())
+        self.assertIn('negamax:', out.getvalue())
+
+    def test_command_workers(self):
+        out = io.StringIO()
+        call_command(
+            'simulate_games', 'basic', 'basic', '--games', '9', '--batch-size', '2', '--workers', '2', stdout=out
+        )
+        self.assertIn('Played 9 games', out.getvalue())
+
+
+class TestHistogram(SimpleTestCase):
+
+    def test_percentiles(self):
+        histogram = Histogram(relative_error=0.01)
+        for value in range(1, 1001):
+            histogram.add(value / 1000)
+        for percent, expected in ((50, 0.5), (90, 0.9), (99, 0.99)):
+            self.assertAlmostEqual(histogram.get_percentile(percent), expected, delta=expected * 0.02)
+        self.assertLess(len(histogram.buckets), 400)
+        self.assertEqual(Histogram().get_percentile(50), 0.0)
@@ -0,0 +1,50 @@
+import io
+import tempfile
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from tictactoe import tablebase
+from tictactoe.engines.negamax import NegamaxEngine
+from tictactoe.engines.tablebase import TablebaseEngine
+from tictactoe.fields import BitBoard, Symbol
+
+
+class TestTablebase(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(TICTACTOE_TABLEBASE_DIR=self.directory.name)
+        self.settings_override.enable()
+        tablebase.tablebases.clear()
+
+    def tearDown(self):
+        tablebase.tablebases.clear()
+        self.settings_override.disable()
+        self.directory.cleanup()
+        super().tearDown()
+
+    def test_build_and_verify(self):
+        out = io.StringIO()
+        call_command('build_tablebase', '--size', '3', '--verify', '--samples', '50', stdout=out)
+        self.assertIn('Solved 4520 positions', out.getvalue())
+        self.assertIn('Verified 50 positions', out.getvalue())
+
+    def test_engine_matches_negamax_outcome(self):
+        call_command('build_tablebase', '--size', '3', stdout=io.StringIO())
+        table = tablebase.get_tablebase(3, 3)
+        engine, solver = TablebaseEngine(), NegamaxEngine()
+        for index, first, second in table.positions():
+            if first.bit_count() != second.bit_count() + 1 or first.bit_count() < 3:
+                continue
+            board = BitBoard.empty()
+            board.masks = {Symbol.X: first, Symbol.O: second}
+            board.num_symbols = (first | second).bit_count()
+            x, y = engine.select_move(board, Symbol.O, Symbol.X)
+            self.assertEqual(board.get_symbol(x, y), Symbol.N)
+            outcome = tablebase.brute_force(3, 3, first, second, x * 3 + y)
+            expected = tablebase.brute_force(3, 3, first, second)
+            self.assertEqual(outcome, expected)
+            solver_move = solver.select_move(board, Symbol.O, Symbol.X)
+            self.assertEqual(tablebase.brute_force(3, 3, first, second, solver_move[0] * 3 + solver_move[1]), expected)
@@ -1,10 +1,14 @@
+import io
 from unittest import mock
 
 from django_webtest import WebTest
+from django.contrib.sessions.models import Session
 from django.core import mail
+from django.core.management import call_command
+from django.test import override_settings
 from django.urls import reverse
 
-from tictactoe.game import random
+from tictactoe.engines.basic import random
 from tictactoe.models import GameSession
 
 
@@ -37,6 +41,8 @@ class TestViews(WebTest):
         response = response.follow()
         response.mustcontain('Start game by X')
 
+        self.assertEqual(len(mail.outbox), 0)
+        call_command('send_outbox', stdout=io.StringIO())
         messages = mail.outbox
         self.assertEqual(len(messages), 1)
         message = messages[0]
@@ -206,3 +212,11 @@ class TestViews(WebTest):
         ])
         winner = result['winner']
         self.assertEqual(winner, 'Computer')
+
+
+@override_settings(TICTACTOE_SESSION_HANDLER='token')
+class TestViewsWithTokens(TestViews):
+
+    def test_all_human_opponent(self):
+        super().test_all_human_opponent()
+        self.assertFalse(Session.objects.exists())
@@ -0,0 +1,47 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from tictactoe.metrics import registry
+from tictactoe.workers import BoundedExecutor
+
+
+class TestBoundedExecutor(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.executor = BoundedExecutor('test_executor', max_workers=1, max_pending=1)
+        self.addCleanup(self.executor.shutdown)
+
+    def get_metric(self, name):
+        return registry.snapshot()[f'test_executor.{name}']
+
+    def test_runs_in_caller_when_full(self):
+        started, release = threading.Event(), threading.Event()
+        threads = []
+
+        def task():
+            threads.append(threading.current_thread())
+            started.set()
+            release.wait(5)
+
+        rejected = self.get_metric('rejected')
+        self.executor.submit(task)
+        started.wait(5)
+        self.assertEqual(self.get_metric('queue_depth'), 1)
+
+        self.executor.submit(lambda: threads.append(threading.current_thread()))
+        self.assertEqual(self.get_metric('rejected'), rejected + 1)
+        self.assertIs(threads[-1], threading.current_thread())
+        self.assertIsNot(threads[0], threading.current_thread())
+
+        release.set()
+        self.executor.shutdown()
+        self.assertEqual(self.get_metric('queue_depth'), 0)
+
+    def test_failed_task(self):
+        failed = self.get_metric('failed')
+        with self.assertLogs('tictactoe.workers', 'ERROR'):
+            self.executor.submit(lambda: 1 / 0)
+            self.executor.shutdown()
+        self.assertEqual(self.get_metric('failed'), failed + 1)
@@ -0,0 +1,105 @@
+from functools import cached_property
+from typing import Dict, Optional, Tuple
+
+from django.db.models import Count, Prefetch, prefetch_related_objects
+
+from tictactoe.models import ComputerPlayer, Game, GameSession, Player, SessionPlayer
+
+
+class GameSessionLoader:
+    """
+    Loads a session, its players, its computer player and (optionally) its
+    active game once per request, so views and serializers share the same
+    instances instead of querying them again.
+    """
+
+    session_id: str
+
+    load_game: bool
+
+    def __init__(self, session_id: str, load_game: bool = False):
+        self.session_id = session_id
+        self.load_game = load_game
+
+    def get_game_state(self) -> Optional[Tuple[int, int]]:
+        """
+        The id and version of the active game, in a single indexed lookup.
+        """
+        return Game.objects.filter(
+            session__session_id=self.session_id,
+            is_active=True
+        ).values_list('pk', 'version').first()
+
+    def get_session_state(self) -> Optional[Tuple[int, int]]:
+        """
+        The number of players and computer players of the session, in a single
+        indexed lookup.
+        """
+        return GameSession.objects.filter(session_id=self.session_id).annotate(
+            num_players=Count('player_session', distinct=True),
+            num_computer_players=Count('computer_player', distinct=True)
+        ).values_list('num_players', 'num_computer_players').first()
+
+    @cached_property
+    def active_game(self) -> Optional[Game]:
+        try:
+            return Game.objects.select_related('session__computer_player__player').get(
+                session__session_id=self.session_id,
+                is_active=True
+            )
+        except Game.DoesNotExist:
+            return None
+
+    @cached_property
+    def session(self) -> Optional[GameSession]:
+        if self.load_game and self.active_game:
+            session = self.active_game.session
+        else:
+            try:
+                session = GameSession.objects.select_related('computer_player__player').get(
+                    session_id=self.session_id
+                )
+            except GameSession.DoesNotExist:
+                return None
+        prefetch_related_objects(
+            [session],
+            Prefetch('player_session', queryset=SessionPlayer.objects.select_related('player'))
+        )
+        return session
+
+    @cached_property
+    def game(self) -> Optional[Game]:
+        """
+        The active game, sharing the session and player instances of the loader.
+        """
+        game = self.active_game
+        if not game or not self.session:
+            return game
+        game.session = self.session
+        players = {player.pk: player for player in self.players.values()}
+        if game.active_player_id in players:
+            game.active_player = players[game.active_player_id]
+        if game.winner_id in players:
+            game.winner = players[game.winner_id]
+        return game
+
+    @cached_property
+    def players(self) -> Dict[str, Player]:
+        """
+        The players of the session, by player_id.
+        """
+        if not self.session:
+            return {}
+        players = [session_player.player for session_player in self.session.player_session.all()]
+        try:
+            players.append(self.session.computer_player.player)
+        except ComputerPlayer.DoesNotExist:
+            ...
+        return {str(player.player_id): player for player in players}
+
+    def get_player(self, player_id: str) -> Optional[Player]:
+        if not player_id:
+            return None
+        if player := self.players.get(str(player_id)):
+            return player
+        return Player.objects.filter(player_id=player_id).first()
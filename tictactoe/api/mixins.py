@@ -1,23 +1,70 @@
+import hashlib
+from functools import cached_property
+from typing import Optional
+
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
 from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from tictactoe.models import GameSession, Player
+from tictactoe.api.loaders import GameSessionLoader
+from tictactoe.models import GameSession
 from tictactoe.session import SessionHandlerFactory
 
 
 class GameSessionMixin(APIView):
 
+    # Players are identified by the session handler, not as Django users
+    authentication_classes = ()
+
+    load_game = False
+
+    @cached_property
+    def loader(self):
+        return GameSessionLoader(self.kwargs['session_id'], load_game=self.load_game)
+
     @property
     def session(self):
-        try:
-            return GameSession.objects.get(session_id=self.kwargs['session_id'])
-        except GameSession.DoesNotExist:
-            raise NotFound()
+        if session := self.loader.session:
+            return session
+        raise NotFound()
+
+    @property
+    def player_id(self):
+        session = GameSession(session_id=self.kwargs['session_id'])
+        return SessionHandlerFactory.create(session, self.request).get('player_id')
 
     @property
     def player(self):
-        player_id = SessionHandlerFactory.create(self.session, self.request).get('player_id')
-        try:
-            return Player.objects.get(player_id=player_id)
-        except Player.DoesNotExist:
-            raise NotFound()
+        if player := self.loader.get_player(self.player_id):
+            return player
+        raise NotFound()
+
+
+class ConditionalGetMixin(APIView):
+    """
+    Answers a GET with 304 Not Modified when the If-None-Match header matches
+    the ETag of the current state, which views look up without loading the
+    objects they serialize.
+    """
+
+    def get_current_state(self) -> Optional[tuple]:
+        raise NotImplementedError()
+
+    @staticmethod
+    def get_etag(*state) -> str:
+        return quote_etag(hashlib.sha1(':'.join(map(str, state)).encode()).hexdigest())
+
+    def get_not_modified_response(self) -> Optional[Response]:
+        if_none_match = self.request.headers.get('If-None-Match')
+        if not if_none_match:
+            return None
+        state = self.get_current_state()
+        if state is None:
+            return None
+        etag = self.get_etag(*state)
+        etags = parse_etags(if_none_match)
+        if etag in etags or '*' in etags:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        return None
@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
 
 from tictactoe.api.exceptions import Conflict
@@ -36,22 +38,44 @@ class GameSerializer(serializers.ModelSerializer):
     def player(self):
         return self.context.get('player')
 
+    @property
+    def since(self):
+        return self.context.get('since')
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.since is not None:
+            del fields['board']
+            fields['moves'] = serializers.SerializerMethodField()
+        return fields
+
     def get_board(self, obj):
         return obj.board.as_list
 
+    def get_moves(self, obj):
+        return [
+            {'coords': move.coords, 'symbol': move.symbol.value}
+            for move in obj.moves.filter(number__gt=self.since)
+        ]
+
     def get_is_active_player(self, obj):
-        return obj.active_player == self.player
+        return self.player is not None and obj.active_player_id == self.player.pk
 
     def get_winner(self, obj):
         return obj.winner.name if obj.winner else None
 
     def get_scores(self, obj):
         return {
-            'owner': obj.session.owner.won_games.count(),
-            'opponent': obj.session.opponent.won_games.count(),
+            'owner': obj.session.owner_score,
+            'opponent': obj.session.opponent_score,
         }
 
 
+class GameQuerySerializer(serializers.Serializer):
+
+    since = serializers.IntegerField(min_value=0, required=False)
+
+
 class GameHandlerSerializer(serializers.Serializer):
 
     coords = serializers.ListField(child=serializers.IntegerField(), min_length=2, max_length=2)
@@ -65,3 +89,73 @@ class GameHandlerSerializer(serializers.Serializer):
             GameHandlerFactory.create(self.game).add_symbol(tuple(self.validated_data['coords']))
         except TicTacToeException as exc:
             raise Conflict(str(exc))
+
+
+class ProvisionSerializer(serializers.Serializer):
+
+    count = serializers.IntegerField(min_value=1, max_value=settings.TICTACTOE_PROVISION_MAX_SESSIONS)
+
+    name = serializers.CharField(max_length=90)
+
+    player_name = serializers.CharField(max_length=90)
+
+    game_mode = serializers.ChoiceField(choices=('human', 'computer'), default='human')
+
+    opponent_name = serializers.CharField(max_length=90, required=False)
+
+    board_size = serializers.IntegerField(min_value=3, max_value=settings.TICTACTOE_MAX_BOARD_SIZE, default=3)
+
+    win_length = serializers.IntegerField(min_value=3, default=3)
+
+    def validate(self, attrs):
+        if attrs['win_length'] > attrs['board_size']:
+            raise serializers.ValidationError({'win_length': 'Series length cannot exceed the board size'})
+        return attrs
+
+
+class ProvisionedPlayerSerializer(serializers.Serializer):
+
+    player_id = serializers.UUIDField()
+
+    name = serializers.CharField()
+
+    token = serializers.CharField()
+
+
+class ProvisionedSessionSerializer(serializers.Serializer):
+
+    session_id = serializers.UUIDField()
+
+    name = serializers.CharField()
+
+    owner = ProvisionedPlayerSerializer()
+
+    opponent = ProvisionedPlayerSerializer(allow_null=True)
+
+
+class MatchmakingSerializer(serializers.Serializer):
+
+    name = serializers.CharField(max_length=100)
+
+    board_size = serializers.IntegerField(min_value=3, max_value=settings.TICTACTOE_MAX_BOARD_SIZE, default=3)
+
+    win_length = serializers.IntegerField(min_value=3, default=3)
+
+    def validate(self, attrs):
+        if attrs['win_length'] > attrs['board_size']:
+            raise serializers.ValidationError({'win_length': 'Series length cannot exceed the board size'})
+        return attrs
+
+
+class TicketSerializer(serializers.Serializer):
+
+    ticket_id = serializers.UUIDField()
+
+    status = serializers.CharField()
+
+    session_id = serializers.UUIDField()
+
+    game_url = serializers.SerializerMethodField()
+
+    def get_game_url(self, obj):
+        return reverse('tictactoe:session_game', args=[obj.session_id]) if obj.session_id else None
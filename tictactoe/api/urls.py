@@ -9,4 +9,9 @@ app_name = 'api'
 urlpatterns = [
     path('session-handler/<uuid:session_id>', views.SessionHandlerView.as_view(), name='session_handler'),
     path('game-handler/<uuid:session_id>', views.GameHandlerView.as_view(), name='game_handler'),
+    path('sessions', views.ProvisionView.as_view(), name='provision'),
+    path('matchmaking', views.MatchmakingView.as_view(), name='matchmaking'),
+    path('matchmaking/<uuid:ticket_id>', views.MatchTicketView.as_view(), name='match_ticket'),
+    path('metrics', views.MetricsView.as_view(), name='metrics'),
+    path('session-events/<uuid:session_id>', views.SessionEventsView.as_view(), name='session_events'),
 ]
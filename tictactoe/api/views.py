@@ -1,55 +1,151 @@
+import asyncio
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import F
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.views import View
 from rest_framework import status
 from rest_framework.exceptions import NotFound
 from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from tictactoe.api import serializers
-from tictactoe.api.mixins import GameSessionMixin
-from tictactoe.models import Game
+from tictactoe.api.exceptions import Conflict
+from tictactoe.api.mixins import ConditionalGetMixin, GameSessionMixin
+from tictactoe.cache import game_cache
+from tictactoe.events import format_event, get_channel, publish_game
+from tictactoe.fields import BitBoard
+from tictactoe.game import resume_computer_move
+from tictactoe.matchmaking import get_matchmaker
+from tictactoe.metrics import registry
+from tictactoe.models import ComputerPlayer, Game, GameSession
+from tictactoe.notifications import get_backend
+from tictactoe.provisioning import provision_sessions
+from tictactoe.session import SessionHandlerFactory
 
 
-class SessionHandlerView(GameSessionMixin, GenericAPIView):
+class SessionHandlerView(ConditionalGetMixin, GameSessionMixin, GenericAPIView):
 
     serializer_class = serializers.GameSessionSerializer
 
+    def get_current_state(self):
+        return self.loader.get_session_state()
+
     def get(self, request, *args, **kwargs):
-        serializer = self.get_serializer(instance=self.session)
-        return Response(serializer.data)
+        if response := self.get_not_modified_response():
+            return response
+        session = self.session
+        serializer = self.get_serializer(instance=session)
+        etag = self.get_etag(len(session.player_session.all()), int(hasattr(session, 'computer_player')))
+        return Response(serializer.data, headers={'ETag': etag})
 
+    @transaction.atomic
     def post(self, request, *args, **kwargs):
-        try:
-            game = self.session.game
-            game.is_active = False
-            game.save()
-        except Game.DoesNotExist:
-            ...
-        Game.objects.create(
-            session=self.session,
+        session = self.session
+        if game := self.loader.game:
+            # Versioned like moves, so a move committed meanwhile is not overwritten
+            updated = Game.objects.filter(pk=game.pk, version=game.version).update(
+                is_active=False,
+                version=F('version') + 1
+            )
+            if not updated:
+                raise Conflict('The game was changed by another move')
+        game = Game.objects.create(
+            session=session,
+            board_size=session.board_size,
+            win_length=session.win_length,
+            board=BitBoard.empty(session.board_size, session.win_length),
             active_player=self.player,
             is_active=True
         )
+        game_cache.set_pointer(session.session_id, game.pk, game.version)
+        publish_game(game)
         return Response(status=status.HTTP_201_CREATED)
 
 
-class GameHandlerView(GameSessionMixin, GenericAPIView):
+class GameHandlerView(ConditionalGetMixin, GameSessionMixin, GenericAPIView):
 
     serializer_class = serializers.GameSerializer
 
+    load_game = True
+
     @property
     def game(self):
-        try:
-            return self.session.game
-        except Game.DoesNotExist:
-            raise NotFound()
+        if game := self.loader.game:
+            return game
+        raise NotFound()
 
     def get_serializer_context(self):
         return {
             'player': self.player
         }
 
+    def get_current_state(self):
+        if state := game_cache.get_pointer(self.kwargs['session_id']) or self.loader.get_game_state():
+            return *state, self.player_id, self.request.query_params.get('since', '')
+        return None
+
+    @staticmethod
+    def is_computer_turn(game) -> bool:
+        try:
+            return game.active_player_id == game.session.computer_player.player_id
+        except ComputerPlayer.DoesNotExist:
+            return False
+
+    def get_cached_state(self) -> dict:
+        """
+        The state of the active game, without the player-specific fields, read
+        through the game cache.
+        """
+        session_id = self.kwargs['session_id']
+        if state := game_cache.get(session_id):
+            return state
+        game = self.game
+        state = {
+            'id': game.pk,
+            'version': game.version,
+            'data': dict(self.get_serializer(instance=game, context={'player': None}).data),
+            'active_player_id': str(game.active_player.player_id) if game.active_player else None,
+            'player_ids': list(self.loader.players),
+            'computer_turn': not game.is_ended and self.is_computer_turn(game),
+            'game_time': game.game_time
+        }
+        game_cache.set(session_id, game.pk, game.version, state)
+        return state
+
+    def resume_lost_reply(self, state: dict):
+        if state.get('computer_turn'):
+            resume_computer_move(state['id'], state['version'], state['game_time'])
+
     def get(self, request, *args, **kwargs):
-        serializer = self.get_serializer(instance=self.game)
-        return Response(serializer.data)
+        # Before the 304, as polling clients keep getting it while the reply is missing
+        cached_state = game_cache.get(self.kwargs['session_id'])
+        if cached_state is not None:
+            self.resume_lost_reply(cached_state)
+        if response := self.get_not_modified_response():
+            return response
+        query_serializer = serializers.GameQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        since = query_serializer.validated_data.get('since')
+        if since is None:
+            state = cached_state
+            if state is None:
+                state = self.get_cached_state()
+                self.resume_lost_reply(state)
+            player_id = self.player_id
+            if player_id in state['player_ids']:
+                data = dict(state['data'], is_active_player=state['active_player_id'] == player_id)
+                etag = self.get_etag(state['id'], state['version'], player_id, '')
+                return Response(data, headers={'ETag': etag})
+        game = self.game
+        serializer = self.get_serializer(instance=game, context=dict(self.get_serializer_context(), since=since))
+        etag = self.get_etag(game.pk, game.version, self.player_id, request.query_params.get('since', ''))
+        return Response(serializer.data, headers={'ETag': etag})
 
     def post(self, request, *args, **kwargs):
         game_handler_serializer = serializers.GameHandlerSerializer(data=request.data, context={'game': self.game})
@@ -57,3 +153,102 @@ class GameHandlerView(GameSessionMixin, GenericAPIView):
         game_handler_serializer.add_symbol()
         serializer = self.get_serializer(instance=self.game)
         return Response(serializer.data)
+
+
+class ProvisionView(GenericAPIView):
+
+    permission_classes = (IsAdminUser,)
+
+    serializer_class = serializers.ProvisionSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        sessions = provision_sessions(**serializer.validated_data)
+        return Response(
+            serializers.ProvisionedSessionSerializer(sessions, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class MatchmakingMixin(GenericAPIView):
+
+    authentication_classes = ()
+
+    serializer_class = serializers.TicketSerializer
+
+    def get_ticket_response(self, ticket, status_code=status.HTTP_200_OK):
+        if ticket.status == 'matched':
+            # The ticket is the credential of the player until it is matched
+            session = GameSession.objects.get(session_id=ticket.session_id)
+            SessionHandlerFactory.create(session, self.request._request).set('player_id', ticket.player_id)
+        return Response(self.get_serializer(instance=ticket).data, status=status_code)
+
+
+class MatchmakingView(MatchmakingMixin):
+
+    def post(self, request, *args, **kwargs):
+        serializer = serializers.MatchmakingSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ticket = get_matchmaker().enqueue(**serializer.validated_data)
+        return self.get_ticket_response(ticket, status.HTTP_201_CREATED)
+
+
+class MatchTicketView(MatchmakingMixin):
+
+    def get(self, request, ticket_id, *args, **kwargs):
+        if ticket := get_matchmaker().get(ticket_id):
+            return self.get_ticket_response(ticket)
+        raise NotFound()
+
+    def delete(self, request, ticket_id, *args, **kwargs):
+        if get_matchmaker().cancel(ticket_id):
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        raise NotFound()
+
+
+class MetricsView(APIView):
+
+    permission_classes = (IsAdminUser,)
+
+    renderer_classes = (JSONRenderer,)
+
+    def get(self, request, *args, **kwargs):
+        return Response(registry.snapshot())
+
+
+class SessionEventsView(View):
+    """
+    Streams the game and session events of a session as Server-Sent Events.
+    """
+
+    async def get(self, request, session_id, *args, **kwargs):
+        if not isinstance(request, ASGIRequest):
+            # Streaming needs the ASGI server, 204 tells EventSource not to reconnect
+            return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+        if not await GameSession.objects.filter(session_id=session_id).aexists():
+            raise Http404()
+        response = StreamingHttpResponse(self.stream(get_channel(session_id)), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    @staticmethod
+    async def stream(channel: str):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.TICTACTOE_EVENTS_TIMEOUT
+        backend = get_backend()
+        subscription = backend.subscribe(channel)
+        try:
+            yield 'retry: 1000\n\n'
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(), min(remaining, settings.TICTACTOE_EVENTS_KEEPALIVE)
+                    )
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                else:
+                    yield format_event(event)
+        finally:
+            backend.unsubscribe(subscription)
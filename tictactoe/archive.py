@@ -0,0 +1,120 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Prefetch
+
+from tictactoe.fields import pack_moves
+from tictactoe.models import ArchivedGame, ComputerPlayer, Game, GameSession, Move, Player, SessionPlayer
+
+
+@dataclass
+class Progress:
+    rows: int = 0
+
+    batches: int = 0
+
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def run_batches(
+    batch: Callable[[int, int], Optional[Tuple[int, int]]],
+    batch_size: int,
+    limit: int = None,
+    pause: float = 0,
+    callback: Callable[[Progress], None] = None
+) -> Progress:
+    """
+    Call batch(last_pk, size) until it returns None, each call in its own
+    transaction, so an interrupted run keeps its work and the next run
+    continues where it stopped. batch returns the last primary key and the
+    number of rows it handled.
+    """
+    progress = Progress()
+    started = time.monotonic()
+    last_pk = 0
+    while limit is None or progress.rows < limit:
+        size = batch_size if limit is None else min(batch_size, limit - progress.rows)
+        with transaction.atomic():
+            result = batch(last_pk, size)
+        if result is None:
+            break
+        last_pk, rows = result
+        progress.rows += rows
+        progress.batches += 1
+        progress.seconds = time.monotonic() - started
+        if callback:
+            callback(progress)
+        if pause:
+            time.sleep(pause)
+    progress.seconds = time.monotonic() - started
+    return progress
+
+
+def archive_games(cutoff: datetime, batch_size: int = 1000, **kwargs) -> Progress:
+    """
+    Move the inactive games older than the cutoff to the archive. The active
+    game of a session stays, even once it has ended.
+    """
+    def batch(last_pk: int, size: int):
+        games = list(
+            Game.objects.filter(
+                is_active=False,
+                game_time__lt=cutoff,
+                pk__gt=last_pk
+            ).select_related('session', 'winner').prefetch_related(
+                Prefetch('moves', queryset=Move.objects.only('game_id', 'number', 'symbol', 'x', 'y'))
+            ).order_by('pk')[:size]
+        )
+        if not games:
+            return None
+        ArchivedGame.objects.bulk_create([
+            ArchivedGame(
+                game_id=game.pk,
+                session_id=game.session.session_id,
+                game_time=game.game_time,
+                board_size=game.board_size,
+                win_length=game.win_length,
+                board=game.board,
+                moves=pack_moves(((move.coords, move.symbol) for move in game.moves.all()), game.board_size),
+                winner=game.winner.symbol if game.winner else None
+            )
+            for game in games
+        ], ignore_conflicts=True)
+        Game.objects.filter(pk__in=[game.pk for game in games]).delete()
+        return games[-1].pk, len(games)
+
+    return run_batches(batch, batch_size, **kwargs)
+
+
+def expire_sessions(cutoff: datetime, batch_size: int = 1000, **kwargs) -> Progress:
+    """
+    Delete the sessions without activity since the cutoff, with their games
+    and players.
+    """
+    def batch(last_pk: int, size: int):
+        session_ids = list(
+            GameSession.objects.filter(
+                session_time__lt=cutoff,
+                pk__gt=last_pk
+            ).exclude(
+                games__game_time__gte=cutoff
+            ).order_by('pk').values_list('pk', flat=True)[:size]
+        )
+        if not session_ids:
+            return None
+        player_ids = [
+            *SessionPlayer.objects.filter(session_id__in=session_ids).values_list('player_id', flat=True),
+            *ComputerPlayer.objects.filter(session_id__in=session_ids).values_list('player_id', flat=True)
+        ]
+        GameSession.objects.filter(pk__in=session_ids).delete()
+        Player.objects.filter(pk__in=player_ids, session_player__isnull=True).delete()
+        return session_ids[-1], len(session_ids)
+
+    return run_batches(batch, batch_size, **kwargs)
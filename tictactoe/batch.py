@@ -0,0 +1,117 @@
+"""
+Vectorized evaluation of many boards at once.
+
+Boards are stored in an ``(n, rows, cols)`` int8 array holding EMPTY, X or O
+per slot.
+"""
+import json
+from dataclasses import dataclass
+from typing import Iterable, List
+
+import numpy as np
+
+from tictactoe.fields import BitBoard, Board, Symbol
+
+
+EMPTY, X, O = 0, 1, 2
+
+
+@dataclass
+class BatchResult:
+    winners: np.ndarray
+
+    draws: np.ndarray
+
+    legal_moves: np.ndarray
+
+
+def get_series_complete(boards: np.ndarray, code: int, win_length: int) -> np.ndarray:
+    """
+    Return a boolean array telling for every board whether `code` has
+    `win_length` slots in a row.
+    """
+    n, rows, cols = boards.shape
+    occupied = boards == code
+    result = np.zeros(n, dtype=bool)
+    for dx, dy in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        height, width = rows - (win_length - 1) * dx, cols - (win_length - 1) * abs(dy)
+        if height <= 0 or width <= 0:
+            continue
+        offset = (win_length - 1) if dy < 0 else 0
+        windows = np.ones((n, height, width), dtype=bool)
+        for i in range(win_length):
+            x, y = i * dx, offset + i * dy
+            windows &= occupied[:, x:x + height, y:y + width]
+        result |= windows.any(axis=(1, 2))
+    return result
+
+
+def evaluate(boards: np.ndarray, win_length: int = 3) -> BatchResult:
+    """
+    Compute the winner (EMPTY, X or O), the draw flag and the mask of legal
+    moves of every board. Ended boards have no legal moves.
+    """
+    boards = np.asarray(boards, dtype=np.int8)
+    x_wins = get_series_complete(boards, X, win_length)
+    o_wins = get_series_complete(boards, O, win_length)
+    winners = np.where(x_wins, X, np.where(o_wins, O, EMPTY)).astype(np.int8)
+    empty = boards == EMPTY
+    draws = (winners == EMPTY) & ~empty.any(axis=(1, 2))
+    legal_moves = empty & (winners == EMPTY)[:, None, None]
+    return BatchResult(winners=winners, draws=draws, legal_moves=legal_moves)
+
+
+def from_boards(boards: Iterable[Board]) -> np.ndarray:
+    """
+    Convert Board instances of one size to an int8 array.
+    """
+    return from_packed(board.pack() for board in boards)
+
+
+def from_packed(values: Iterable[bytes]) -> np.ndarray:
+    """
+    Convert boards of one size in the format of Board.pack, as stored by
+    PackedBoardField, to an int8 array.
+    """
+    values = [bytes(value) for value in values]
+    if not values:
+        return np.zeros((0, 3, 3), dtype=np.int8)
+
+    size = values[0][0]
+    length = (size * size + 7) // 8
+    data = np.frombuffer(b''.join(values), dtype=np.uint8).reshape(len(values), 1 + 2 * length)
+    result = np.zeros((len(values), size * size), dtype=np.int8)
+    for code, offset in ((X, 1), (O, 1 + length)):
+        bits = np.unpackbits(data[:, offset:offset + length], axis=1, bitorder='little')[:, :size * size]
+        result[bits.astype(bool)] = code
+    return result.reshape(len(values), size, size)
+
+
+def from_serialized(values: Iterable[str]) -> np.ndarray:
+    """
+    Convert boards in the JSON format of Board.serialize to an int8 array.
+    """
+    codes = {None: EMPTY, Symbol.X.value: X, Symbol.O.value: O}
+    return np.array(
+        [[[codes[value] for value in row] for row in json.loads(value)] for value in values],
+        dtype=np.int8
+    )
+
+
+def to_boards(boards: np.ndarray, win_length: int = 3) -> List[BitBoard]:
+    symbols = {EMPTY: Symbol.N, X: Symbol.X, O: Symbol.O}
+    return [
+        BitBoard([[symbols[int(value)] for value in row] for row in board], win_length)
+        for board in boards
+    ]
+
+
+def to_packed(boards: np.ndarray) -> List[bytes]:
+    n, size, _ = boards.shape
+    length = (size * size + 7) // 8
+    flat = boards.reshape(n, size * size)
+    header = np.full((n, 1), size, dtype=np.uint8)
+    x_bytes = np.packbits(flat == X, axis=1, bitorder='little')
+    o_bytes = np.packbits(flat == O, axis=1, bitorder='little')
+    data = np.concatenate([header, x_bytes[:, :length], o_bytes[:, :length]], axis=1)
+    return [row.tobytes() for row in data]
@@ -0,0 +1,255 @@
+"""
+Benchmarks for the board, engine and API hot paths, run by the benchmark
+management command.
+
+Every benchmark is a function returning the operation to measure and,
+optionally, a reset callable that runs untimed before every call.
+"""
+import time
+import tracemalloc
+import uuid
+from types import SimpleNamespace
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from tictactoe.api.serializers import GameSerializer
+from tictactoe.engines import get_engine
+from tictactoe.fields import BitBoard, Symbol
+from tictactoe.game import GameHandler
+from tictactoe.models import ComputerPlayer, Game, GameSession, Move, Player, SessionPlayer
+from tictactoe.session import SessionHandlerFactory
+
+
+@dataclass
+class Benchmark:
+    name: str
+
+    setup: Callable[[], Tuple[Callable, Optional[Callable]]]
+
+    number: int
+
+
+@dataclass
+class Result:
+    time_us: float
+
+    queries: int
+
+    peak_kib: float
+
+    def as_dict(self):
+        return {
+            'time_us': round(self.time_us, 3),
+            'queries': self.queries,
+            'peak_kib': round(self.peak_kib, 3),
+        }
+
+
+registry: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, number: int):
+    def decorator(setup):
+        registry[name] = Benchmark(name=name, setup=setup, number=number)
+        return setup
+    return decorator
+
+
+def run(bench: Benchmark, repeat: int = 3) -> Result:
+    """
+    Return the best time per call over `repeat` runs, the number of queries
+    and the peak memory allocated by a single call.
+    """
+    operation, reset = bench.setup()
+    best = None
+    for _ in range(repeat):
+        total = 0.0
+        for _ in range(bench.number):
+            if reset:
+                reset()
+            start = time.perf_counter()
+            operation()
+            total += time.perf_counter() - start
+        best = total if best is None else min(best, total)
+
+    if reset:
+        reset()
+    queries = []
+    # Counted with a wrapper, since every request resets connection.queries.
+    with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+        operation()
+
+    if reset:
+        reset()
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(time_us=best / bench.number * 1e6, queries=len(queries), peak_kib=peak / 1024)
+
+
+MOVES = ((1, 1), (0, 0), (2, 2), (0, 2), (0, 1), (2, 1), (1, 0), (1, 2), (2, 0))
+
+
+def make_board(size: int = 3, win_length: int = 3, moves: int = 4) -> BitBoard:
+    board = BitBoard.empty(size, win_length)
+    for index, (x, y) in enumerate(MOVES[:moves]):
+        board.add_symbol(x, y, Symbol.X if index % 2 == 0 else Symbol.O)
+    return board
+
+
+def make_session(computer: bool = True, board_size: int = 3, win_length: int = 3) -> Tuple[GameSession, Player]:
+    session = GameSession.objects.create(
+        name='Benchmark', session_id=uuid.uuid4(), board_size=board_size, win_length=win_length
+    )
+    symbols = settings.TICTACTOE_PLAYER_SYMBOLS
+    owner = Player.objects.create(name='Owner', player_id=uuid.uuid4(), symbol=Symbol(symbols[0]))
+    SessionPlayer.objects.create(session=session, player=owner, owner=True)
+    opponent = Player.objects.create(name='Opponent', player_id=uuid.uuid4(), symbol=Symbol(symbols[1]))
+    if computer:
+        ComputerPlayer.objects.create(session=session, player=opponent, engine='negamax')
+    else:
+        SessionPlayer.objects.create(session=session, player=opponent)
+    Game.objects.create(
+        session=session,
+        board_size=board_size,
+        win_length=win_length,
+        board=BitBoard.empty(board_size, win_length),
+        active_player=owner,
+        is_active=True
+    )
+    return session, owner
+
+
+def make_client(session: GameSession, player: Player) -> Client:
+    client = Client()
+    request_session = client.session
+    SessionHandlerFactory.create(session, SimpleNamespace(session=request_session)).set('player_id', player.player_id)
+    request_session.save()
+    client.cookies[settings.SESSION_COOKIE_NAME] = request_session.session_key
+    return client
+
+
+@benchmark('board.add_symbol', number=20000)
+def bench_add_symbol():
+    def operation():
+        board = BitBoard.empty()
+        for index, (x, y) in enumerate(MOVES):
+            board.add_symbol(x, y, Symbol.X if index % 2 == 0 else Symbol.O)
+    return operation, None
+
+
+@benchmark('board.has_series_complete', number=100000)
+def bench_has_series_complete():
+    board = make_board(moves=8)
+    return lambda: board.has_series_complete(Symbol.X), None
+
+
+@benchmark('board.has_series_complete_incremental', number=100000)
+def bench_has_series_complete_incremental():
+    board = make_board(15, 5, moves=8)
+    return lambda: board.has_series_complete(Symbol.X, (1, 1)), None
+
+
+@benchmark('board.is_full', number=200000)
+def bench_is_full():
+    board = make_board(moves=8)
+    return lambda: board.is_full, None
+
+
+@benchmark('board.serialize', number=50000)
+def bench_serialize():
+    board = make_board()
+    return board.serialize, None
+
+
+@benchmark('board.deserialize', number=50000)
+def bench_deserialize():
+    value = make_board().serialize()
+    return lambda: BitBoard.deserialize(value), None
+
+
+@benchmark('board.pack', number=50000)
+def bench_pack():
+    board = make_board()
+    return board.pack, None
+
+
+@benchmark('board.unpack', number=50000)
+def bench_unpack():
+    value = make_board().pack()
+    return lambda: BitBoard.unpack(value), None
+
+
+@benchmark('board.as_list', number=50000)
+def bench_as_list():
+    board = make_board()
+    return lambda: board.as_list, None
+
+
+@benchmark('game_handler.learn_symbol.basic', number=5000)
+def bench_learn_symbol_basic():
+    session, _ = make_session()
+    handler = GameHandler(session.game)
+    handler.core.board = make_board(moves=3)
+    engine = get_engine('basic')
+    return lambda: handler.learn_symbol(engine), None
+
+
+@benchmark('game_handler.learn_symbol.negamax', number=5000)
+def bench_learn_symbol_negamax():
+    session, _ = make_session()
+    handler = GameHandler(session.game)
+    handler.core.board = make_board(moves=3)
+    engine = get_engine('negamax')
+    handler.learn_symbol(engine)
+    return lambda: handler.learn_symbol(engine), None
+
+
+@benchmark('api.game_serializer', number=500)
+def bench_game_serializer():
+    session, owner = make_session()
+
+    def operation():
+        game = Game.objects.get(session=session, is_active=True)
+        return GameSerializer(instance=game, context={'player': owner}).data
+    return operation, None
+
+
+@benchmark('api.game_handler.get', number=200)
+def bench_game_handler_get():
+    session, owner = make_session()
+    client = make_client(session, owner)
+    url = reverse('tictactoe:api:game_handler', args=[session.session_id])
+    return lambda: client.get(url), None
+
+
+@benchmark('api.game_handler.post', number=200)
+def bench_game_handler_post():
+    session, owner = make_session()
+    client = make_client(session, owner)
+    url = reverse('tictactoe:api:game_handler', args=[session.session_id])
+
+    def reset():
+        Move.objects.filter(game__session=session).delete()
+        Game.objects.filter(session=session, is_active=True).update(
+            board=BitBoard.empty(), num_symbols=0, winner=None, is_ended=False, active_player=owner
+        )
+
+    return lambda: client.post(url, {'coords': [1, 1]}, content_type='application/json'), reset
+
+
+@benchmark('api.session_handler.get', number=200)
+def bench_session_handler_get():
+    session, owner = make_session()
+    client = make_client(session, owner)
+    url = reverse('tictactoe:api:session_handler', args=[session.session_id])
+    return lambda: client.get(url), None
@@ -0,0 +1,138 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from tictactoe.metrics import registry
+
+
+class LRUCache:
+    """
+    A bounded, thread-safe in-process cache whose entries expire after ttl
+    seconds.
+    """
+
+    def __init__(self, name: str, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = registry.counter(f'{name}.hits')
+        self.misses = registry.counter(f'{name}.misses')
+        self.evictions = registry.counter(f'{name}.evictions')
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses.inc()
+                return None
+            self.entries.move_to_end(key)
+        self.hits.inc()
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions.inc()
+
+    def delete(self, key: Hashable):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class GameStateCache:
+    """
+    Read-through cache of the serialized state of active games.
+
+    States are stored under the session, game and version they were built
+    from, so they never change and are also kept in a per-process LRU. A
+    pointer per session refers to the current game and version. It is only
+    kept in the configured Django cache, so every worker sees a move at once.
+    Writers set it to the new version when they commit, readers only add it
+    when it is missing, so a reader never replaces a newer pointer.
+    """
+
+    def __init__(self):
+        self.local = LRUCache('game_cache.local', settings.TICTACTOE_GAME_CACHE_SIZE, settings.TICTACTOE_GAME_CACHE_TTL)
+        self.hits = registry.counter('game_cache.shared.hits')
+        self.misses = registry.counter('game_cache.shared.misses')
+
+    @property
+    def shared(self):
+        return caches[settings.TICTACTOE_GAME_CACHE_ALIAS]
+
+    @staticmethod
+    def get_pointer_key(session_id: uuid.UUID) -> str:
+        return f'tictactoe:game:{uuid.UUID(str(session_id)).hex}'
+
+    @staticmethod
+    def get_state_key(session_id: uuid.UUID, game_id: int, version: int) -> str:
+        return f'tictactoe:game-state:{uuid.UUID(str(session_id)).hex}:{game_id}:{version}'
+
+    def get_pointer(self, session_id: uuid.UUID) -> Optional[Tuple[int, int]]:
+        """
+        The id and version of the active game of the session.
+        """
+        return self._get_shared(self.get_pointer_key(session_id))
+
+    def get(self, session_id: uuid.UUID) -> Optional[dict]:
+        if pointer := self.get_pointer(session_id):
+            return self._get(self.get_state_key(session_id, *pointer))
+        return None
+
+    def set(self, session_id: uuid.UUID, game_id: int, version: int, state: dict):
+        key = self.get_state_key(session_id, game_id, version)
+        self.local.set(key, state)
+        self.shared.set(key, state, settings.TICTACTOE_GAME_CACHE_TIMEOUT)
+        self.shared.add(self.get_pointer_key(session_id), (game_id, version), settings.TICTACTOE_GAME_CACHE_TIMEOUT)
+
+    def set_pointer(self, session_id: uuid.UUID, game_id: int, version: int):
+        """
+        Drop the pointer of the session now, so the current transaction does
+        not read it, and point it at the new game and version on commit,
+        unless a later change got there first.
+        """
+        key = self.get_pointer_key(session_id)
+
+        def update():
+            current = self.shared.get(key)
+            if current is None or tuple(current) < (game_id, version):
+                self.shared.set(key, (game_id, version), settings.TICTACTOE_GAME_CACHE_TIMEOUT)
+
+        self.shared.delete(key)
+        transaction.on_commit(update)
+
+    def invalidate(self, session_id: uuid.UUID):
+        self.shared.delete(self.get_pointer_key(session_id))
+
+    def _get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is None:
+            value = self._get_shared(key)
+            if value is not None:
+                self.local.set(key, value)
+        return value
+
+    def _get_shared(self, key: str) -> Optional[Any]:
+        value = self.shared.get(key)
+        (self.misses if value is None else self.hits).inc()
+        return value
+
+
+game_cache = GameStateCache()
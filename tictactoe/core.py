@@ -0,0 +1,48 @@
+from typing import Iterable, Optional, Tuple
+
+from tictactoe.exceptions import GameEndedError
+from tictactoe.fields import Board, Symbol
+
+
+class GameCore:
+    """
+    The rules of a single game, independent of the ORM: places symbols and
+    keeps track of the number of symbols, the winner and the end of the game.
+    """
+
+    board: Board
+
+    num_symbols: int
+
+    winner: Optional[Symbol]
+
+    is_ended: bool
+
+    def __init__(self, board: Board, num_symbols: int = 0, winner: Symbol = None, is_ended: bool = False):
+        self.board = board
+        self.num_symbols = num_symbols
+        self.winner = winner
+        self.is_ended = is_ended
+
+    def play(self, coords: Tuple[int, int], symbol: Symbol):
+        if self.is_ended:
+            raise GameEndedError()
+
+        x, y = coords
+        self.board.add_symbol(x, y, symbol)
+        self.num_symbols += 1
+        if self.board.has_series_complete(symbol, coords):
+            self.winner = symbol
+            self.is_ended = True
+        elif self.num_symbols == self.board.size ** 2:
+            self.is_ended = True
+
+    @classmethod
+    def replay(cls, board: Board, moves: Iterable[Tuple[Tuple[int, int], Symbol]]) -> 'GameCore':
+        """
+        Rebuild a game by playing the moves, in order, on the (empty) board.
+        """
+        core = cls(board)
+        for coords, symbol in moves:
+            core.play(coords, symbol)
+        return core
@@ -0,0 +1,21 @@
+import inspect
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from tictactoe.engines.base import Engine
+
+
+def get_engine(name: str = None, seed: int = None) -> Engine:
+    """
+    Create the engine, seeded with `seed` when the engine takes a seed.
+    """
+    name = name or settings.TICTACTOE_ENGINE
+    try:
+        engine_class = import_string(settings.TICTACTOE_ENGINES[name])
+    except KeyError:
+        raise ImproperlyConfigured(f'Unknown engine: {name}')
+    if seed is not None and 'seed' in inspect.signature(engine_class).parameters:
+        return engine_class(seed=seed)
+    return engine_class()
@@ -0,0 +1,46 @@
+from functools import lru_cache
+from typing import Tuple
+
+from tictactoe.fields import BitBoard, Board, Symbol
+
+
+@lru_cache(maxsize=None)
+def get_edge_masks(size: int) -> Tuple[int, int]:
+    """
+    Return the masks of the first and the last column, used to keep shifted
+    masks from wrapping around to the next row.
+    """
+    first = sum(1 << (x * size) for x in range(size))
+    return first, first << (size - 1)
+
+
+def get_neighbourhood(size: int, mask: int, distance: int = 1) -> int:
+    """
+    Return the mask of all slots within `distance` of a slot in `mask`.
+    """
+    first, last = get_edge_masks(size)
+    full = (1 << (size * size)) - 1
+    for _ in range(distance):
+        mask |= ((mask & ~last) << 1) | ((mask & ~first) >> 1)
+        mask |= (mask << size) | (mask >> size)
+    return mask & full
+
+
+def get_bits(mask: int):
+    while mask:
+        low_bit = mask & -mask
+        mask ^= low_bit
+        yield low_bit.bit_length() - 1
+
+
+class Engine:
+
+    def select_move(self, board: Board, symbol: Symbol, opponent_symbol: Symbol) -> Tuple[int, int]:
+        """
+        Return the coords of the move for `symbol` on the given board.
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def get_bit_board(board: Board) -> BitBoard:
+        return board if isinstance(board, BitBoard) else BitBoard(board.rows, board.win_length)
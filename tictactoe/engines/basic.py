@@ -0,0 +1,42 @@
+import random
+from typing import Tuple
+
+from django.conf import settings
+
+from tictactoe.engines.base import Engine
+from tictactoe.exceptions import SlotNotAvailableError
+from tictactoe.fields import Board, Symbol
+
+
+class BasicEngine(Engine):
+    """
+    Completes its own series, blocks the opponent's or picks a random free
+    slot.
+    """
+
+    def __init__(self, seed: int = None):
+        seed = settings.TICTACTOE_ENGINE_SEED if seed is None else seed
+        self.random = random if seed is None else random.Random(seed)
+
+    def select_move(self, board: Board, symbol: Symbol, opponent_symbol: Symbol) -> Tuple[int, int]:
+        block = None
+        for series in board.get_series():
+            free_slot = next(filter(lambda s: s.symbol == Symbol.N, series), None)
+            if not free_slot:
+                continue
+            count = board.get_series_count(series, symbol)
+            if count == len(series) - 1:
+                return free_slot.coords
+            if not block and board.get_series_count(series, opponent_symbol) == len(series) - 1:
+                block = free_slot.coords
+        if block:
+            return block
+        free_slots = [
+            (x, y)
+            for x, row in enumerate(board.rows)
+            for y, value in enumerate(row)
+            if value == Symbol.N
+        ]
+        if not free_slots:
+            raise SlotNotAvailableError()
+        return self.random.choice(free_slots)
@@ -0,0 +1,211 @@
+import atexit
+import math
+import multiprocessing
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from tictactoe.engines.base import Engine, get_bits, get_neighbourhood
+from tictactoe.exceptions import SlotNotAvailableError
+from tictactoe.fields import Board, Symbol, get_cell_line_masks
+
+
+DRAW = -1
+
+executors: Dict[int, ProcessPoolExecutor] = {}
+
+executors_lock = threading.Lock()
+
+
+def get_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    The process pool for the number of workers. Its processes are started by
+    a fork server, or spawned where there is none, as forking a web worker that
+    runs threads could copy locks held by the other threads into them.
+    """
+    with executors_lock:
+        if workers not in executors:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            executors[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context(method)
+            )
+        return executors[workers]
+
+
+@atexit.register
+def shutdown_executors():
+    with executors_lock:
+        pools = list(executors.values())
+        executors.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class Node:
+
+    __slots__ = ('bit', 'parent', 'children', 'untried', 'visits', 'wins', 'winner')
+
+    def __init__(self, bit: Optional[int], parent: Optional['Node'], untried: List[int], winner: Optional[int]):
+        self.bit = bit
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+        self.winner = winner
+
+
+class Tree:
+    """
+    UCT search tree for one worker. Side 0 is the side to move at the root;
+    `wins` on a node are counted for the side that moved into it.
+    """
+
+    exploration: float = math.sqrt(2)
+
+    def __init__(self, size: int, win_length: int, own: int, other: int, rng: random.Random):
+        self.size = size
+        self.full = (1 << (size * size)) - 1
+        self.cell_lines = get_cell_line_masks(size, win_length)
+        self.masks = (own, other)
+        self.rng = rng
+        self.root = Node(None, None, self.get_candidates(own | other), None)
+
+    def get_candidates(self, occupied: int) -> List[int]:
+        free = self.full & ~occupied
+        if not occupied:
+            return [(self.size // 2) * self.size + self.size // 2]
+        candidates = list(get_bits(get_neighbourhood(self.size, occupied) & free))
+        self.rng.shuffle(candidates)
+        return candidates
+
+    def is_win(self, mask: int, bit: int) -> bool:
+        return any(mask & line == line for line in self.cell_lines[bit])
+
+    def simulate(self):
+        masks = list(self.masks)
+        side = 0
+        node = self.root
+
+        while not node.untried and node.children and node.winner is None:
+            log_visits = math.log(node.visits)
+            node = max(
+                node.children,
+                key=lambda child: child.wins / child.visits + self.exploration * math.sqrt(log_visits / child.visits)
+            )
+            masks[side] |= 1 << node.bit
+            side = 1 - side
+
+        if node.untried and node.winner is None:
+            bit = node.untried.pop()
+            masks[side] |= 1 << bit
+            occupied = masks[0] | masks[1]
+            if self.is_win(masks[side], bit):
+                winner = side
+            elif occupied == self.full:
+                winner = DRAW
+            else:
+                winner = None
+            child = Node(bit, node, [] if winner is not None else self.get_candidates(occupied), winner)
+            node.children.append(child)
+            node = child
+            side = 1 - side
+
+        winner = node.winner if node.winner is not None else self.rollout(masks, side)
+
+        # The node was entered by the side that is not to move there.
+        mover = 1 - side
+        while node is not None:
+            node.visits += 1
+            if winner == DRAW:
+                node.wins += 0.5
+            elif winner == mover:
+                node.wins += 1
+            mover = 1 - mover
+            node = node.parent
+
+    def rollout(self, masks: List[int], side: int) -> int:
+        free = list(get_bits(self.full & ~(masks[0] | masks[1])))
+        self.rng.shuffle(free)
+        for bit in free:
+            masks[side] |= 1 << bit
+            if self.is_win(masks[side], bit):
+                return side
+            side = 1 - side
+        return DRAW
+
+
+def run_simulations(size: int, win_length: int, own: int, other: int, simulations: int,
+                    seed: int) -> Dict[int, Tuple[int, float]]:
+    """
+    Run `simulations` playouts from the position and return the visits and
+    wins of every root move.
+    """
+    tree = Tree(size, win_length, own, other, random.Random(seed))
+    for _ in range(simulations):
+        tree.simulate()
+    return {child.bit: (child.visits, child.wins) for child in tree.root.children}
+
+
+class MonteCarloEngine(Engine):
+    """
+    Monte Carlo Tree Search with root parallelization: every worker of a
+    process pool grows its own tree from a derived seed and the root
+    statistics are merged, so results are reproducible for a fixed seed.
+    """
+
+    simulations: int
+
+    workers: int
+
+    seed: Optional[int]
+
+    def __init__(self, simulations: int = None, workers: int = None, seed: int = None):
+        self.simulations = simulations or settings.TICTACTOE_MCTS_SIMULATIONS
+        self.workers = workers or settings.TICTACTOE_MCTS_WORKERS
+        self.seed = settings.TICTACTOE_ENGINE_SEED if seed is None else seed
+
+    def select_move(self, board: Board, symbol: Symbol, opponent_symbol: Symbol) -> Tuple[int, int]:
+        board = self.get_bit_board(board)
+        own, other = board.masks[symbol], board.masks[opponent_symbol]
+        free = board.full_mask & ~(own | other)
+        if not free:
+            raise SlotNotAvailableError()
+
+        if (bit := self.get_forced_move(board, own, other, free)) is not None:
+            return divmod(bit, board.size)
+
+        stats = self.get_stats(board.size, board.win_length, own, other)
+        best_bit = max(sorted(stats), key=lambda bit: stats[bit][0])
+        return divmod(best_bit, board.size)
+
+    def get_stats(self, size: int, win_length: int, own: int, other: int) -> Dict[int, Tuple[int, float]]:
+        seed = random.getrandbits(32) if self.seed is None else self.seed
+        simulations = -(-self.simulations // self.workers)
+        jobs = [(size, win_length, own, other, simulations, seed + index) for index in range(self.workers)]
+        if self.workers > 1:
+            results = get_executor(self.workers).map(run_simulations, *zip(*jobs))
+        else:
+            results = [run_simulations(*job) for job in jobs]
+
+        stats = {}
+        for result in results:
+            for bit, (visits, wins) in result.items():
+                total_visits, total_wins = stats.get(bit, (0, 0.0))
+                stats[bit] = (total_visits + visits, total_wins + wins)
+        return stats
+
+    @staticmethod
+    def get_forced_move(board: Board, own: int, other: int, free: int) -> Optional[int]:
+        """
+        Return a move that wins at once or blocks the opponent from doing so.
+        """
+        cell_lines = get_cell_line_masks(board.size, board.win_length)
+        for mask in (own, other):
+            for bit in get_bits(free):
+                if any((mask | 1 << bit) & line == line for line in cell_lines[bit]):
+                    return bit
+        return None
@@ -0,0 +1,148 @@
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from tictactoe.engines.base import Engine
+from tictactoe.engines.search import SearchEngine
+from tictactoe.exceptions import SlotNotAvailableError
+from tictactoe.fields import Board, Symbol, get_line_masks
+
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+@lru_cache(maxsize=None)
+def get_symmetries(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Return, for each of the 8 board symmetries, the bit index every bit is
+    moved to.
+    """
+    last = size - 1
+    transforms = (
+        lambda x, y: (x, y),
+        lambda x, y: (y, last - x),
+        lambda x, y: (last - x, last - y),
+        lambda x, y: (last - y, x),
+        lambda x, y: (x, last - y),
+        lambda x, y: (last - x, y),
+        lambda x, y: (y, x),
+        lambda x, y: (last - y, last - x),
+    )
+    symmetries = []
+    for transform in transforms:
+        permutation = []
+        for bit in range(size * size):
+            x, y = transform(*divmod(bit, size))
+            permutation.append(x * size + y)
+        symmetries.append(tuple(permutation))
+    return tuple(symmetries)
+
+
+@lru_cache(maxsize=None)
+def get_symmetry_tables(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Lookup tables mapping every mask to its image under each symmetry. Only
+    feasible for small boards: a table has 2 ** (size * size) entries.
+    """
+    tables = []
+    for permutation in get_symmetries(size):
+        table = [0] * (1 << (size * size))
+        for mask in range(1, len(table)):
+            low_bit = mask & -mask
+            table[mask] = table[mask ^ low_bit] | (1 << permutation[low_bit.bit_length() - 1])
+        tables.append(tuple(table))
+    return tuple(tables)
+
+
+class NegamaxEngine(Engine):
+    """
+    Perfect player: negamax with alpha-beta pruning. Positions are stored in
+    a per-process transposition table keyed on the position canonicalized
+    under the 8 board symmetries, so every position is searched only once.
+
+    Solving is only fast enough, and the table only small enough, on 3x3
+    boards: larger boards are handed to the time-limited search engine.
+    """
+
+    max_size: int = 3
+
+    transposition_tables: Dict[Tuple[int, int], Dict[int, Tuple[int, int]]] = {}
+
+    size: int
+
+    lines: Tuple[int, ...]
+
+    table: Dict[int, Tuple[int, int]]
+
+    def select_move(self, board: Board, symbol: Symbol, opponent_symbol: Symbol) -> Tuple[int, int]:
+        board = self.get_bit_board(board)
+        if board.size > self.max_size:
+            return SearchEngine().select_move(board, symbol, opponent_symbol)
+
+        self.size = board.size
+        self.lines = get_line_masks(board.size, board.win_length)
+        self.table = self.transposition_tables.setdefault((board.size, board.win_length), {})
+        own, other = board.masks[symbol], board.masks[opponent_symbol]
+        free = board.full_mask & ~(own | other)
+        if not free:
+            raise SlotNotAvailableError()
+
+        bound = self.size * self.size + 1
+        best_score, best_bit = None, None
+        for bit in range(self.size * self.size):
+            move = 1 << bit
+            if not free & move:
+                continue
+            score = -self.negamax(other, own | move, -bound, bound)
+            if best_score is None or score > best_score:
+                best_score, best_bit = score, bit
+        return divmod(best_bit, self.size)
+
+    def negamax(self, own: int, other: int, alpha: int, beta: int) -> int:
+        """
+        Score the position for the side to move (`own`): positive when it
+        wins, higher for faster wins, zero for a draw.
+        """
+        free = ((1 << (self.size * self.size)) - 1) & ~(own | other)
+        if any(other & line == line for line in self.lines):
+            return -(bin(free).count('1') + 1)
+        if not free:
+            return 0
+
+        key = self.get_key(self.size, own, other)
+        original_alpha = alpha
+        if entry := self.table.get(key):
+            score, flag = entry
+            if flag == EXACT:
+                return score
+            if flag == LOWER:
+                alpha = max(alpha, score)
+            elif flag == UPPER:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+
+        best = -self.size * self.size - 1
+        while free:
+            move = free & -free
+            free ^= move
+            best = max(best, -self.negamax(other, own | move, -beta, -alpha))
+            alpha = max(alpha, best)
+            if alpha >= beta:
+                break
+
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (best, flag)
+        return best
+
+    @staticmethod
+    def get_key(size: int, own: int, other: int) -> int:
+        shift = size * size
+        return min(
+            (table[own] << shift) | table[other]
+            for table in get_symmetry_tables(size)
+        )
@@ -0,0 +1,225 @@
+import random
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from tictactoe.engines.base import Engine, get_bits, get_neighbourhood
+from tictactoe.exceptions import SlotNotAvailableError
+from tictactoe.fields import Board, Symbol, get_cell_line_masks, get_line_masks
+
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+WIN = 10 ** 9
+
+
+class SearchTimeout(Exception):
+    ...
+
+
+@lru_cache(maxsize=None)
+def get_zobrist_keys(size: int) -> Dict[Symbol, Tuple[int, ...]]:
+    rng = random.Random(size)
+    return {
+        symbol: tuple(rng.getrandbits(64) for _ in range(size * size))
+        for symbol in (Symbol.X, Symbol.O)
+    }
+
+
+class TranspositionTable:
+    """
+    Bounded, thread-safe transposition table that evicts the least recently
+    used entry. Searches running in other threads share it.
+    """
+
+    entries: OrderedDict
+
+    max_size: int
+
+    def __init__(self, max_size: int):
+        self.entries = OrderedDict()
+        self.max_size = max_size
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key: int):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: int, entry: Tuple[int, int, int, Optional[int]]):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+
+class SearchEngine(Engine):
+    """
+    Iterative-deepening alpha-beta search for large boards. Positions are
+    hashed with Zobrist keys into a bounded transposition table, moves are
+    ordered by the table move, killer moves and the history heuristic, and
+    only empty slots next to existing symbols are searched. The best move of
+    the last completed iteration is returned once the move time runs out.
+    """
+
+    tables: Dict[Tuple[int, int], TranspositionTable] = {}
+
+    distance: int = 1
+
+    move_time: float
+
+    deadline: float
+
+    nodes: int
+
+    killers: List[List[Optional[int]]]
+
+    history: List[int]
+
+    def __init__(self, move_time: float = None):
+        self.move_time = settings.TICTACTOE_ENGINE_MOVE_TIME if move_time is None else move_time
+
+    def select_move(self, board: Board, symbol: Symbol, opponent_symbol: Symbol) -> Tuple[int, int]:
+        board = self.get_bit_board(board)
+        own, other = board.masks[symbol], board.masks[opponent_symbol]
+        free = board.full_mask & ~(own | other)
+        if not free:
+            raise SlotNotAvailableError()
+
+        self.prepare(board, symbol, opponent_symbol)
+        position_hash = 0
+        for keys, mask in zip(self.keys, (own, other)):
+            for bit in get_bits(mask):
+                position_hash ^= keys[bit]
+
+        best_bit = next(iter(self.get_candidates(own | other, free)))
+        for depth in range(1, bin(free).count('1') + 1):
+            try:
+                score, best_bit = self.search_root(own, other, position_hash, depth, best_bit)
+            except SearchTimeout:
+                break
+            if abs(score) >= WIN - depth:
+                break
+        return divmod(best_bit, self.size)
+
+    def prepare(self, board: Board, symbol: Symbol, opponent_symbol: Symbol):
+        self.size = board.size
+        self.full = board.full_mask
+        self.lines = get_line_masks(board.size, board.win_length)
+        self.cell_lines = get_cell_line_masks(board.size, board.win_length)
+        self.weights = tuple(10 ** count if count else 0 for count in range(board.win_length + 1))
+        zobrist_keys = get_zobrist_keys(board.size)
+        self.keys = (zobrist_keys[symbol], zobrist_keys[opponent_symbol])
+        self.table = self.tables.setdefault(
+            (board.size, board.win_length),
+            TranspositionTable(settings.TICTACTOE_ENGINE_TABLE_SIZE)
+        )
+        self.deadline = time.monotonic() + self.move_time
+        self.nodes = 0
+        self.killers = [[None, None] for _ in range(board.size * board.size + 1)]
+        self.history = [0] * (board.size * board.size)
+
+    def search_root(self, own: int, other: int, position_hash: int, depth: int, first_bit: int):
+        alpha, beta = -WIN - 1, WIN + 1
+        best_score, best_bit = None, first_bit
+        free = self.full & ~(own | other)
+        candidates = self.order_moves(self.get_candidates(own | other, free), first_bit, 0)
+        for bit in candidates:
+            score = -self.search(
+                other, own | (1 << bit), 1, position_hash ^ self.keys[0][bit], depth - 1, 1, -beta, -alpha, bit
+            )
+            if best_score is None or score > best_score:
+                best_score, best_bit = score, bit
+            alpha = max(alpha, score)
+        return best_score, best_bit
+
+    def search(self, own: int, other: int, side: int, position_hash: int, depth: int, ply: int,
+               alpha: int, beta: int, last_bit: int) -> int:
+        self.nodes += 1
+        if not self.nodes & 1023 and time.monotonic() >= self.deadline:
+            raise SearchTimeout()
+
+        if any(other & line == line for line in self.cell_lines[last_bit]):
+            return -(WIN - ply)
+        free = self.full & ~(own | other)
+        if not free:
+            return 0
+        if depth == 0:
+            return self.evaluate(own, other)
+
+        table_move = None
+        original_alpha = alpha
+        if entry := self.table.get(position_hash):
+            entry_depth, score, flag, table_move = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return score
+                if flag == LOWER:
+                    alpha = max(alpha, score)
+                elif flag == UPPER:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        best, best_bit = -WIN - 1, None
+        for bit in self.order_moves(self.get_candidates(own | other, free), table_move, ply):
+            score = -self.search(
+                other, own | (1 << bit), 1 - side, position_hash ^ self.keys[side][bit],
+                depth - 1, ply + 1, -beta, -alpha, bit
+            )
+            if score > best:
+                best, best_bit = score, bit
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                killers = self.killers[ply]
+                if bit != killers[0]:
+                    killers[0], killers[1] = bit, killers[0]
+                self.history[bit] += depth * depth
+                break
+
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.put(position_hash, (depth, best, flag, best_bit))
+        return best
+
+    def evaluate(self, own: int, other: int) -> int:
+        """
+        Score the position for the side to move from the series that only one
+        side still occupies.
+        """
+        score = 0
+        for line in self.lines:
+            own_count, other_count = (own & line).bit_count(), (other & line).bit_count()
+            if own_count and not other_count:
+                score += self.weights[own_count]
+            elif other_count and not own_count:
+                score -= self.weights[other_count]
+        return score
+
+    def get_candidates(self, occupied: int, free: int) -> List[int]:
+        if not occupied:
+            return [(self.size // 2) * self.size + self.size // 2]
+
+        return list(get_bits(get_neighbourhood(self.size, occupied, self.distance) & free))
+
+    def order_moves(self, candidates: List[int], table_move: Optional[int], ply: int) -> List[int]:
+        killers = self.killers[ply]
+        return sorted(
+            candidates,
+            key=lambda bit: (bit == table_move, bit in killers, self.history[bit]),
+            reverse=True
+        )
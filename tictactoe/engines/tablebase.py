@@ -0,0 +1,26 @@
+from typing import Tuple
+
+from tictactoe.engines.base import Engine
+from tictactoe.exceptions import EngineError, SlotNotAvailableError
+from tictactoe.fields import Board, Symbol
+from tictactoe.tablebase import get_tablebase
+
+
+class TablebaseEngine(Engine):
+    """
+    Looks the best move up in a precomputed tablebase (see the
+    build_tablebase command).
+    """
+
+    def select_move(self, board: Board, symbol: Symbol, opponent_symbol: Symbol) -> Tuple[int, int]:
+        board = self.get_bit_board(board)
+        own, other = board.masks[symbol], board.masks[opponent_symbol]
+        if not board.full_mask & ~(own | other):
+            raise SlotNotAvailableError()
+
+        tablebase = get_tablebase(board.size, board.win_length)
+        first, second = (own, other) if own.bit_count() == other.bit_count() else (other, own)
+        outcome, bit = tablebase.lookup(first, second)
+        if not outcome:
+            raise EngineError('Position not in tablebase')
+        return divmod(bit, board.size)
@@ -0,0 +1,36 @@
+import json
+import uuid
+
+from tictactoe.models import Game, GameSession
+from tictactoe.notifications import get_backend
+
+
+def get_channel(session_id: uuid.UUID) -> str:
+    return f'session-{uuid.UUID(str(session_id)).hex}'
+
+
+def publish(session_id: uuid.UUID, event: dict):
+    """
+    Publish the event to the subscribers of the session, in every worker, once
+    the current transaction commits.
+    """
+    get_backend().notify(get_channel(session_id), event)
+
+
+def publish_game(game: Game):
+    publish(game.session.session_id, {
+        'type': 'game',
+        'version': game.version,
+        'numSymbols': game.num_symbols,
+        'isEnded': game.is_ended
+    })
+
+
+def publish_session(session: GameSession):
+    publish(session.session_id, {
+        'type': 'session'
+    })
+
+
+def format_event(event: dict) -> str:
+    return f'event: {event["type"]}\ndata: {json.dumps(event)}\n\n'
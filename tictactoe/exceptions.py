@@ -8,3 +8,23 @@ class SlotOutOfRangeError(TicTacToeException):
 
 class SlotNotAvailableError(TicTacToeException):
     ...
+
+
+class EngineError(TicTacToeException):
+    ...
+
+
+class GameEndedError(TicTacToeException):
+    ...
+
+
+class VersionConflictError(TicTacToeException):
+    ...
+
+
+class PlayerNotActiveError(TicTacToeException):
+    ...
+
+
+class OutboxConnectionError(TicTacToeException):
+    ...
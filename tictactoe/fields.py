@@ -1,7 +1,8 @@
 import json
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
 
 from django.db import models
 
@@ -82,38 +83,124 @@ class Slot:
     symbol: Symbol
 
 
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+@lru_cache(maxsize=None)
+def get_row_lines(size: int, length: int) -> Tuple[Tuple[Tuple[int, int], ...], ...]:
+    return tuple(
+        tuple((x, y + i) for i in range(length))
+        for x in range(size)
+        for y in range(size - length + 1)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_column_lines(size: int, length: int) -> Tuple[Tuple[Tuple[int, int], ...], ...]:
+    return tuple(
+        tuple((x + i, y) for i in range(length))
+        for y in range(size)
+        for x in range(size - length + 1)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_diagonal_lines(size: int, length: int) -> Tuple[Tuple[Tuple[int, int], ...], ...]:
+    starts = [(x, y) for x in range(size - length + 1) for y in range(size - length + 1)]
+    return tuple(
+        tuple((x + i, y + i) for i in range(length))
+        for x, y in starts
+    ) + tuple(
+        tuple((x + i, y + length - 1 - i) for i in range(length))
+        for x, y in starts
+    )
+
+
+@lru_cache(maxsize=None)
+def get_lines(size: int, length: int) -> Tuple[Tuple[Tuple[int, int], ...], ...]:
+    """
+    Return the coordinates of every series of `length` slots (rows, columns,
+    diagonals) on a board of the given size, in the order of
+    Board.get_series.
+    """
+    return get_row_lines(size, length) + get_column_lines(size, length) + get_diagonal_lines(size, length)
+
+
+@lru_cache(maxsize=None)
+def get_line_masks(size: int, length: int) -> Tuple[int, ...]:
+    return tuple(
+        sum(1 << (x * size + y) for x, y in line)
+        for line in get_lines(size, length)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_cell_line_masks(size: int, length: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Return, for every bit, the masks of the series that pass through it.
+    """
+    cell_masks = [[] for _ in range(size * size)]
+    for line, mask in zip(get_lines(size, length), get_line_masks(size, length)):
+        for x, y in line:
+            cell_masks[x * size + y].append(mask)
+    return tuple(tuple(masks) for masks in cell_masks)
+
+
 class Board:
 
     rows: List[List[Symbol]]
 
-    def __init__(self, rows: List[List[Symbol]]):
+    size: int
+
+    win_length: int
+
+    def __init__(self, rows: List[List[Symbol]], win_length: int = 3):
         self.rows = rows
+        self.size = len(rows)
+        self.win_length = win_length
 
     def __str__(self):
         return self.serialize()
 
     @property
     def as_list(self):
-        return json.loads(self.serialize())
+        return [[symbol.value for symbol in row] for row in self.rows]
 
     def add_symbol(self, x: int, y: int, value: Symbol):
-        try:
-            if self.rows[x][y] != Symbol.N:
-                raise SlotNotAvailableError()
-
-            self.rows[x][y] = value
-        except IndexError:
+        if not (0 <= x < self.size and 0 <= y < self.size):
             raise SlotOutOfRangeError()
 
-    def has_series_complete(self, symbol: Symbol):
-        for series in self.get_series():
-            if self.get_series_count(series, symbol) == 3:
+        if self.rows[x][y] != Symbol.N:
+            raise SlotNotAvailableError()
+
+        self.rows[x][y] = value
+
+    def has_series_complete(self, symbol: Symbol, coords: Tuple[int, int] = None):
+        """
+        When `coords` is given only the series through that slot are walked,
+        which is all that can change after a symbol was placed there.
+        """
+        if coords is None:
+            return any(
+                self.get_series_count(series, symbol) == self.win_length
+                for series in self.get_series()
+            )
+
+        x, y = coords
+        for dx, dy in DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                i, j = x + sign * dx, y + sign * dy
+                while 0 <= i < self.size and 0 <= j < self.size and self.rows[i][j] == symbol:
+                    count += 1
+                    i, j = i + sign * dx, j + sign * dy
+            if count >= self.win_length:
                 return True
         return False
 
     @property
     def is_full(self):
-        return not any(slot.symbol == Symbol.N for series in self.get_series() for slot in series)
+        return not any(Symbol.N in row for row in self.rows)
 
     def get_series(self):
         for row in self.row_slots:
@@ -127,82 +214,196 @@ class Board:
     def get_series_count(series: List[Slot], symbol: Symbol):
         return len(list(filter(lambda s: s.symbol == symbol, series)))
 
-    @property
-    def row_slots(self):
+    def get_slots(self, lines: Tuple[Tuple[Tuple[int, int], ...], ...]):
         return [
-            [
-                Slot(coords=(0, 0), symbol=self.rows[0][0]),
-                Slot(coords=(0, 1), symbol=self.rows[0][1]),
-                Slot(coords=(0, 2), symbol=self.rows[0][2])
-            ],
-            [
-                Slot(coords=(1, 0), symbol=self.rows[1][0]),
-                Slot(coords=(1, 1), symbol=self.rows[1][1]),
-                Slot(coords=(1, 2), symbol=self.rows[1][2])
-            ],
-            [
-                Slot(coords=(2, 0), symbol=self.rows[2][0]),
-                Slot(coords=(2, 1), symbol=self.rows[2][1]),
-                Slot(coords=(2, 2), symbol=self.rows[2][2])
-            ]
+            [Slot(coords=(x, y), symbol=self.rows[x][y]) for x, y in line]
+            for line in lines
         ]
 
+    @property
+    def row_slots(self):
+        return self.get_slots(get_row_lines(self.size, self.win_length))
+
     @property
     def column_slots(self):
-        return [
-            [
-                Slot(coords=(0, 0), symbol=self.rows[0][0]),
-                Slot(coords=(1, 0), symbol=self.rows[1][0]),
-                Slot(coords=(2, 0), symbol=self.rows[2][0])
-            ],
-            [
-                Slot(coords=(0, 1), symbol=self.rows[0][1]),
-                Slot(coords=(1, 1), symbol=self.rows[1][1]),
-                Slot(coords=(2, 1), symbol=self.rows[2][1])
-            ],
-            [
-                Slot(coords=(0, 2), symbol=self.rows[0][2]),
-                Slot(coords=(1, 2), symbol=self.rows[1][2]),
-                Slot(coords=(2, 2), symbol=self.rows[2][2])
-            ]
-        ]
+        return self.get_slots(get_column_lines(self.size, self.win_length))
 
     @property
     def diagonal_slots(self):
-        return [
-            [
-                Slot(coords=(0, 0), symbol=self.rows[0][0]),
-                Slot(coords=(1, 1), symbol=self.rows[1][1]),
-                Slot(coords=(2, 2), symbol=self.rows[2][2])
-            ],
-            [
-                Slot(coords=(0, 2), symbol=self.rows[0][2]),
-                Slot(coords=(1, 1), symbol=self.rows[1][1]),
-                Slot(coords=(2, 0), symbol=self.rows[2][0])
-            ]
-        ]
+        return self.get_slots(get_diagonal_lines(self.size, self.win_length))
 
     def serialize(self):
-        return json.dumps([
-            [symbol.value for symbol in row]
-            for row in self.rows
-        ])
+        return json.dumps(self.as_list)
+
+    def pack(self) -> bytes:
+        """
+        Return the board as bytes: the size followed by the X and the O mask,
+        little endian, see BitBoard.
+        """
+        length = (self.size * self.size + 7) // 8
+        masks = {Symbol.X: 0, Symbol.O: 0}
+        for x, row in enumerate(self.rows):
+            for y, symbol in enumerate(row):
+                if symbol != Symbol.N:
+                    masks[symbol] |= 1 << (x * self.size + y)
+        return (
+            bytes([self.size])
+            + masks[Symbol.X].to_bytes(length, 'little')
+            + masks[Symbol.O].to_bytes(length, 'little')
+        )
 
     @classmethod
-    def deserialize(cls, value):
+    def deserialize(cls, value, win_length: int = 3):
         return cls([
             [Symbol(x) for x in row]
             for row in json.loads(value)
-        ])
+        ], win_length)
+
+    @classmethod
+    def empty(cls, size: int = 3, win_length: int = 3):
+        return cls([[Symbol.N] * size for _ in range(size)], win_length)
+
+
+class BitBoard(Board):
+    """
+    Board that keeps one integer bitmask per symbol. Bit ``x * size + y`` is
+    set when the symbol occupies slot (x, y), so wins are detected by testing
+    the masks against the precomputed series masks.
+    """
+
+    masks: Dict[Symbol, int]
+
+    num_symbols: int
+
+    def __init__(self, rows: List[List[Symbol]], win_length: int = 3):
+        self.size = len(rows)
+        self.win_length = win_length
+        self.masks = {Symbol.X: 0, Symbol.O: 0}
+        self.num_symbols = 0
+        for x, row in enumerate(rows):
+            for y, symbol in enumerate(row):
+                if symbol != Symbol.N:
+                    self.masks[symbol] |= 1 << (x * self.size + y)
+                    self.num_symbols += 1
+
+    @property
+    def rows(self):
+        return [
+            [self.get_symbol(x, y) for y in range(self.size)]
+            for x in range(self.size)
+        ]
+
+    @property
+    def occupied(self):
+        return self.masks[Symbol.X] | self.masks[Symbol.O]
+
+    @property
+    def full_mask(self):
+        return (1 << (self.size * self.size)) - 1
+
+    def get_symbol(self, x: int, y: int):
+        bit = 1 << (x * self.size + y)
+        if self.masks[Symbol.X] & bit:
+            return Symbol.X
+        if self.masks[Symbol.O] & bit:
+            return Symbol.O
+        return Symbol.N
+
+    def add_symbol(self, x: int, y: int, value: Symbol):
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            raise SlotOutOfRangeError()
+
+        bit = 1 << (x * self.size + y)
+        if self.occupied & bit:
+            raise SlotNotAvailableError()
+
+        self.masks[value] |= bit
+        self.num_symbols += 1
+
+    def has_series_complete(self, symbol: Symbol, coords: Tuple[int, int] = None):
+        mask = self.masks[symbol]
+        if coords is None:
+            lines = get_line_masks(self.size, self.win_length)
+        else:
+            x, y = coords
+            lines = get_cell_line_masks(self.size, self.win_length)[x * self.size + y]
+        return any(mask & line == line for line in lines)
+
+    @property
+    def is_full(self):
+        return self.num_symbols == self.size * self.size
+
+    def get_series(self):
+        for line in get_lines(self.size, self.win_length):
+            yield [Slot(coords=coords, symbol=self.get_symbol(*coords)) for coords in line]
+
+    @property
+    def as_list(self):
+        x_mask, o_mask = self.masks[Symbol.X], self.masks[Symbol.O]
+        values = [
+            Symbol.X.value if x_mask >> bit & 1 else Symbol.O.value if o_mask >> bit & 1 else None
+            for bit in range(self.size * self.size)
+        ]
+        return [values[x * self.size:(x + 1) * self.size] for x in range(self.size)]
+
+    def pack(self) -> bytes:
+        length = (self.size * self.size + 7) // 8
+        return (
+            bytes([self.size])
+            + self.masks[Symbol.X].to_bytes(length, 'little')
+            + self.masks[Symbol.O].to_bytes(length, 'little')
+        )
+
+    @classmethod
+    def unpack(cls, value: bytes, win_length: int = 3):
+        size = value[0]
+        length = (size * size + 7) // 8
+        board = cls.__new__(cls)
+        board.size = size
+        board.win_length = win_length
+        board.masks = {
+            Symbol.X: int.from_bytes(value[1:1 + length], 'little'),
+            Symbol.O: int.from_bytes(value[1 + length:1 + 2 * length], 'little'),
+        }
+        board.num_symbols = (board.masks[Symbol.X] | board.masks[Symbol.O]).bit_count()
+        return board
+
+
+def pack_moves(moves: Iterable[Tuple[Tuple[int, int], Symbol]], size: int) -> bytes:
+    """
+    Return a move sequence as bytes: two bytes per move, little endian,
+    holding the cell index shifted left by one and a set low bit for O.
+    """
+    return b''.join(
+        ((x * size + y) << 1 | (symbol == Symbol.O)).to_bytes(2, 'little')
+        for (x, y), symbol in moves
+    )
+
+
+def unpack_moves(value: bytes, size: int) -> List[Tuple[Tuple[int, int], Symbol]]:
+    moves = []
+    for i in range(0, len(value), 2):
+        code = int.from_bytes(value[i:i + 2], 'little')
+        moves.append((divmod(code >> 1, size), Symbol.O if code & 1 else Symbol.X))
+    return moves
 
 
 class BoardDescriptor(FieldDescriptor):
 
+    def __get__(self, instance, owner):
+        value = super().__get__(instance, owner)
+        if instance is not None and self.field.win_length_field:
+            value.win_length = getattr(instance, self.field.win_length_field)
+        return value
+
     def to_python(self, value):
         if isinstance(value, Board):
             return value
 
-        return Board([
+        if not isinstance(value, list):
+            return self.field.to_python(value)
+
+        return self.field.board_class([
             [Symbol(x) for x in row]
             for row in value
         ])
@@ -211,9 +412,12 @@ class BoardDescriptor(FieldDescriptor):
 class BoardField(models.Field):
     descriptor_class = BoardDescriptor
 
+    board_class = BitBoard
+
     description = 'Board'
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, win_length_field: str = None, **kwargs):
+        self.win_length_field = win_length_field
         kwargs['default'] = [
             [None, None, None],
             [None, None, None],
@@ -221,19 +425,27 @@ class BoardField(models.Field):
         ]
         super().__init__(*args, **kwargs)
 
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.win_length_field:
+            kwargs['win_length_field'] = self.win_length_field
+        return name, path, args, kwargs
+
     def get_db_prep_value(self, value, connection, prepared=False):
         """
         Perform preliminary non-db specific value checks and conversions.
         """
+        if isinstance(value, list):
+            return json.dumps(value)
         return value.serialize() if isinstance(value, Board) else value
 
     def from_db_value(self, value, expression, connection):
-        return Board.deserialize(value)
+        return self.board_class.deserialize(value)
 
     def to_python(self, value):
         if isinstance(value, Board):
             return value
-        return Board.deserialize(value)
+        return self.board_class.deserialize(value)
 
     def contribute_to_class(self, cls, name, *args, **kwargs):
         super().contribute_to_class(cls, name, *args, **kwargs)
@@ -241,3 +453,34 @@ class BoardField(models.Field):
 
     def get_internal_type(self):
         return "TextField"
+
+
+class PackedBoardField(BoardField):
+    """
+    Stores the board in the compact format of Board.pack instead of JSON, so
+    reading a row decodes two integers instead of parsing text.
+    """
+
+    description = 'Packed board'
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is None:
+            return value
+        return self.to_python(value).pack()
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return self.board_class.unpack(bytes(value))
+
+    def to_python(self, value):
+        if isinstance(value, Board):
+            return value
+        if isinstance(value, (bytes, memoryview)):
+            return self.board_class.unpack(bytes(value))
+        if isinstance(value, list):
+            return self.board_class([[Symbol(x) for x in row] for row in value])
+        return self.board_class.deserialize(value)
+
+    def get_internal_type(self):
+        return "BinaryField"
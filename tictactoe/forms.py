@@ -2,6 +2,7 @@ import uuid
 
 from django.conf import settings
 from django import forms
+from django.db import transaction
 
 from tictactoe.fields import Symbol
 from tictactoe import models
@@ -18,8 +19,16 @@ class GameSessionForm(forms.ModelForm):
 
     class Meta:
         model = models.GameSession
-        fields = ('name',)
+        fields = ('name', 'board_size', 'win_length')
+
+    def clean(self):
+        cleaned_data = super().clean()
+        board_size, win_length = cleaned_data.get('board_size'), cleaned_data.get('win_length')
+        if board_size and win_length and win_length > board_size:
+            self.add_error('win_length', 'Series length cannot exceed the board size')
+        return cleaned_data
 
+    @transaction.atomic
     def save(self, commit=True):
         instance = super().save(commit=False)
         instance.session_id = uuid.uuid4()
@@ -40,7 +49,8 @@ class GameSessionForm(forms.ModelForm):
             )
             models.ComputerPlayer.objects.create(
                 session=instance,
-                player=player
+                player=player,
+                engine=settings.TICTACTOE_ENGINE
             )
         return instance
 
@@ -60,6 +70,7 @@ class PlayerForm(forms.ModelForm):
         self.session = kwargs.pop('session')
         super().__init__(*args, **kwargs)
 
+    @transaction.atomic
     def save(self, commit=True):
         instance = super().save(commit=False)
         instance.session = self.session
@@ -1,11 +1,47 @@
-import random
-from typing import Tuple
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional, Set, Tuple
 
 from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 
-from tictactoe.exceptions import SlotNotAvailableError
-from tictactoe.fields import Symbol
-from tictactoe.models import ComputerPlayer, Game, Player
+from tictactoe.cache import game_cache
+from tictactoe.core import GameCore
+from tictactoe.engines import Engine, get_engine
+from tictactoe.events import publish_game
+from tictactoe.exceptions import PlayerNotActiveError, TicTacToeException, VersionConflictError
+from tictactoe.fields import BitBoard, Symbol
+from tictactoe.metrics import registry
+from tictactoe.models import ComputerPlayer, Game, GameSession, Move, Player
+from tictactoe.ponder import get_ponder_cache, get_ponder_workers, ponder
+from tictactoe.workers import BoundedExecutor
+
+logger = logging.getLogger(__name__)
+
+think_time = registry.counter('engine.think_time_ms')
+
+engine_moves = registry.counter('engine.moves')
+
+resumed_moves = registry.counter('computer_moves.resumed')
+
+# The replies queued by this process, so a reply is not queued twice
+pending_moves: Set[Tuple[int, int]] = set()
+
+pending_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def get_computer_moves() -> BoundedExecutor:
+    return BoundedExecutor(
+        'computer_moves',
+        settings.TICTACTOE_COMPUTER_MOVE_WORKERS,
+        settings.TICTACTOE_COMPUTER_MOVE_QUEUE_SIZE
+    )
 
 
 class GameHandler:
@@ -18,56 +54,233 @@ class GameHandler:
 
     opponent_symbol: Symbol
 
-    def __init__(self, game: Game):
+    engine: Optional[Engine]
+
+    core: GameCore
+
+    moves: List[Move]
+
+    tracked_fields: Tuple[str, ...] = ('num_symbols', 'active_player', 'winner', 'is_ended')
+
+    def __init__(self, game: Game, engine: Engine = None):
         self.game = game
-        self.players = tuple(self.game.session.players.all())
+        self.engine = engine
+        self.core = GameCore(self.game.board, num_symbols=self.game.num_symbols, is_ended=self.game.is_ended)
+        self.players = tuple(session_player.player for session_player in self.game.session.player_session.all())
         self.owner_symbol, self.opponent_symbol = tuple(map(lambda x: Symbol(x), settings.TICTACTOE_PLAYER_SYMBOLS))
 
     def add_symbol(self, coords: Tuple[int, int]):
+        computer_player = self._get_computer_player()
+        if computer_player is not None and self.game.active_player_id == computer_player.player_id:
+            # A reply lost with its worker is played again once the move is old enough
+            resume_computer_move(self.game.pk, self.game.version, self.game.game_time)
+            raise PlayerNotActiveError('The computer player is still thinking')
+        self._add_symbol(coords, computer_player)
+
+    @transaction.atomic
+    def _add_symbol(self, coords: Tuple[int, int], computer_player: Optional[ComputerPlayer]):
+        initial = self._get_state()
+        self.moves = []
         symbol = self.owner_symbol if self.game.active_player == self.game.session.owner else self.opponent_symbol
-        x, y = coords
-        self.game.board.add_symbol(x, y, symbol)
-        self._do_game_checks(self.game.active_player, symbol)
+        self._play(coords, symbol, self.game.active_player)
+        self._do_game_checks(self.game.active_player)
+        if self.game.is_ended and self._can_ponder(computer_player):
+            get_ponder_cache().discard(self.game.pk)
         if not self.game.is_ended:
-            try:
-                player = self.game.session.computer_player.player
-                x, y = self.learn_symbol()
-                self.game.board.add_symbol(x, y, self.opponent_symbol)
-                self._do_game_checks(player, self.opponent_symbol)
-            except ComputerPlayer.DoesNotExist:
+            if computer_player is None:
                 self.game.active_player = next(filter(lambda p: p != self.game.active_player, self.players), None)
-        self.game.save()
-
-    def learn_symbol(self) -> Tuple[int, int]:
-        for series in self.game.board.get_series():
-            if self.game.board.get_series_count(series, self.opponent_symbol) == 2:
-                if slot := next(filter(lambda s: s.symbol == Symbol.N, series), None):
-                    return slot.coords
-        for series in self.game.board.get_series():
-            if self.game.board.get_series_count(series, self.owner_symbol) == 2:
-                if slot := next(filter(lambda s: s.symbol == Symbol.N, series), None):
-                    return slot.coords
-        free_slots = [
-            slot
-            for series in self.game.board.get_series()
-            for slot in series
-            if slot.symbol == Symbol.N
-        ]
-        if not free_slots:
-            raise SlotNotAvailableError()
-        return random.choice(free_slots).coords
-
-    def _do_game_checks(self, player: Player, symbol: Symbol):
-        if self.game.board.has_series_complete(symbol):
+            elif settings.TICTACTOE_COMPUTER_MOVE_WORKERS:
+                # Commit the move now, the computer player replies from a worker
+                self.game.active_player = computer_player.player
+                transaction.on_commit(lambda: submit_computer_move(self.game.pk, self.game.version))
+            else:
+                self._play_computer(computer_player)
+        self._save(initial)
+
+    @transaction.atomic
+    def add_computer_symbol(self):
+        """
+        Play the reply of the computer player when it is its turn.
+        """
+        computer_player = self._get_computer_player()
+        if computer_player is None or self.game.is_ended or self.game.active_player_id != computer_player.player_id:
+            raise PlayerNotActiveError('It is not the turn of the computer player')
+        initial = self._get_state()
+        self.moves = []
+        self._play_computer(computer_player)
+        if not self.game.is_ended:
+            self.game.active_player = self.game.session.owner
+        self._save(initial)
+
+    def learn_symbol(self, engine: Engine) -> Tuple[int, int]:
+        started = time.perf_counter()
+        try:
+            return engine.select_move(self.core.board, self.opponent_symbol, self.owner_symbol)
+        finally:
+            think_time.inc(round((time.perf_counter() - started) * 1000))
+            engine_moves.inc()
+
+    def _get_computer_player(self) -> Optional[ComputerPlayer]:
+        try:
+            return self.game.session.computer_player
+        except ComputerPlayer.DoesNotExist:
+            return None
+
+    def _play_computer(self, computer_player: ComputerPlayer):
+        coords = self._get_pondered_move(computer_player)
+        if coords is None:
+            coords = self.learn_symbol(self.engine or get_engine(computer_player.engine))
+        self._play(coords, self.opponent_symbol, computer_player.player)
+        self._do_game_checks(computer_player.player)
+        if self.game.is_ended:
+            return
+        if self._can_ponder(computer_player):
+            board = BitBoard.unpack(self.core.board.pack(), self.core.board.win_length)
+            args = (self.game.pk, board, self.core.num_symbols, computer_player.engine,
+                    self.opponent_symbol, self.owner_symbol)
+
+            def start_pondering():
+                get_ponder_cache().start(self.game.pk)
+                get_ponder_workers().try_submit(ponder, *args)
+
+            transaction.on_commit(start_pondering)
+
+    def _can_ponder(self, computer_player: Optional[ComputerPlayer]) -> bool:
+        return (
+            computer_player is not None
+            and settings.TICTACTOE_PONDER_WORKERS > 0
+            and self.game.board_size >= settings.TICTACTOE_PONDER_MIN_BOARD_SIZE
+        )
+
+    def _get_pondered_move(self, computer_player: ComputerPlayer) -> Optional[Tuple[int, int]]:
+        if not self._can_ponder(computer_player):
+            return None
+        coords = get_ponder_cache().pop(self.game.pk, self.core.board)
+        if coords is not None and self.core.board.get_symbol(*coords) == Symbol.N:
+            return coords
+        return None
+
+    def _play(self, coords: Tuple[int, int], symbol: Symbol, player: Player):
+        self.core.play(coords, symbol)
+        x, y = coords
+        self.moves.append(
+            Move(game=self.game, number=self.core.num_symbols, player=player, symbol=symbol, x=x, y=y)
+        )
+
+    def _do_game_checks(self, player: Player):
+        self.game.num_symbols = self.core.num_symbols
+        if self.core.winner is not None:
             self.game.winner = player
-            self.game.is_ended = True
-        elif self.game.board.is_full:
-            self.game.is_ended = True
-        self.game.num_symbols += 1
+            self._add_score(self.core.winner)
+        self.game.is_ended = self.core.is_ended
+
+    def _get_state(self) -> dict:
+        return {
+            field.attname: getattr(self.game, field.attname)
+            for field in map(self.game._meta.get_field, self.tracked_fields)
+        }
+
+    def _save(self, initial: dict):
+        """
+        Write the board and the changed fields with a single UPDATE that only
+        matches the version the move was made on.
+        """
+        changes = {
+            field: value for field, value in self._get_state().items() if value != initial[field]
+        }
+        game_time = timezone.now()
+        updated = Game.objects.filter(pk=self.game.pk, version=self.game.version).update(
+            board=self.game.board,
+            game_time=game_time,
+            version=F('version') + 1,
+            **changes
+        )
+        if not updated:
+            raise VersionConflictError('The game was changed by another move')
+        self.game.game_time = game_time
+        self.game.version += 1
+        Move.objects.bulk_create(self.moves)
+        game_cache.set_pointer(self.game.session.session_id, self.game.pk, self.game.version)
+        publish_game(self.game)
+
+    def _add_score(self, symbol: Symbol):
+        field = 'owner_score' if symbol == self.owner_symbol else 'opponent_score'
+        GameSession.objects.filter(pk=self.game.session_id).update(**{field: F(field) + 1})
+        session = self.game.session
+        setattr(session, field, getattr(session, field) + 1)
 
 
 class GameHandlerFactory:
 
     @classmethod
-    def create(cls, game: Game):
-        return GameHandler(game)
+    def create(cls, game: Game, engine: str = None):
+        return GameHandler(game, get_engine(engine) if engine else None)
+
+
+def play_computer_move(game_id: int, version: int):
+    """
+    Reply to the move that brought the game to the version, unless the game
+    has changed or was replaced since.
+    """
+    game = Game.objects.select_related(
+        'session__computer_player__player', 'active_player'
+    ).prefetch_related('session__player_session__player').filter(pk=game_id, version=version, is_active=True).first()
+    if game is not None:
+        GameHandlerFactory.create(game).add_computer_symbol()
+
+
+def submit_computer_move(game_id: int, version: int):
+    """
+    Queue the reply to the game version, unless this process queued it already.
+    """
+    key = (game_id, version)
+    with pending_lock:
+        if key in pending_moves:
+            return
+        pending_moves.add(key)
+    get_computer_moves().submit(run_computer_move, game_id, version)
+
+
+def run_computer_move(game_id: int, version: int):
+    try:
+        play_computer_move(game_id, version)
+    finally:
+        with pending_lock:
+            pending_moves.discard((game_id, version))
+
+
+def resume_computer_move(game_id: int, version: int, game_time: datetime) -> bool:
+    """
+    Queue the reply of the computer player again when the move it replies to
+    is older than TICTACTOE_COMPUTER_MOVE_TIMEOUT, as the worker that had it
+    may have failed or exited. Stale versions are skipped by
+    play_computer_move, so a reply that was only slow is not played twice.
+    """
+    if timezone.now() - game_time < timedelta(seconds=settings.TICTACTOE_COMPUTER_MOVE_TIMEOUT):
+        return False
+    resumed_moves.inc()
+    submit_computer_move(game_id, version)
+    return True
+
+
+def resume_stale_computer_moves(limit: int = None) -> int:
+    """
+    Play the replies of the computer players whose turn started more than
+    TICTACTOE_COMPUTER_MOVE_TIMEOUT ago, for the games nobody requests while
+    their reply is missing. Returns the number of replies played.
+    """
+    games = Game.objects.filter(
+        is_active=True,
+        is_ended=False,
+        active_player=F('session__computer_player__player'),
+        game_time__lt=timezone.now() - timedelta(seconds=settings.TICTACTOE_COMPUTER_MOVE_TIMEOUT)
+    ).order_by('game_time').values_list('pk', 'version')
+    num_played = 0
+    for game_id, version in games[:limit] if limit else games:
+        try:
+            play_computer_move(game_id, version)
+        except TicTacToeException:
+            logger.exception('Could not reply in game %s', game_id)
+        else:
+            num_played += 1
+    return num_played
@@ -1,15 +1,112 @@
+import smtplib
+from datetime import timedelta
+from typing import Tuple
+
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
 from django.template.loader import render_to_string
+from django.utils import timezone
+
+from tictactoe.exceptions import OutboxConnectionError
+from tictactoe.models import OutboxMail
 
 
-def send_invite_mail(email: str, session_url: str):
-    body = render_to_string('mail/invite.txt', {'session_url': session_url})
-    html = render_to_string('mail/invite.html', {'session_url': session_url})
-    return send_mail(
-        'Join me for a game of TicTacToe',
-        message=body,
+def send_invite_mail(email: str, session_url: str) -> OutboxMail:
+    """
+    Write the invite to the outbox, the send_outbox command delivers it.
+    """
+    return OutboxMail.objects.create(
+        subject='Join me for a game of TicTacToe',
+        body=render_to_string('mail/invite.txt', {'session_url': session_url}),
+        html=render_to_string('mail/invite.html', {'session_url': session_url}),
         from_email=settings.FROM_EMAIL,
-        recipient_list=[email],
-        html_message=html
+        to=email
     )
+
+
+def get_message(mail: OutboxMail, connection) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(mail.subject, mail.body, mail.from_email, [mail.to], connection=connection)
+    if mail.html:
+        message.attach_alternative(mail.html, 'text/html')
+    return message
+
+
+def open_connection(connection):
+    try:
+        connection.open()
+    except (OSError, smtplib.SMTPException) as exc:
+        raise OutboxConnectionError(str(exc) or exc.__class__.__name__) from exc
+
+
+def send_message(mail: OutboxMail, connection):
+    message = get_message(mail, connection)
+    try:
+        connection.send_messages([message])
+    except (smtplib.SMTPServerDisconnected, ConnectionError):
+        # The server dropped the connection, the mail is tried once more over a new one
+        connection.close()
+        open_connection(connection)
+        connection.send_messages([message])
+
+
+def send_outbox(batch_size: int = 100, limit: int = None) -> Tuple[int, int]:
+    """
+    Send the due mails of the outbox over a single connection, a batch per
+    transaction. The connection is opened once there is a mail to send, and
+    opened again when the server drops it. Mails that fail are tried again
+    after a delay that doubles with every attempt, and given up after
+    TICTACTOE_OUTBOX_MAX_ATTEMPTS. Returns the number of mails sent and failed,
+    raises OutboxConnectionError when the server cannot be reached, leaving
+    the mails that were not tried as they were.
+    """
+    num_sent = num_failed = 0
+    connection = None
+    error = None
+    try:
+        while error is None and (limit is None or num_sent + num_failed < limit):
+            size = batch_size if limit is None else min(batch_size, limit - num_sent - num_failed)
+            with transaction.atomic():
+                # Rows claimed by another sender are skipped rather than sent twice
+                mails = list(
+                    OutboxMail.objects.select_for_update(skip_locked=True).filter(
+                        status=OutboxMail.PENDING,
+                        next_attempt__lte=timezone.now()
+                    ).order_by('next_attempt', 'pk')[:size]
+                )
+                if not mails:
+                    break
+                if connection is None:
+                    connection = get_connection()
+                    open_connection(connection)
+                attempted = []
+                for mail in mails:
+                    try:
+                        # One message per call, so a failure is recorded on its own mail
+                        send_message(mail, connection)
+                    except OutboxConnectionError as exc:
+                        error = exc
+                        break
+                    except Exception as exc:
+                        num_failed += 1
+                        mail.attempts += 1
+                        mail.error = str(exc) or exc.__class__.__name__
+                        if mail.attempts >= settings.TICTACTOE_OUTBOX_MAX_ATTEMPTS:
+                            mail.status = OutboxMail.FAILED
+                        else:
+                            delay = settings.TICTACTOE_OUTBOX_RETRY_DELAY * 2 ** (mail.attempts - 1)
+                            mail.next_attempt = timezone.now() + timedelta(seconds=delay)
+                    else:
+                        num_sent += 1
+                        mail.attempts += 1
+                        mail.status = OutboxMail.SENT
+                        mail.sent = timezone.now()
+                        mail.error = ''
+                    attempted.append(mail)
+                OutboxMail.objects.bulk_update(attempted, ['status', 'attempts', 'next_attempt', 'sent', 'error'])
+    finally:
+        if connection is not None:
+            connection.close()
+    if error is not None:
+        raise error
+    return num_sent, num_failed
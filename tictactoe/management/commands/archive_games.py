@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tictactoe.archive import Progress, archive_games, expire_sessions
+
+
+class Command(BaseCommand):
+    help = 'Archive old inactive games and delete expired sessions, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--archive-after', type=int, default=settings.TICTACTOE_ARCHIVE_AFTER_DAYS,
+            help='Archive inactive games older than this number of days'
+        )
+        parser.add_argument(
+            '--expire-after', type=int, default=settings.TICTACTOE_SESSION_RETENTION_DAYS,
+            help='Delete sessions without activity for this number of days'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--limit', type=int, help='Maximum number of rows to handle per step')
+        parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between batches')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        now = timezone.now()
+        kwargs = {
+            'batch_size': options['batch_size'],
+            'limit': options['limit'],
+            'pause': options['pause'],
+        }
+
+        progress = archive_games(
+            now - timedelta(days=options['archive_after']), callback=self.get_callback('games'), **kwargs
+        )
+        self.report('Archived', 'games', progress)
+
+        progress = expire_sessions(
+            now - timedelta(days=options['expire_after']), callback=self.get_callback('sessions'), **kwargs
+        )
+        self.report('Deleted', 'sessions', progress)
+
+    def get_callback(self, name: str):
+        def callback(progress: Progress):
+            if self.verbosity > 1:
+                self.stdout.write(f'{progress.rows} {name} ({progress.rate:.0f} rows/s)')
+        return callback
+
+    def report(self, action: str, name: str, progress: Progress):
+        self.stdout.write(
+            f'{action} {progress.rows} {name} in {progress.batches} batches, '
+            f'{progress.seconds:.1f}s ({progress.rate:.0f} rows/s)'
+        )
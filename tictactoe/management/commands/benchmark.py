@@ -0,0 +1,75 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from tictactoe import benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Run the benchmark suite against a fresh test database and compare it with the baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='Benchmarks to run, all when omitted')
+        parser.add_argument('--baseline', default=settings.TICTACTOE_BENCHMARK_BASELINE)
+        parser.add_argument(
+            '--threshold', type=float, default=1.5,
+            help='Fail when a time or allocation exceeds the baseline by this factor'
+        )
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--update-baseline', action='store_true')
+
+    def handle(self, *args, **options):
+        names = options['names'] or list(benchmarks.registry)
+        unknown = set(names) - set(benchmarks.registry)
+        if unknown:
+            raise CommandError(f'Unknown benchmarks: {", ".join(sorted(unknown))}')
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            results = {
+                name: benchmarks.run(benchmarks.registry[name], options['repeat']).as_dict()
+                for name in names
+            }
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        baseline = {}
+        if os.path.exists(options['baseline']):
+            with open(options['baseline']) as fh:
+                baseline = json.load(fh)
+
+        regressions = []
+        for name, result in results.items():
+            expected = baseline.get(name)
+            line = f'{name}: {result["time_us"]:.3f}us, {result["queries"]} queries, {result["peak_kib"]:.1f}KiB'
+            if expected:
+                line += (
+                    f' (baseline {expected["time_us"]:.3f}us, {expected["queries"]} queries, '
+                    f'{expected["peak_kib"]:.1f}KiB)'
+                )
+                regressions.extend(self.get_regressions(name, result, expected, options['threshold']))
+            self.stdout.write(line)
+
+        if options['update_baseline']:
+            baseline.update(results)
+            with open(options['baseline'], 'w') as fh:
+                json.dump(baseline, fh, indent=2, sort_keys=True)
+                fh.write('\n')
+            self.stdout.write(f'Updated {options["baseline"]}')
+        elif regressions:
+            raise CommandError('Regressions found:\n' + '\n'.join(regressions))
+
+    @staticmethod
+    def get_regressions(name: str, result: dict, expected: dict, threshold: float):
+        if result['queries'] > expected['queries']:
+            yield f'{name}: {result["queries"]} queries, baseline {expected["queries"]}'
+        if result['time_us'] > expected['time_us'] * threshold:
+            yield f'{name}: {result["time_us"]:.3f}us, baseline {expected["time_us"]:.3f}us'
+        if result['peak_kib'] > expected['peak_kib'] * threshold:
+            yield f'{name}: {result["peak_kib"]:.1f}KiB, baseline {expected["peak_kib"]:.1f}KiB'
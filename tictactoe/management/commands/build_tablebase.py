@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tictactoe.exceptions import EngineError
+from tictactoe.tablebase import (
+    MOVE_BITS, Tablebase, TablebaseGenerator, brute_force, get_path, sample_positions
+)
+
+
+class Command(BaseCommand):
+    help = 'Solve every reachable position of a board and write the results to a tablebase file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=3)
+        parser.add_argument('--win-length', type=int)
+        parser.add_argument('--output', help='Defaults to TICTACTOE_TABLEBASE_DIR')
+        parser.add_argument('--verify', action='store_true', help='Check the file against a brute-force solver')
+        parser.add_argument(
+            '--samples', type=int, default=0,
+            help='Number of random positions to verify, all positions when 0'
+        )
+
+    def handle(self, *args, **options):
+        size = options['size']
+        win_length = options['win_length'] or size
+        path = options['output'] or get_path(size, win_length)
+
+        start = time.monotonic()
+        try:
+            generator = TablebaseGenerator(size, win_length)
+        except EngineError as exc:
+            raise CommandError(str(exc))
+        generator.generate()
+        generator.write(path)
+        elapsed = time.monotonic() - start
+        self.stdout.write(
+            f'Solved {generator.positions} positions in {elapsed:.1f}s, '
+            f'wrote {len(generator.table)} entries to {path}'
+        )
+
+        if options['verify']:
+            self.verify(Tablebase(path), options['samples'])
+
+    def verify(self, tablebase: Tablebase, samples: int):
+        positions = sample_positions(tablebase, samples) if samples else tablebase.positions()
+        checked = 0
+        for index, first, second in positions:
+            entry = tablebase[index]
+            expected = brute_force(tablebase.size, tablebase.win_length, first, second)
+            if entry >> MOVE_BITS != expected:
+                raise CommandError(f'Position {index}: outcome {entry >> MOVE_BITS}, expected {expected}')
+
+            bit = entry & ((1 << MOVE_BITS) - 1)
+            if (first | second) & (1 << bit):
+                raise CommandError(f'Position {index}: best move is not free')
+            if brute_force(tablebase.size, tablebase.win_length, first, second, bit) != expected:
+                raise CommandError(f'Position {index}: best move does not reach outcome {expected}')
+            checked += 1
+        self.stdout.write(f'Verified {checked} positions')
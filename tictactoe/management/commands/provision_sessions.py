@@ -0,0 +1,51 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tictactoe.api.serializers import ProvisionedSessionSerializer, ProvisionSerializer
+from tictactoe.provisioning import provision_sessions
+
+
+class Command(BaseCommand):
+    help = 'Create sessions with their players in bulk and write their ids and player tokens as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int)
+        parser.add_argument('--name', default='Session')
+        parser.add_argument('--player-name', default='Player')
+        parser.add_argument('--game-mode', choices=('human', 'computer'), default='human')
+        parser.add_argument('--opponent-name', help='Also create the human opponents, with this name')
+        parser.add_argument('--board-size', type=int, default=3)
+        parser.add_argument('--win-length', type=int, help='Length of the winning series, 3 by default')
+        parser.add_argument('--output', help='File to write the sessions to, instead of stdout')
+
+    def handle(self, *args, **options):
+        data = {
+            'count': options['count'],
+            'name': options['name'],
+            'player_name': options['player_name'],
+            'game_mode': options['game_mode'],
+            'board_size': options['board_size'],
+        }
+        if options['win_length'] is not None:
+            data['win_length'] = options['win_length']
+        if options['opponent_name']:
+            data['opponent_name'] = options['opponent_name']
+        serializer = ProvisionSerializer(data=data)
+        if not serializer.is_valid():
+            raise CommandError(json.dumps(serializer.errors))
+
+        started = time.monotonic()
+        sessions = provision_sessions(**serializer.validated_data)
+        seconds = time.monotonic() - started
+
+        output = json.dumps(ProvisionedSessionSerializer(sessions, many=True).data, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output)
+        else:
+            self.stdout.write(output)
+        self.stderr.write(
+            f'Created {len(sessions)} sessions in {seconds:.2f}s ({len(sessions) / seconds:.0f} sessions/s)'
+        )
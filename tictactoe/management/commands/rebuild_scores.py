@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from tictactoe.models import ArchivedGame, Game, GameSession
+
+
+def count_wins(queryset, group_by: str):
+    return Coalesce(
+        Subquery(queryset.order_by().values(group_by).annotate(wins=Count('pk')).values('wins')[:1]),
+        Value(0),
+        output_field=IntegerField()
+    )
+
+
+def get_score(owner: bool):
+    """
+    The number of games the owner or the opponent won in the session, counted
+    by a correlated subquery over the active and the archived games.
+    """
+    owner_symbol = settings.TICTACTOE_PLAYER_SYMBOLS[0]
+    won = Q(winner__symbol=owner_symbol) if owner else ~Q(winner__symbol=owner_symbol)
+    archived_won = Q(winner=owner_symbol) if owner else ~Q(winner=owner_symbol)
+    games = Game.objects.filter(won, session=OuterRef('pk'), winner__isnull=False)
+    # Archived games refer to their session by its session_id
+    archived = ArchivedGame.objects.filter(archived_won, session_id=OuterRef('session_id'), winner__isnull=False)
+    return count_wins(games, 'session') + count_wins(archived, 'session_id')
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the score counters of every session from the won games, archived ones included'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        num_sessions = 0
+        last_pk = 0
+        while True:
+            # Each batch is a single UPDATE over a pk range, so a score added
+            # by a finished game is either counted by it or added after it
+            with transaction.atomic():
+                pks = list(
+                    GameSession.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[
+                        :options['batch_size']
+                    ]
+                )
+                if not pks:
+                    break
+                num_sessions += GameSession.objects.filter(pk__gte=pks[0], pk__lte=pks[-1]).update(
+                    owner_score=get_score(owner=True),
+                    opponent_score=get_score(owner=False)
+                )
+            last_pk = pks[-1]
+        self.stdout.write(f'Rebuilt the scores of {num_sessions} sessions')
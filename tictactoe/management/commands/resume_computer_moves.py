@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tictactoe.game import resume_stale_computer_moves
+
+
+class Command(BaseCommand):
+    help = 'Play the computer replies that were lost, for instance with a worker that exited'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, help='Maximum number of replies to play per run')
+        parser.add_argument('--loop', action='store_true', help='Keep looking for lost replies')
+        parser.add_argument('--interval', type=float, default=10, help='Seconds to sleep between runs')
+
+    def handle(self, *args, **options):
+        while True:
+            played = resume_stale_computer_moves(limit=options['limit'])
+            if played or options['verbosity'] > 1:
+                self.stdout.write(f'Played {played} lost replies')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
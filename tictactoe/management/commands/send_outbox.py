@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tictactoe.exceptions import OutboxConnectionError
+from tictactoe.mail import send_outbox
+
+
+class Command(BaseCommand):
+    help = 'Send the pending mails of the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--limit', type=int, help='Maximum number of mails to send per run')
+        parser.add_argument('--loop', action='store_true', help='Keep sending, polling the outbox')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds to sleep when the outbox is empty')
+        parser.add_argument(
+            '--max-backoff', type=float, default=300,
+            help='Maximum seconds to sleep while the mail server cannot be reached'
+        )
+
+    def handle(self, *args, **options):
+        backoff = options['interval']
+        while True:
+            try:
+                sent, failed = send_outbox(batch_size=options['batch_size'], limit=options['limit'])
+            except OutboxConnectionError as exc:
+                if not options['loop']:
+                    raise CommandError(f'Could not reach the mail server: {exc}')
+                # Wait for the mail server, doubling the sleep while it stays down
+                self.stderr.write(f'Could not reach the mail server: {exc}, retrying in {backoff:g} seconds')
+                time.sleep(backoff)
+                backoff = min(backoff * 2, options['max_backoff'])
+                continue
+            backoff = options['interval']
+            if sent or failed or options['verbosity'] > 1:
+                self.stdout.write(f'Sent {sent} mails, {failed} failed')
+            if not options['loop']:
+                break
+            if not sent and not failed:
+                time.sleep(options['interval'])
@@ -0,0 +1,98 @@
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tictactoe.simulation import SimulationStats, play_games
+
+
+class Command(BaseCommand):
+    help = 'Play engine-vs-engine games without the database and report statistics'
+
+    def add_arguments(self, parser):
+        parser.add_argument('engines', nargs=2, help='Engine names, the first one plays X')
+        parser.add_argument('--games', type=int, default=1000)
+        parser.add_argument('--size', type=int, default=3)
+        parser.add_argument('--win-length', type=int)
+        parser.add_argument('--workers', type=int, default=1)
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--swap', action='store_true', help='Let the engines alternate playing X')
+        parser.add_argument('--output', help='File to write the result of every game to, one JSON line each')
+
+    def handle(self, *args, **options):
+        engines = tuple(options['engines'])
+        for engine in engines:
+            if engine not in settings.TICTACTOE_ENGINES:
+                raise CommandError(f'Unknown engine: {engine}')
+
+        batches = self.get_batches(engines, options)
+
+        stats = SimulationStats()
+        output = open(options['output'], 'w') if options['output'] else None
+        try:
+            if options['workers'] > 1:
+                with ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup) as executor:
+                    # Only a few batches are queued at a time, so the jobs are never all in memory
+                    self.collect(self.map_bounded(executor, batches, options['workers'] * 2), stats, output)
+            else:
+                self.collect(map(play_games, batches), stats, output)
+        finally:
+            if output:
+                output.close()
+
+        self.report(stats)
+
+    @staticmethod
+    def get_batches(engines, options) -> Iterator[list]:
+        size = options['size']
+        win_length = options['win_length'] or size
+        batch = []
+        for index in range(options['games']):
+            batch.append(
+                (engines[::-1] if options['swap'] and index % 2 else engines, size, win_length, options['seed'] + index)
+            )
+            if len(batch) == options['batch_size']:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def map_bounded(executor: ProcessPoolExecutor, batches: Iterator[list], max_pending: int) -> Iterator[List[dict]]:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(play_games, batch))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def collect(self, batches, stats: SimulationStats, output):
+        for results in batches:
+            for result in results:
+                stats.add(result)
+                if output:
+                    output.write(json.dumps(result) + '\n')
+
+    def report(self, stats: SimulationStats):
+        self.stdout.write(f'Played {stats.games} games, {stats.games_per_second:.1f} games/s')
+        for engine, wins in sorted(stats.wins.items(), key=lambda item: item[0] or ''):
+            self.stdout.write(f'{engine or "draw"}: {wins / stats.games:.1%}')
+        self.stdout.write('Opening move: X / O / draw')
+        for opening, rates in stats.get_opening_rates().items():
+            self.stdout.write(
+                f'{opening} ({rates["games"]} games): '
+                f'{rates["X"]:.1%} / {rates["O"]:.1%} / {rates["draw"]:.1%}'
+            )
+        self.stdout.write('Think time per move (ms): p50 / p90 / p99')
+        for engine in sorted(stats.think_times):
+            percentiles = stats.get_percentiles(engine)
+            self.stdout.write(
+                f'{engine}: {percentiles["p50"] * 1000:.3f} / '
+                f'{percentiles["p90"] * 1000:.3f} / {percentiles["p99"] * 1000:.3f}'
+            )
@@ -0,0 +1,11 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from tictactoe.matchmaking.base import Matchmaker, Ticket
+
+
+@lru_cache(maxsize=None)
+def get_matchmaker() -> Matchmaker:
+    return import_string(settings.TICTACTOE_MATCHMAKER)()
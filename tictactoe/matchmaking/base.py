@@ -0,0 +1,98 @@
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from tictactoe.fields import Symbol
+from tictactoe.models import GameSession, Player, SessionPlayer
+
+
+@dataclass
+class Ticket:
+    name: str
+
+    board_size: int = 3
+
+    win_length: int = 3
+
+    rating: Optional[int] = None
+
+    ticket_id: uuid.UUID = field(default_factory=uuid.uuid4)
+
+    created: float = field(default_factory=lambda: timezone.now().timestamp())
+
+    status: str = 'waiting'
+
+    session_id: Optional[uuid.UUID] = None
+
+    player_id: Optional[uuid.UUID] = None
+
+    last_seen: float = field(default_factory=lambda: timezone.now().timestamp())
+
+    matched: Optional[float] = None
+
+    @property
+    def pool(self) -> Tuple[int, int]:
+        return self.board_size, self.win_length
+
+    def is_expired(self, now: float) -> bool:
+        """
+        Waiting tickets expire when their player stopped polling, matched ones
+        after a grace period in which the player can still read them.
+        """
+        if self.status == 'waiting':
+            return self.last_seen < now - settings.TICTACTOE_MATCHMAKING_TICKET_TTL
+        if self.status == 'matched':
+            return self.matched < now - settings.TICTACTOE_MATCHMAKING_MATCHED_TTL
+        return True
+
+
+class Matchmaker:
+    """
+    Queues players by board and pairs each newcomer with the player of the
+    same pool that has waited longest. Players keep their ticket alive by
+    polling it; tickets not polled for TICTACTOE_MATCHMAKING_TICKET_TTL
+    seconds are never paired.
+    """
+
+    def enqueue(self, name: str, board_size: int = 3, win_length: int = 3, rating: int = None) -> Ticket:
+        raise NotImplementedError()
+
+    def get(self, ticket_id: uuid.UUID) -> Optional[Ticket]:
+        raise NotImplementedError()
+
+    def cancel(self, ticket_id: uuid.UUID) -> bool:
+        raise NotImplementedError()
+
+
+@transaction.atomic
+def create_match(owner: Ticket, opponent: Ticket) -> Tuple[GameSession, Player, Player]:
+    """
+    Create the session of two matched tickets with both players, and store
+    the session and player ids on the tickets.
+    """
+    owner_symbol, opponent_symbol = map(Symbol, settings.TICTACTOE_PLAYER_SYMBOLS)
+    session = GameSession.objects.create(
+        name=f'{owner.name} - {opponent.name}',
+        session_id=uuid.uuid4(),
+        board_size=owner.board_size,
+        win_length=owner.win_length
+    )
+    players = Player.objects.bulk_create([
+        Player(name=owner.name, player_id=uuid.uuid4(), symbol=owner_symbol),
+        Player(name=opponent.name, player_id=uuid.uuid4(), symbol=opponent_symbol)
+    ])
+    SessionPlayer.objects.bulk_create([
+        SessionPlayer(session=session, player=players[0], owner=True),
+        SessionPlayer(session=session, player=players[1])
+    ])
+    matched = timezone.now().timestamp()
+    for ticket, player in zip((owner, opponent), players):
+        ticket.status = 'matched'
+        ticket.matched = matched
+        ticket.session_id = session.session_id
+        ticket.player_id = player.player_id
+    return session, players[0], players[1]
@@ -0,0 +1,103 @@
+import uuid
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from tictactoe.matchmaking.base import Matchmaker, Ticket, create_match
+from tictactoe.models import MatchTicket
+
+
+class DatabaseMatchmaker(Matchmaker):
+    """
+    Keeps the queue in the ticket table, so every worker pairs from the same
+    queue. Tickets are claimed with SELECT ... FOR UPDATE SKIP LOCKED: a worker
+    never waits for, or matches, a ticket another worker is pairing. Tickets
+    skipped that way are paired again when their player polls, which also
+    keeps them alive.
+    """
+
+    def enqueue(self, name: str, board_size: int = 3, win_length: int = 3, rating: int = None) -> Ticket:
+        ticket = MatchTicket.objects.create(
+            ticket_id=uuid.uuid4(),
+            name=name,
+            board_size=board_size,
+            win_length=win_length,
+            rating=rating
+        )
+        return self.pair(ticket.pk) or self.to_ticket(ticket)
+
+    def get(self, ticket_id: uuid.UUID) -> Optional[Ticket]:
+        ticket = MatchTicket.objects.select_related('session', 'player').filter(ticket_id=ticket_id).first()
+        if ticket is None:
+            return None
+        now = timezone.now()
+        if ticket.status == MatchTicket.MATCHED:
+            if ticket.matched and ticket.matched < now - timedelta(seconds=settings.TICTACTOE_MATCHMAKING_MATCHED_TTL):
+                return None
+            return self.to_ticket(ticket)
+        if ticket.status != MatchTicket.WAITING:
+            return self.to_ticket(ticket)
+        if ticket.last_seen < self.get_live_since(now):
+            MatchTicket.objects.filter(pk=ticket.pk, status=MatchTicket.WAITING).update(status=MatchTicket.EXPIRED)
+            return self.get(ticket_id)
+        MatchTicket.objects.filter(pk=ticket.pk).update(last_seen=now)
+        ticket.last_seen = now
+        return self.pair(ticket.pk) or self.to_ticket(ticket)
+
+    def cancel(self, ticket_id: uuid.UUID) -> bool:
+        return bool(
+            MatchTicket.objects.filter(ticket_id=ticket_id, status=MatchTicket.WAITING).update(
+                status=MatchTicket.CANCELLED
+            )
+        )
+
+    @transaction.atomic
+    def pair(self, pk: int) -> Optional[Ticket]:
+        """
+        Match the waiting ticket with the longest waiting ticket of its pool,
+        returns None when either is not available.
+        """
+        tickets = MatchTicket.objects.select_for_update(skip_locked=True).filter(status=MatchTicket.WAITING)
+        ticket = tickets.filter(pk=pk).first()
+        if ticket is None:
+            return None
+        partner = tickets.filter(
+            board_size=ticket.board_size,
+            win_length=ticket.win_length,
+            last_seen__gte=self.get_live_since(timezone.now())
+        ).exclude(pk=pk).order_by('created', 'pk').first()
+        if partner is None:
+            return None
+
+        owner, opponent = self.to_ticket(partner), self.to_ticket(ticket)
+        session, *players = create_match(owner, opponent)
+        for model, player in zip((partner, ticket), players):
+            model.status = MatchTicket.MATCHED
+            model.session = session
+            model.player = player
+            model.matched = timezone.now()
+        MatchTicket.objects.bulk_update([partner, ticket], ['status', 'session', 'player', 'matched'])
+        return opponent
+
+    @staticmethod
+    def get_live_since(now):
+        return now - timedelta(seconds=settings.TICTACTOE_MATCHMAKING_TICKET_TTL)
+
+    @staticmethod
+    def to_ticket(ticket: MatchTicket) -> Ticket:
+        return Ticket(
+            name=ticket.name,
+            board_size=ticket.board_size,
+            win_length=ticket.win_length,
+            rating=ticket.rating,
+            ticket_id=ticket.ticket_id,
+            created=ticket.created.timestamp(),
+            status=ticket.status,
+            session_id=ticket.session.session_id if ticket.session else None,
+            player_id=ticket.player.player_id if ticket.player else None,
+            last_seen=ticket.last_seen.timestamp(),
+            matched=ticket.matched.timestamp() if ticket.matched else None
+        )
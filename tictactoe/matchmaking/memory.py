@@ -0,0 +1,91 @@
+import heapq
+import itertools
+import threading
+import uuid
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from django.utils import timezone
+
+from tictactoe.matchmaking.base import Matchmaker, Ticket, create_match
+
+
+class InMemoryMatchmaker(Matchmaker):
+    """
+    Keeps a heap of waiting tickets per pool, ordered by the time they were
+    enqueued, for a single node. Cancelled and expired tickets stay in the
+    heap until they reach the top, so enqueueing and pairing are O(log n).
+    Matched tickets are kept, in the order they were matched, until their
+    grace period ends.
+    """
+
+    pools: Dict[Tuple[int, int], List[Tuple[float, int, Ticket]]]
+
+    tickets: Dict[uuid.UUID, Ticket]
+
+    matched: Deque[Ticket]
+
+    def __init__(self):
+        self.pools = defaultdict(list)
+        self.tickets = {}
+        self.matched = deque()
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def enqueue(self, name: str, board_size: int = 3, win_length: int = 3, rating: int = None) -> Ticket:
+        ticket = Ticket(name=name, board_size=board_size, win_length=win_length, rating=rating)
+        with self.lock:
+            self.purge(ticket.created)
+            self.tickets[ticket.ticket_id] = ticket
+            pool = self.pools[ticket.pool]
+            while pool:
+                _, _, partner = heapq.heappop(pool)
+                if partner.status != 'waiting':
+                    continue
+                if partner.is_expired(ticket.created):
+                    self.expire(partner)
+                    continue
+                try:
+                    create_match(partner, ticket)
+                except Exception:
+                    heapq.heappush(pool, (partner.created, next(self.counter), partner))
+                    raise
+                self.matched.extend((partner, ticket))
+                break
+            else:
+                heapq.heappush(pool, (ticket.created, next(self.counter), ticket))
+        return ticket
+
+    def get(self, ticket_id: uuid.UUID) -> Optional[Ticket]:
+        now = timezone.now().timestamp()
+        with self.lock:
+            self.purge(now)
+            ticket = self.tickets.get(ticket_id)
+            if ticket is None:
+                return None
+            if ticket.is_expired(now):
+                # The player learns once that the ticket expired
+                self.expire(ticket)
+            elif ticket.status == 'waiting':
+                ticket.last_seen = now
+            return ticket
+
+    def cancel(self, ticket_id: uuid.UUID) -> bool:
+        with self.lock:
+            ticket = self.tickets.get(ticket_id)
+            if ticket is None or ticket.status != 'waiting':
+                return False
+            ticket.status = 'cancelled'
+            del self.tickets[ticket_id]
+            return True
+
+    def expire(self, ticket: Ticket):
+        ticket.status = 'expired'
+        self.tickets.pop(ticket.ticket_id, None)
+
+    def purge(self, now: float):
+        """
+        Drop the matched tickets whose grace period ended.
+        """
+        while self.matched and self.matched[0].is_expired(now):
+            self.tickets.pop(self.matched.popleft().ticket_id, None)
@@ -0,0 +1,58 @@
+import threading
+from typing import Dict
+
+
+class Counter:
+
+    name: str
+
+    value: int
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self.lock:
+            self.value += amount
+
+
+class Gauge(Counter):
+    """
+    A counter that can go down, for values such as queue depths.
+    """
+
+    def dec(self, amount: int = 1):
+        self.inc(-amount)
+
+    def set(self, value: int):
+        with self.lock:
+            self.value = value
+
+
+class Registry:
+    """
+    The counters of this process, by name.
+    """
+
+    counters: Dict[str, Counter]
+
+    def __init__(self):
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def counter(self, name: str) -> Counter:
+        with self.lock:
+            return self.counters.setdefault(name, Counter(name))
+
+    def gauge(self, name: str) -> Gauge:
+        with self.lock:
+            return self.counters.setdefault(name, Gauge(name))
+
+    def snapshot(self) -> Dict[str, int]:
+        with self.lock:
+            return {name: counter.value for name, counter in sorted(self.counters.items())}
+
+
+registry = Registry()
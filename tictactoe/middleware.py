@@ -0,0 +1,24 @@
+from django.conf import settings
+
+
+class PlayerTokenMiddleware:
+    """
+    Sets the player tokens issued by TokenSessionHandler while handling the
+    request as cookies on the response.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        for key, token in getattr(request, 'player_tokens', {}).items():
+            response.set_cookie(
+                key,
+                token,
+                max_age=settings.TICTACTOE_PLAYER_TOKEN_MAX_AGE,
+                secure=request.is_secure(),
+                httponly=True,
+                samesite='Lax'
+            )
+        return response
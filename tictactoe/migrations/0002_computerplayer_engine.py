@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tictactoe', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='computerplayer',
+            name='engine',
+            field=models.CharField(default='basic', max_length=50),
+        ),
+    ]
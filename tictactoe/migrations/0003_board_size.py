@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:18
+
+import django.core.validators
+from django.db import migrations, models
+import tictactoe.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tictactoe', '0002_computerplayer_engine'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='board_size',
+            field=models.PositiveSmallIntegerField(default=3),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='win_length',
+            field=models.PositiveSmallIntegerField(default=3),
+        ),
+        migrations.AddField(
+            model_name='gamesession',
+            name='board_size',
+            field=models.PositiveSmallIntegerField(default=3, validators=[django.core.validators.MinValueValidator(3), django.core.validators.MaxValueValidator(19)]),
+        ),
+        migrations.AddField(
+            model_name='gamesession',
+            name='win_length',
+            field=models.PositiveSmallIntegerField(default=3, validators=[django.core.validators.MinValueValidator(3)]),
+        ),
+        migrations.AlterField(
+            model_name='game',
+            name='board',
+            field=tictactoe.fields.BoardField(default=[[None, None, None], [None, None, None], [None, None, None]], win_length_field='win_length'),
+        ),
+    ]
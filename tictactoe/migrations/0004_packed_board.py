@@ -0,0 +1,62 @@
+from django.db import migrations, transaction
+
+import tictactoe.fields
+
+
+BATCH_SIZE = 1000
+
+
+def copy_board(apps, source, target):
+    """
+    Copy the boards in batches by primary key, each committed on its own, so
+    rows are only locked for the duration of a batch.
+    """
+    Game = apps.get_model('tictactoe', 'Game')
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                Game.objects.only('id', 'win_length', source).filter(pk__gt=last_pk).order_by('pk')[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+            for game in batch:
+                setattr(game, target, getattr(game, source))
+            Game.objects.bulk_update(batch, [target])
+        last_pk = batch[-1].pk
+
+
+def pack_boards(apps, schema_editor):
+    copy_board(apps, 'board', 'packed_board')
+
+
+def unpack_boards(apps, schema_editor):
+    copy_board(apps, 'packed_board', 'board')
+
+
+class Migration(migrations.Migration):
+
+    # The table is rewritten batch by batch instead of in a single transaction
+    atomic = False
+
+    dependencies = [
+        ('tictactoe', '0003_board_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='packed_board',
+            field=tictactoe.fields.PackedBoardField(default=[[None, None, None], [None, None, None], [None, None, None]], win_length_field='win_length'),
+        ),
+        migrations.RunPython(pack_boards, unpack_boards),
+        migrations.RemoveField(
+            model_name='game',
+            name='board',
+        ),
+        migrations.RenameField(
+            model_name='game',
+            old_name='packed_board',
+            new_name='board',
+        ),
+    ]
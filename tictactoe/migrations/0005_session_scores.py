@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:34
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def count_scores(apps, schema_editor):
+    Game = apps.get_model('tictactoe', 'Game')
+    GameSession = apps.get_model('tictactoe', 'GameSession')
+    owner_symbol = settings.TICTACTOE_PLAYER_SYMBOLS[0]
+    scores = Game.objects.filter(winner__isnull=False).values('session_id').annotate(
+        owner_score=Count('id', filter=Q(winner__symbol=owner_symbol)),
+        opponent_score=Count('id', filter=~Q(winner__symbol=owner_symbol))
+    )
+    for row in scores.iterator():
+        GameSession.objects.filter(pk=row['session_id']).update(
+            owner_score=row['owner_score'],
+            opponent_score=row['opponent_score']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tictactoe', '0004_packed_board'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamesession',
+            name='opponent_score',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gamesession',
+            name='owner_score',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+import tictactoe.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tictactoe', '0006_game_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Move',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('symbol', tictactoe.fields.SymbolField(default=None, max_length=1)),
+                ('x', models.PositiveSmallIntegerField()),
+                ('y', models.PositiveSmallIntegerField()),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='moves', to='tictactoe.game')),
+                ('player', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='moves', to='tictactoe.player')),
+            ],
+            options={
+                'ordering': ('game', 'number'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='move',
+            constraint=models.UniqueConstraint(fields=('game', 'number'), name='Unique constraint on game and number'),
+        ),
+    ]
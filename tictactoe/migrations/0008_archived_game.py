@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:51
+
+from django.db import migrations, models
+import tictactoe.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tictactoe', '0007_move'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedGame',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_id', models.PositiveBigIntegerField(unique=True)),
+                ('session_id', models.UUIDField(db_index=True)),
+                ('game_time', models.DateTimeField()),
+                ('board_size', models.PositiveSmallIntegerField(default=3)),
+                ('win_length', models.PositiveSmallIntegerField(default=3)),
+                ('board', tictactoe.fields.PackedBoardField(default=[[None, None, None], [None, None, None], [None, None, None]], win_length_field='win_length')),
+                ('moves', models.BinaryField(default=bytes)),
+                ('winner', tictactoe.fields.SymbolField(default=None, max_length=1, null=True)),
+            ],
+            options={
+                'ordering': ('-game_time',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['game_time'], name='tictactoe_game_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gamesession',
+            index=models.Index(fields=['session_time'], name='tictactoe_session_time_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tictactoe', '0008_archived_game'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchTicket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticket_id', models.UUIDField(unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('board_size', models.PositiveSmallIntegerField(default=3)),
+                ('win_length', models.PositiveSmallIntegerField(default=3)),
+                ('rating', models.IntegerField(null=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('status', models.CharField(choices=[('waiting', 'Waiting'), ('matched', 'Matched'), ('cancelled', 'Cancelled')], default='waiting', max_length=10)),
+                ('player', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tictactoe.player')),
+                ('session', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tictactoe.gamesession')),
+            ],
+            options={
+                'ordering': ('created',),
+                'indexes': [models.Index(condition=models.Q(('status', 'waiting')), fields=['board_size', 'win_length', 'created'], name='tictactoe_ticket_waiting_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:14
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tictactoe', '0010_outbox_mail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchticket',
+            name='last_seen',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='matchticket',
+            name='matched',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='matchticket',
+            name='status',
+            field=models.CharField(choices=[('waiting', 'Waiting'), ('matched', 'Matched'), ('cancelled', 'Cancelled'), ('expired', 'Expired')], default='waiting', max_length=10),
+        ),
+    ]
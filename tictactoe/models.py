@@ -1,6 +1,10 @@
+from django.conf import settings
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
 
-from tictactoe.fields import BoardField, SymbolField
+from tictactoe.core import GameCore
+from tictactoe.fields import BitBoard, PackedBoardField, SymbolField, unpack_moves
 
 
 class GameSession(models.Model):
@@ -11,28 +15,43 @@ class GameSession(models.Model):
 
     session_time = models.DateTimeField(auto_now=True)
 
+    board_size = models.PositiveSmallIntegerField(
+        default=3,
+        validators=[MinValueValidator(3), MaxValueValidator(settings.TICTACTOE_MAX_BOARD_SIZE)]
+    )
+
+    win_length = models.PositiveSmallIntegerField(default=3, validators=[MinValueValidator(3)])
+
+    owner_score = models.PositiveIntegerField(default=0)
+
+    opponent_score = models.PositiveIntegerField(default=0)
+
     players = models.ManyToManyField('tictactoe.Player', related_name='sessions', through='tictactoe.SessionPlayer')
 
     class Meta:
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=('session_time',), name='tictactoe_session_time_idx')
+        ]
 
     def __str__(self):
         return self.name
 
     @property
     def owner(self):
-        return self.player_session.get(owner=True).player
+        return next(
+            session_player.player for session_player in self.player_session.all() if session_player.owner
+        )
 
     @property
     def opponent(self):
         try:
-            player = self.computer_player
+            return self.computer_player.player
         except ComputerPlayer.DoesNotExist:
-            try:
-                player = self.player_session.get(owner=False)
-            except Player.DoesNotExist:
-                player = None
-        return player.player
+            return next(
+                (session_player.player for session_player in self.player_session.all() if not session_player.owner),
+                None
+            )
 
     @property
     def game(self):
@@ -44,7 +63,7 @@ class GameSession(models.Model):
             computer_player = self.computer_player
         except ComputerPlayer.DoesNotExist:
             computer_player = None
-        return self.players.count() == 2 or computer_player
+        return len(self.player_session.all()) == 2 or computer_player is not None
 
 
 class Player(models.Model):
@@ -68,6 +87,8 @@ class ComputerPlayer(models.Model):
 
     player = models.OneToOneField(Player, on_delete=models.CASCADE, related_name='+')
 
+    engine = models.CharField(max_length=50, default='basic')
+
     class Meta:
         ordering = ('session',)
 
@@ -106,7 +127,11 @@ class Game(models.Model):
 
     game_time = models.DateTimeField(auto_now=True)
 
-    board = BoardField()
+    board_size = models.PositiveSmallIntegerField(default=3)
+
+    win_length = models.PositiveSmallIntegerField(default=3)
+
+    board = PackedBoardField(win_length_field='win_length')
 
     num_symbols = models.PositiveIntegerField(default=0)
 
@@ -118,8 +143,13 @@ class Game(models.Model):
 
     is_ended = models.BooleanField(default=False)
 
+    version = models.PositiveIntegerField(default=0)
+
     class Meta:
         ordering = ("session", "-game_time")
+        indexes = [
+            models.Index(fields=('game_time',), name='tictactoe_game_time_idx')
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=('session', 'is_active'),
@@ -130,3 +160,179 @@ class Game(models.Model):
 
     def __str__(self):
         return f'{self.session} - {self.game_time}'
+
+    def replay(self) -> GameCore:
+        return GameCore.replay(
+            BitBoard.empty(self.board_size, self.win_length),
+            ((move.coords, move.symbol) for move in self.moves.all())
+        )
+
+
+class Move(models.Model):
+
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='moves')
+
+    number = models.PositiveIntegerField()
+
+    player = models.ForeignKey(Player, null=True, on_delete=models.SET_NULL, related_name='moves')
+
+    symbol = SymbolField()
+
+    x = models.PositiveSmallIntegerField()
+
+    y = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ('game', 'number')
+        constraints = [
+            models.UniqueConstraint(
+                fields=('game', 'number'),
+                name='Unique constraint on game and number'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.game} - {self.number}'
+
+    @property
+    def coords(self):
+        return self.x, self.y
+
+
+class ArchivedGame(models.Model):
+    """
+    A finished game moved out of the game table by the archive_games command:
+    the final board and the move sequence, packed.
+    """
+
+    game_id = models.PositiveBigIntegerField(unique=True)
+
+    session_id = models.UUIDField(db_index=True)
+
+    game_time = models.DateTimeField()
+
+    board_size = models.PositiveSmallIntegerField(default=3)
+
+    win_length = models.PositiveSmallIntegerField(default=3)
+
+    board = PackedBoardField(win_length_field='win_length')
+
+    moves = models.BinaryField(default=bytes)
+
+    winner = SymbolField(null=True)
+
+    class Meta:
+        ordering = ('-game_time',)
+
+    def __str__(self):
+        return f'{self.session_id} - {self.game_time}'
+
+    def replay(self) -> GameCore:
+        return GameCore.replay(
+            BitBoard.empty(self.board_size, self.win_length),
+            unpack_moves(bytes(self.moves), self.board_size)
+        )
+
+
+class MatchTicket(models.Model):
+    """
+    A player waiting in the matchmaking queue of the database matchmaker.
+    """
+
+    WAITING = 'waiting'
+    MATCHED = 'matched'
+    CANCELLED = 'cancelled'
+    EXPIRED = 'expired'
+
+    STATUS_CHOICES = (
+        (WAITING, 'Waiting'),
+        (MATCHED, 'Matched'),
+        (CANCELLED, 'Cancelled'),
+        (EXPIRED, 'Expired'),
+    )
+
+    ticket_id = models.UUIDField(unique=True)
+
+    name = models.CharField(max_length=100)
+
+    board_size = models.PositiveSmallIntegerField(default=3)
+
+    win_length = models.PositiveSmallIntegerField(default=3)
+
+    rating = models.IntegerField(null=True)
+
+    created = models.DateTimeField(auto_now_add=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=WAITING)
+
+    last_seen = models.DateTimeField(default=timezone.now)
+
+    matched = models.DateTimeField(null=True)
+
+    session = models.ForeignKey(GameSession, null=True, on_delete=models.CASCADE, related_name='+')
+
+    player = models.ForeignKey(Player, null=True, on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        ordering = ('created',)
+        indexes = [
+            models.Index(
+                fields=('board_size', 'win_length', 'created'),
+                name='tictactoe_ticket_waiting_idx',
+                condition=models.Q(status='waiting')
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.name} - {self.status}'
+
+
+class OutboxMail(models.Model):
+    """
+    A mail written by a request and sent later by the send_outbox command.
+    """
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    )
+
+    subject = models.CharField(max_length=255)
+
+    body = models.TextField()
+
+    html = models.TextField(blank=True)
+
+    from_email = models.CharField(max_length=255)
+
+    to = models.EmailField()
+
+    created = models.DateTimeField(auto_now_add=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    next_attempt = models.DateTimeField(default=timezone.now)
+
+    sent = models.DateTimeField(null=True)
+
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ('created',)
+        indexes = [
+            models.Index(
+                fields=('next_attempt',),
+                name='tictactoe_outbox_pending_idx',
+                condition=models.Q(status='pending')
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.to} - {self.subject}'
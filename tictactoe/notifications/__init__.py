@@ -0,0 +1,15 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from tictactoe.notifications.base import Hub, NotificationBackend, Subscription
+
+
+@lru_cache(maxsize=None)
+def get_backend() -> NotificationBackend:
+    """
+    The notification backend of this process; one per worker, so that it can
+    hold a single listening connection.
+    """
+    return import_string(settings.TICTACTOE_NOTIFICATION_BACKEND)()
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Set
+
+
+@dataclass(eq=False)
+class Subscription:
+    channel: str
+
+    loop: asyncio.AbstractEventLoop
+
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=Hub.max_queue_size))
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+    def put(self, event: dict):
+        """
+        Queue the event, dropping the oldest one when the subscriber falls
+        behind: events only tell the client to catch up.
+        """
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+
+class Hub:
+    """
+    In-process publish/subscribe of session events. Subscribers are asyncio
+    queues, so idle connections only cost a queue; publishing is thread-safe
+    and can be done from sync code.
+    """
+
+    max_queue_size: int = 16
+
+    subscriptions: Dict[str, Set[Subscription]]
+
+    def __init__(self):
+        self.subscriptions = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(channel, asyncio.get_running_loop())
+        with self.lock:
+            self.subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.channel, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self.subscriptions.pop(subscription.channel, None)
+
+    def publish(self, channel: str, event: dict):
+        with self.lock:
+            subscriptions = tuple(self.subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # The event loop of the subscriber is closed
+                self.unsubscribe(subscription)
+
+    @property
+    def channels(self) -> Set[str]:
+        with self.lock:
+            return set(self.subscriptions)
+
+    def has_subscriptions(self, channel: str) -> bool:
+        with self.lock:
+            return channel in self.subscriptions
+
+    @property
+    def num_subscriptions(self) -> int:
+        with self.lock:
+            return sum(map(len, self.subscriptions.values()))
+
+
+class NotificationBackend:
+    """
+    Delivers the events published for a channel, once the change they describe
+    is committed, to the subscriptions of the local hub of every worker.
+    """
+
+    hub: Hub
+
+    def __init__(self):
+        self.hub = Hub()
+
+    def notify(self, channel: str, event: dict):
+        raise NotImplementedError()
+
+    def subscribe(self, channel: str) -> Subscription:
+        return self.hub.subscribe(channel)
+
+    def unsubscribe(self, subscription: Subscription):
+        self.hub.unsubscribe(subscription)
@@ -0,0 +1,13 @@
+from django.db import transaction
+
+from tictactoe.notifications.base import NotificationBackend
+
+
+class InMemoryBackend(NotificationBackend):
+    """
+    Delivers events to the subscribers of the current process only, for
+    single-worker deployments, SQLite and tests.
+    """
+
+    def notify(self, channel: str, event: dict):
+        transaction.on_commit(lambda: self.hub.publish(channel, event))
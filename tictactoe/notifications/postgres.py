@@ -0,0 +1,151 @@
+import json
+import logging
+import queue
+import select
+import socket
+import threading
+import time
+from typing import Set
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT, quote_ident
+from django.db import connections
+
+from tictactoe.notifications.base import Hub, NotificationBackend, Subscription
+
+logger = logging.getLogger(__name__)
+
+
+class Listener(threading.Thread):
+    """
+    Holds the LISTEN connection of a worker and publishes the notifications it
+    receives to the local hub.
+    """
+
+    reconnect_delay: float = 1.0
+
+    channels: Set[str]
+
+    def __init__(self, hub: Hub, alias: str = 'default'):
+        super().__init__(name='tictactoe-listener', daemon=True)
+        self.hub = hub
+        self.alias = alias
+        self.channels = set()
+        self.commands = queue.SimpleQueue()
+        self.receiver, self.sender = socket.socketpair()
+        self.receiver.setblocking(False)
+
+    def listen(self, channel: str):
+        self.commands.put(('LISTEN', channel))
+        self.sender.send(b'\0')
+
+    def unlisten(self, channel: str):
+        self.commands.put(('UNLISTEN', channel))
+        self.sender.send(b'\0')
+
+    def stop(self):
+        self.commands.put(('STOP', None))
+        self.sender.send(b'\0')
+
+    def run(self):
+        while True:
+            try:
+                self.serve(self.connect())
+                return
+            except psycopg2.Error:
+                logger.exception('Lost the notification connection, reconnecting')
+            except Exception:
+                logger.exception('Notification listener failed, reconnecting')
+            time.sleep(self.reconnect_delay)
+
+    def connect(self):
+        connection = psycopg2.connect(**connections[self.alias].get_connection_params())
+        connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with connection.cursor() as cursor:
+            for channel in self.channels:
+                cursor.execute(f'LISTEN {quote_ident(channel, connection)}')
+        return connection
+
+    def serve(self, connection):
+        try:
+            while True:
+                readable, _, _ = select.select([connection, self.receiver], [], [])
+                if self.receiver in readable and not self.execute_commands(connection):
+                    return
+                if connection in readable:
+                    connection.poll()
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        try:
+                            event = json.loads(notify.payload)
+                        except ValueError:
+                            logger.warning('Dropped malformed notification on %s', notify.channel)
+                            continue
+                        self.hub.publish(notify.channel, event)
+        finally:
+            connection.close()
+
+    def execute_commands(self, connection) -> bool:
+        """
+        Execute the queued commands, returns False when the listener has to stop.
+        """
+        try:
+            while self.receiver.recv(1024):
+                ...
+        except BlockingIOError:
+            ...
+        with connection.cursor() as cursor:
+            while True:
+                try:
+                    command, channel = self.commands.get_nowait()
+                except queue.Empty:
+                    return True
+                if command == 'STOP':
+                    return False
+                if command == 'LISTEN':
+                    self.channels.add(channel)
+                else:
+                    self.channels.discard(channel)
+                cursor.execute(f'{command} {quote_ident(channel, connection)}')
+
+
+class PostgresBackend(NotificationBackend):
+    """
+    Sends events with NOTIFY on the channel of the session, which PostgreSQL
+    delivers when the transaction commits, to the listener of every worker.
+    """
+
+    alias: str = 'default'
+
+    def __init__(self):
+        super().__init__()
+        self.listener = Listener(self.hub, self.alias)
+        self.lock = threading.Lock()
+
+    def notify(self, channel: str, event: dict):
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [channel, json.dumps(event)])
+
+    def subscribe(self, channel: str) -> Subscription:
+        with self.lock:
+            if not self.listener.is_alive():
+                if self.listener.ident is not None:
+                    # A thread only starts once, a listener that ended is replaced
+                    self.listener = Listener(self.hub, self.alias)
+                    self.listener.channels = self.hub.channels
+                self.listener.start()
+            if not self.hub.has_subscriptions(channel):
+                self.listener.listen(channel)
+            return super().subscribe(channel)
+
+    def unsubscribe(self, subscription: Subscription):
+        with self.lock:
+            super().unsubscribe(subscription)
+            if not self.hub.has_subscriptions(subscription.channel):
+                self.listener.unlisten(subscription.channel)
+
+    def close(self):
+        with self.lock:
+            if self.listener.is_alive():
+                self.listener.stop()
+                self.listener.join()
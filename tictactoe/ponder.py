@@ -0,0 +1,130 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from tictactoe.core import GameCore
+from tictactoe.engines import get_engine
+from tictactoe.engines.base import get_bits, get_neighbourhood
+from tictactoe.fields import BitBoard, Symbol, get_cell_line_masks
+from tictactoe.metrics import registry
+from tictactoe.workers import BoundedExecutor
+
+
+class PonderCache:
+    """
+    The replies of the computer player computed ahead of the human move, per
+    game and keyed by the packed board after that move. A game only keeps the
+    replies to its current position: they are dropped as soon as one is
+    looked up, and whole games are evicted, least recently pondered first,
+    once more than max_size replies are kept.
+    """
+
+    games: 'OrderedDict[int, Dict[bytes, Tuple[int, int]]]'
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.games = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        self.hits = registry.counter('ponder.hits')
+        self.misses = registry.counter('ponder.misses')
+        self.evictions = registry.counter('ponder.evictions')
+        self.hit_rate = registry.gauge('ponder.hit_rate_pct')
+
+    def start(self, game_id: int):
+        """
+        Drop the replies of the previous position and accept those of the
+        current one.
+        """
+        with self.lock:
+            self.size -= len(self.games.pop(game_id, ()))
+            self.games[game_id] = {}
+
+    def put(self, game_id: int, board: BitBoard, coords: Tuple[int, int]) -> bool:
+        """
+        Keep the reply, returns False once the game has moved on.
+        """
+        with self.lock:
+            replies = self.games.get(game_id)
+            if replies is None:
+                return False
+            replies[board.pack()] = coords
+            self.size += 1
+            self.games.move_to_end(game_id)
+            while self.size > self.max_size:
+                _, evicted = self.games.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions.inc(len(evicted))
+            return game_id in self.games
+
+    def pop(self, game_id: int, board: BitBoard) -> Optional[Tuple[int, int]]:
+        with self.lock:
+            replies = self.games.pop(game_id, {})
+            self.size -= len(replies)
+        coords = replies.get(board.pack())
+        (self.misses if coords is None else self.hits).inc()
+        hits, misses = self.hits.value, self.misses.value
+        self.hit_rate.set(round(100 * hits / (hits + misses)))
+        return coords
+
+    def discard(self, game_id: int):
+        with self.lock:
+            self.size -= len(self.games.pop(game_id, ()))
+
+    def clear(self):
+        with self.lock:
+            self.games.clear()
+            self.size = 0
+
+
+def get_likely_moves(board: BitBoard, symbol: Symbol, opponent_symbol: Symbol, count: int) -> List[Tuple[int, int]]:
+    """
+    Return the free slots next to the symbols on the board the player is most
+    likely to play: those on the most series the opponent does not block yet,
+    weighted by the symbols already in them.
+    """
+    own, other = board.masks[symbol], board.masks[opponent_symbol]
+    occupied = own | other
+    free = board.full_mask & ~occupied
+    candidates = get_neighbourhood(board.size, occupied) & free if occupied else free
+    cell_lines = get_cell_line_masks(board.size, board.win_length)
+    scores = {}
+    for bit in get_bits(candidates):
+        scores[bit] = sum(
+            # Blocking the series of the opponent is as likely as extending one's own
+            10 ** max((own & line).bit_count(), (other & line).bit_count())
+            for line in cell_lines[bit]
+            if not own & line or not other & line
+        )
+    best = sorted(scores, key=lambda bit: (-scores[bit], bit))[:count]
+    return [divmod(bit, board.size) for bit in best]
+
+
+def ponder(game_id: int, board: BitBoard, num_symbols: int, engine: str, symbol: Symbol, opponent_symbol: Symbol):
+    """
+    Compute the replies of the computer player, playing `symbol`, to the most
+    likely moves of its opponent, until the game moves on.
+    """
+    cache = get_ponder_cache()
+    engine = get_engine(engine)
+    for coords in get_likely_moves(board, opponent_symbol, symbol, settings.TICTACTOE_PONDER_MOVES):
+        core = GameCore(BitBoard.unpack(board.pack(), board.win_length), num_symbols=num_symbols)
+        core.play(coords, opponent_symbol)
+        if core.is_ended:
+            continue
+        reply = engine.select_move(core.board, symbol, opponent_symbol)
+        if not cache.put(game_id, core.board, reply):
+            break
+
+
+@lru_cache(maxsize=None)
+def get_ponder_cache() -> PonderCache:
+    return PonderCache(settings.TICTACTOE_PONDER_CACHE_SIZE)
+
+
+@lru_cache(maxsize=None)
+def get_ponder_workers() -> BoundedExecutor:
+    return BoundedExecutor('ponder', settings.TICTACTOE_PONDER_WORKERS, settings.TICTACTOE_PONDER_QUEUE_SIZE)
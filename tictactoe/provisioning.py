@@ -0,0 +1,105 @@
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from tictactoe.fields import Symbol
+from tictactoe.models import ComputerPlayer, GameSession, Player, SessionPlayer
+from tictactoe.session import TokenSessionHandler
+
+
+@dataclass
+class ProvisionedPlayer:
+    player_id: uuid.UUID
+
+    name: str
+
+    token: str
+
+
+@dataclass
+class ProvisionedSession:
+    session_id: uuid.UUID
+
+    name: str
+
+    owner: ProvisionedPlayer
+
+    opponent: Optional[ProvisionedPlayer]
+
+
+@transaction.atomic
+def provision_sessions(
+    count: int,
+    name: str,
+    player_name: str,
+    game_mode: str = 'human',
+    opponent_name: str = None,
+    board_size: int = 3,
+    win_length: int = 3,
+    batch_size: int = 1000
+) -> List[ProvisionedSession]:
+    """
+    Create count sessions with their owners and, for the computer game mode or
+    when an opponent name is given, their opponents, with one bulk insert per
+    table in a single transaction.
+    """
+    owner_symbol, opponent_symbol = map(Symbol, settings.TICTACTOE_PLAYER_SYMBOLS)
+    sessions = GameSession.objects.bulk_create([
+        GameSession(
+            name=f'{name} {index}',
+            session_id=uuid.uuid4(),
+            board_size=board_size,
+            win_length=win_length
+        )
+        for index in range(1, count + 1)
+    ], batch_size=batch_size)
+
+    owners = [
+        Player(name=f'{player_name} {index}', player_id=uuid.uuid4(), symbol=owner_symbol)
+        for index in range(1, count + 1)
+    ]
+    if game_mode == 'computer':
+        opponents = [Player(name='Computer', player_id=uuid.uuid4(), symbol=opponent_symbol) for _ in sessions]
+    elif opponent_name:
+        opponents = [
+            Player(name=f'{opponent_name} {index}', player_id=uuid.uuid4(), symbol=opponent_symbol)
+            for index in range(1, count + 1)
+        ]
+    else:
+        opponents = []
+    Player.objects.bulk_create(owners + opponents, batch_size=batch_size)
+
+    session_players = [
+        SessionPlayer(session=session, player=owner, owner=True) for session, owner in zip(sessions, owners)
+    ]
+    if game_mode == 'computer':
+        ComputerPlayer.objects.bulk_create([
+            ComputerPlayer(session=session, player=opponent, engine=settings.TICTACTOE_ENGINE)
+            for session, opponent in zip(sessions, opponents)
+        ], batch_size=batch_size)
+    else:
+        session_players += [
+            SessionPlayer(session=session, player=opponent) for session, opponent in zip(sessions, opponents)
+        ]
+    SessionPlayer.objects.bulk_create(session_players, batch_size=batch_size)
+
+    def get_player(session: GameSession, player: Player) -> ProvisionedPlayer:
+        return ProvisionedPlayer(
+            player_id=player.player_id,
+            name=player.name,
+            token=TokenSessionHandler.make_token(session, 'player_id', player.player_id)
+        )
+
+    human_opponents = opponents if game_mode != 'computer' else []
+    return [
+        ProvisionedSession(
+            session_id=session.session_id,
+            name=session.name,
+            owner=get_player(session, owner),
+            opponent=get_player(session, human_opponents[index]) if human_opponents else None
+        )
+        for index, (session, owner) in enumerate(zip(sessions, owners))
+    ]
@@ -1,4 +1,7 @@
+from django.conf import settings
+from django.core import signing
 from django.http import HttpRequest
+from django.utils.module_loading import import_string
 
 from tictactoe.models import GameSession
 
@@ -25,8 +28,49 @@ class SessionHandler:
         return f'{self.KEY_PREFIX}-{self.game_session.session_id}-{key}'
 
 
+class TokenSessionHandler(SessionHandler):
+    """
+    Keeps the values in signed, expiring tokens, sent by the client in the
+    X-Player-Token header or in a cookie, so reading them needs no database.
+    Values stored in the Django session before the switch are still read, and
+    moved into a token.
+    """
+
+    HEADER: str = 'X-Player-Token'
+
+    SALT: str = 'tictactoe.session.TokenSessionHandler'
+
+    def get(self, item):
+        key = self._make_key(item)
+        for token in (self.request.headers.get(self.HEADER), self.request.COOKIES.get(key)):
+            if token and (value := self._unsign(token, key)) is not None:
+                return value
+        value = super().get(item)
+        if value is not None:
+            self.set(item, value)
+        return value
+
+    def set(self, key, value):
+        if not hasattr(self.request, 'player_tokens'):
+            self.request.player_tokens = {}
+        self.request.player_tokens[self._make_key(key)] = self.make_token(self.game_session, key, value)
+
+    @classmethod
+    def make_token(cls, game_session: GameSession, key: str, value) -> str:
+        key = cls(game_session, None)._make_key(key)
+        return signing.dumps({'key': key, 'value': str(value)}, salt=cls.SALT)
+
+    def _unsign(self, token: str, key: str):
+        try:
+            data = signing.loads(token, salt=self.SALT, max_age=settings.TICTACTOE_PLAYER_TOKEN_MAX_AGE)
+        except signing.BadSignature:
+            return None
+        return data['value'] if data.get('key') == key else None
+
+
 class SessionHandlerFactory:
 
     @classmethod
     def create(cls, game_session: GameSession, request: HttpRequest):
-        return SessionHandler(game_session, request)
+        handler_class = import_string(settings.TICTACTOE_SESSION_HANDLERS[settings.TICTACTOE_SESSION_HANDLER])
+        return handler_class(game_session, request)
@@ -0,0 +1,125 @@
+import math
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from tictactoe.core import GameCore
+from tictactoe.engines import get_engine
+from tictactoe.fields import BitBoard, Symbol
+
+
+def play_game(engines: Tuple[str, str], size: int, win_length: int, seed: int) -> dict:
+    """
+    Play one engine-vs-engine game; the first engine plays X and starts.
+    """
+    # Engines get seeds of their own, the global random state is left alone
+    rng = random.Random(seed)
+    players = tuple(get_engine(name, seed=rng.getrandbits(32)) for name in engines)
+    symbols = (Symbol.X, Symbol.O)
+    core = GameCore(BitBoard.empty(size, win_length))
+    moves = []
+    think_times = ([], [])
+    turn = 0
+    while not core.is_ended:
+        start = time.perf_counter()
+        coords = players[turn].select_move(core.board, symbols[turn], symbols[1 - turn])
+        think_times[turn].append(time.perf_counter() - start)
+        core.play(coords, symbols[turn])
+        moves.append(list(coords))
+        turn = 1 - turn
+    return {
+        'seed': seed,
+        'engines': list(engines),
+        'winner': engines[symbols.index(core.winner)] if core.winner else None,
+        'winner_symbol': core.winner.value if core.winner else None,
+        'moves': moves,
+        'think_times': [list(times) for times in think_times],
+    }
+
+
+def play_games(jobs: List[Tuple[Tuple[str, str], int, int, int]]) -> List[dict]:
+    return [play_game(*job) for job in jobs]
+
+
+class Histogram:
+    """
+    Streaming histogram of positive values in logarithmic buckets, so its
+    memory depends on the range of the values and not on their number.
+    Percentiles are estimated within the relative error of a bucket.
+    """
+
+    growth: float
+
+    buckets: Dict[int, int]
+
+    count: int
+
+    def __init__(self, relative_error: float = 0.01):
+        self.growth = 1 + 2 * relative_error
+        self.buckets = defaultdict(int)
+        self.count = 0
+
+    def add(self, value: float):
+        self.buckets[math.floor(math.log(max(value, 1e-9), self.growth))] += 1
+        self.count += 1
+
+    def get_percentile(self, percent: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(self.count * percent / 100), 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                break
+        # The middle of the bucket, within the relative error of its bounds
+        return self.growth ** index * (1 + self.growth) / 2
+
+
+class SimulationStats:
+
+    games: int
+
+    outcomes: Dict[Tuple[int, int], Dict[Optional[str], int]]
+
+    wins: Dict[Optional[str], int]
+
+    think_times: Dict[str, Histogram]
+
+    def __init__(self):
+        self.games = 0
+        self.outcomes = defaultdict(lambda: defaultdict(int))
+        self.wins = defaultdict(int)
+        self.think_times = defaultdict(Histogram)
+        self.start = time.monotonic()
+
+    def add(self, result: dict):
+        self.games += 1
+        opening = tuple(result['moves'][0])
+        self.outcomes[opening][result['winner_symbol']] += 1
+        self.wins[result['winner']] += 1
+        for engine, times in zip(result['engines'], result['think_times']):
+            histogram = self.think_times[engine]
+            for value in times:
+                histogram.add(value)
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / max(time.monotonic() - self.start, 1e-9)
+
+    def get_percentiles(self, engine: str) -> Dict[str, float]:
+        histogram = self.think_times[engine]
+        return {f'p{percent}': histogram.get_percentile(percent) for percent in (50, 90, 99)}
+
+    def get_opening_rates(self) -> Dict[Tuple[int, int], Dict[str, float]]:
+        rates = {}
+        for opening, outcomes in sorted(self.outcomes.items()):
+            total = sum(outcomes.values())
+            rates[opening] = {
+                'games': total,
+                'X': outcomes[Symbol.X.value] / total,
+                'O': outcomes[Symbol.O.value] / total,
+                'draw': outcomes[None] / total,
+            }
+        return rates
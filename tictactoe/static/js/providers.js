@@ -2,7 +2,10 @@ class PlayerProvider {
 
     constructor(settings) {
         this.gameHandlerUrl = settings.gameHandlerUrl;
+        this.sessionEventsUrl = settings.sessionEventsUrl;
         this.isActivePlayer = false;
+        this.etags = {};
+        this.eventSource = null;
     }
 
     init(board)  {
@@ -20,10 +23,71 @@ class PlayerProvider {
         });
     }
 
+    subscribe() {
+        // Listen to the session events, returns false when the caller has to poll instead
+        if (!this.sessionEventsUrl || typeof EventSource === 'undefined') {
+            return false;
+        }
+
+        let self = this;
+
+        this.eventSource = new EventSource(this.sessionEventsUrl);
+        this.eventSource.addEventListener('open', function () {
+            self.onEventsOpen();
+        });
+        this.eventSource.addEventListener('game', function () {
+            self.pollGame();
+        });
+        this.eventSource.addEventListener('session', function () {
+            self.onSessionEvent();
+        });
+        this.eventSource.addEventListener('error', function () {
+            // The browser reconnects by itself unless the server refused the stream
+            if (self.eventSource.readyState === EventSource.CLOSED) {
+                self.eventSource = null;
+                self.startPolling();
+            }
+        });
+        return true;
+    }
+
+    onEventsOpen() {
+        // Catch up on anything that happened before the stream was opened
+        this.pollGame();
+    }
+
+    onSessionEvent() {
+    }
+
+    startPolling() {
+    }
+
+    poll(url) {
+        let self = this;
+        let headers = {};
+
+        if (this.etags[url]) {
+            headers['If-None-Match'] = this.etags[url];
+        }
+
+        return $.ajax({
+            type: "GET",
+            url: url,
+            dataType: 'json',
+            headers: headers
+        }).then(function (res, textStatus, xhr) {
+            self.etags[url] = xhr.getResponseHeader('ETag');
+            if (xhr.status === 304) {
+                return $.Deferred().promise();
+            }
+            return res;
+        });
+    }
+
     pollGame() {
         let self = this;
 
-        $.get(this.gameHandlerUrl)
+        this.poll(this.gameHandlerUrl)
             .done(function (res) {
                 self.checkGameStatus(res);
             });
@@ -92,6 +156,7 @@ class OwnerProvider extends PlayerProvider {
         this.isActive = settings.isActive;
         this.pollSessionProcess = null;
         this.pollGameProcess = null;
+        this.isGameEnded = false;
     }
 
     init(board) {
@@ -99,17 +164,12 @@ class OwnerProvider extends PlayerProvider {
 
         let self = this;
 
-        if (!this.isReady) {
-            this.pollSessionProcess = setInterval(function () {
-                self.pollSession();
-            }, 5000);
+        if (!this.subscribe()) {
+            this.startPolling();
         }
 
         if (this.isActive) {
             this.pollGame();
-            this.pollGameProcess = setInterval(function () {
-                self.pollGame();
-            }, 5000);
         }
 
         this.board.on('click', '#start', function () {
@@ -117,21 +177,60 @@ class OwnerProvider extends PlayerProvider {
             self.clearBoard();
             $.post(self.sessionHandlerUrl)
                 .done(function () {
+                    self.isActive = true;
+                    self.isGameEnded = false;
                     self.pollGame();
-                    self.pollGameProcess = setInterval(function () {
-                        self.pollGame();
-                    }, 5000);
+                    if (self.eventSource === null) {
+                        self.startPollingGame();
+                    }
                 });
         });
 
     }
 
+    startPolling() {
+        let self = this;
+
+        if (!this.isReady) {
+            this.pollSessionProcess = setInterval(function () {
+                self.pollSession();
+            }, 5000);
+        }
+
+        if (this.isActive) {
+            this.startPollingGame();
+        }
+    }
+
+    startPollingGame() {
+        let self = this;
+
+        clearInterval(this.pollGameProcess);
+        this.pollGameProcess = setInterval(function () {
+            self.pollGame();
+        }, 5000);
+    }
+
+    onEventsOpen() {
+        if (this.isActive) {
+            this.pollGame();
+        }
+        if (!this.isReady) {
+            this.pollSession();
+        }
+    }
+
+    onSessionEvent() {
+        this.pollSession();
+    }
+
     pollSession() {
         let self = this;
 
-        $.get(this.sessionHandlerUrl)
+        this.poll(this.sessionHandlerUrl)
             .done(function (res) {
                 if (res.isReady) {
+                    self.isReady = true;
                     clearInterval(self.pollSessionProcess);
                     self.board.find('#start').prop('disabled', false);
                     self.board.find('#invite').hide();
@@ -140,6 +239,11 @@ class OwnerProvider extends PlayerProvider {
     }
 
     onGameEnd(response) {
+        // Game events keep arriving after our own last move ended the game
+        if (this.isGameEnded) {
+            return;
+        }
+        this.isGameEnded = true;
         super.onGameEnd(response);
         if (response.winner) {
             alert(response.winner + ' won!');
@@ -164,6 +268,14 @@ class OpponentProvider extends PlayerProvider {
         let self = this;
 
         self.pollGame();
+        if (!this.subscribe()) {
+            this.startPolling();
+        }
+    }
+
+    startPolling() {
+        let self = this;
+
         setInterval(function () {
             self.pollGame();
         }, 5000);
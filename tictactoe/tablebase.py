@@ -0,0 +1,204 @@
+import mmap
+import os
+import random
+import struct
+from typing import Dict, Iterator, Optional, Tuple
+
+from django.conf import settings
+
+from tictactoe.engines.base import get_bits
+from tictactoe.exceptions import EngineError
+from tictactoe.fields import get_cell_line_masks
+
+
+MAGIC = b'TTTB'
+
+HEADER = struct.Struct('<4sBBB')
+
+# Outcomes for the side to move, stored in the upper bits of every entry. The
+# lower MOVE_BITS bits hold the best move. Zero marks an unreachable or
+# finished position.
+WIN, DRAW, LOSS = 1, 2, 3
+
+MOVE_BITS = 5
+
+INVERSE = {WIN: LOSS, DRAW: DRAW, LOSS: WIN}
+
+VERSION = 1
+
+
+def get_powers(size: int) -> Tuple[int, ...]:
+    return tuple(3 ** bit for bit in range(size * size))
+
+
+def get_index(size: int, first: int, second: int) -> int:
+    """
+    Return the base-3 index of a position: a slot holds 0 when empty, 1 for
+    the first player and 2 for the second player.
+    """
+    powers = get_powers(size)
+    return sum(powers[bit] for bit in get_bits(first)) + 2 * sum(powers[bit] for bit in get_bits(second))
+
+
+def get_path(size: int, win_length: int) -> str:
+    return os.path.join(settings.TICTACTOE_TABLEBASE_DIR, f'{size}x{size}-{win_length}.tb')
+
+
+class TablebaseGenerator:
+    """
+    Solves every position reachable from the empty board by a depth-first
+    search that memoizes the results in the table itself. All moves are
+    expanded, also after a winning move was found, so positions reached by
+    weaker play are in the table as well.
+    """
+
+    def __init__(self, size: int, win_length: int):
+        if size * size >= 1 << MOVE_BITS:
+            raise EngineError(f'Board too large for a tablebase: {size}x{size}')
+
+        self.size = size
+        self.win_length = win_length
+        self.full = (1 << (size * size)) - 1
+        self.powers = get_powers(size)
+        self.cell_lines = get_cell_line_masks(size, win_length)
+        self.table = bytearray(3 ** (size * size))
+        self.positions = 0
+
+    def generate(self) -> bytearray:
+        self.solve(0, 0, 0, 0)
+        return self.table
+
+    def solve(self, index: int, first: int, second: int, turn: int) -> int:
+        masks = [first, second]
+        free = self.full & ~(first | second)
+        best, best_bit = LOSS, None
+        for bit in get_bits(free):
+            move = 1 << bit
+            mask = masks[turn] | move
+            if any(mask & line == line for line in self.cell_lines[bit]):
+                outcome = WIN
+            elif not free & ~move:
+                outcome = DRAW
+            else:
+                child_index = index + self.powers[bit] * (turn + 1)
+                entry = self.table[child_index]
+                if entry:
+                    child = entry >> MOVE_BITS
+                elif turn:
+                    child = self.solve(child_index, first, mask, 0)
+                else:
+                    child = self.solve(child_index, mask, second, 1)
+                outcome = INVERSE[child]
+            if best_bit is None or outcome < best:
+                best, best_bit = outcome, bit
+        self.table[index] = (best << MOVE_BITS) | best_bit
+        self.positions += 1
+        return best
+
+    def write(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fh:
+            fh.write(HEADER.pack(MAGIC, VERSION, self.size, self.win_length))
+            fh.write(self.table)
+
+
+class Tablebase:
+    """
+    Read-only view of a tablebase file. The file is memory-mapped, so every
+    process shares a single copy through the page cache.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as fh:
+            self.data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size, self.win_length = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise EngineError(f'Invalid tablebase: {path}')
+
+    def __len__(self):
+        return len(self.data) - HEADER.size
+
+    def __getitem__(self, index: int) -> int:
+        return self.data[HEADER.size + index]
+
+    def lookup(self, first: int, second: int) -> Tuple[int, Optional[int]]:
+        """
+        Return the outcome for the side to move and the best move.
+        """
+        entry = self[get_index(self.size, first, second)]
+        if not entry:
+            return 0, None
+        return entry >> MOVE_BITS, entry & ((1 << MOVE_BITS) - 1)
+
+    def positions(self) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield the index, first and second player masks of every solved
+        position.
+        """
+        for index in range(len(self)):
+            if self[index]:
+                first = second = 0
+                value = index
+                for bit in range(self.size * self.size):
+                    value, cell = divmod(value, 3)
+                    if cell == 1:
+                        first |= 1 << bit
+                    elif cell == 2:
+                        second |= 1 << bit
+                yield index, first, second
+
+
+tablebases: Dict[Tuple[int, int], Tablebase] = {}
+
+
+def get_tablebase(size: int, win_length: int) -> Tablebase:
+    key = (size, win_length)
+    if key not in tablebases:
+        path = get_path(size, win_length)
+        if not os.path.exists(path):
+            raise EngineError(f'No tablebase for {size}x{size} with {win_length} in a row')
+        tablebases[key] = Tablebase(path)
+    return tablebases[key]
+
+
+def brute_force(size: int, win_length: int, first: int, second: int, bit: int = None) -> int:
+    """
+    Solve a position by plain minimax, without any memoization. When `bit`
+    is given, return the outcome of playing that move instead.
+    """
+    full = (1 << (size * size)) - 1
+    cell_lines = get_cell_line_masks(size, win_length)
+
+    def play(own: int, other: int, bit: int) -> int:
+        mask = own | (1 << bit)
+        if any(mask & line == line for line in cell_lines[bit]):
+            return WIN
+        if mask | other == full:
+            return DRAW
+        return INVERSE[solve(other, mask)]
+
+    def solve(own: int, other: int) -> int:
+        return min(play(own, other, bit) for bit in get_bits(full & ~(own | other)))
+
+    own, other = (first, second) if first.bit_count() == second.bit_count() else (second, first)
+    return solve(own, other) if bit is None else play(own, other, bit)
+
+
+def sample_positions(tablebase: Tablebase, samples: int, seed: int = 0) -> Iterator[Tuple[int, int, int]]:
+    """
+    Yield solved positions reached by random play, deep enough to be solved
+    by brute force.
+    """
+    rng = random.Random(seed)
+    size = tablebase.size
+    full = (1 << (size * size)) - 1
+    found = 0
+    while found < samples:
+        masks = [0, 0]
+        for turn in range(rng.randint(max(1, size * size - 8), size * size - 1)):
+            free = list(get_bits(full & ~(masks[0] | masks[1])))
+            masks[turn % 2] |= 1 << rng.choice(free)
+        index = get_index(size, *masks)
+        if tablebase[index]:
+            found += 1
+            yield index, masks[0], masks[1]
@@ -6,6 +6,7 @@ from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from django.views.generic import TemplateView
 
+from tictactoe.events import publish_session
 from tictactoe.forms import GameSessionForm, InviteForm, PlayerForm
 from tictactoe.mail import send_invite_mail
 from tictactoe.models import Game, GameSession, Player
@@ -16,6 +17,10 @@ class IndexView(TemplateView):
 
     template_name = 'index.html'
 
+    def get_context_data(self, **kwargs):
+        kwargs.setdefault('max_board_size', settings.TICTACTOE_MAX_BOARD_SIZE)
+        return super().get_context_data(**kwargs)
+
     def post(self, request, *args, **kwargs):
         form = self.get_form(request.POST or None)
         if form.is_valid():
@@ -52,6 +57,7 @@ class SessionView(TemplateView):
         form = self.get_form(request.POST or None)
         if form.is_valid():
             player = form.save()
+            publish_session(self.session)
             SessionHandlerFactory.create(self.session, request).set('player_id', player.player_id)
             return redirect(reverse('tictactoe:session_game', args=[self.session.session_id]))
 
@@ -102,8 +108,30 @@ class SessionGameView(TemplateView):
             session=session,
             player=player,
             game=game,
+            board_rows=self.get_board_rows(session.board_size),
+            cell_width=f'{100 / session.board_size:.4f}',
             symbol=settings.TICTACTOE_PLAYER_SYMBOLS[0],
             session_handler_url=reverse('tictactoe:api:session_handler', args=[session.session_id]),
+            session_events_url=reverse('tictactoe:api:session_events', args=[session.session_id]),
             game_handler_url=reverse('tictactoe:api:game_handler', args=[session.session_id])
         )
         return self.render_to_response(context)
+
+    @staticmethod
+    def get_board_rows(size: int):
+        def get_position(index, names):
+            return names[0] if index == 0 else names[2] if index == size - 1 else names[1]
+
+        return [
+            [
+                {
+                    'id': f'cell-{x}-{y}',
+                    'position': '-'.join([
+                        get_position(y, ('left', 'center', 'right')),
+                        get_position(x, ('top', 'middle', 'bottom'))
+                    ])
+                }
+                for y in range(size)
+            ]
+            for x in range(size)
+        ]
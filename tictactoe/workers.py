@@ -0,0 +1,86 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from django.db import close_old_connections
+
+from tictactoe.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedExecutor:
+    """
+    Runs tasks on a pool of threads with at most max_pending tasks queued or
+    running. A task submitted beyond that runs in the calling thread, which
+    slows the caller down instead of growing the queue. Without workers every
+    task runs in the calling thread.
+    """
+
+    name: str
+
+    max_workers: int
+
+    max_pending: int
+
+    executor: Optional[ThreadPoolExecutor]
+
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.executor = None
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max(max_pending, 1))
+        self.queue_depth = registry.gauge(f'{name}.queue_depth')
+        self.completed = registry.counter(f'{name}.completed')
+        self.failed = registry.counter(f'{name}.failed')
+        self.rejected = registry.counter(f'{name}.rejected')
+
+    def submit(self, task: Callable, *args):
+        if not self.try_submit(task, *args):
+            self.run(task, *args)
+
+    def try_submit(self, task: Callable, *args) -> bool:
+        """
+        Queue the task, returns False without running it when the queue is full.
+        """
+        if self.max_workers < 1:
+            return False
+        if not self.slots.acquire(blocking=False):
+            self.rejected.inc()
+            return False
+        self.queue_depth.inc()
+        self.get_executor().submit(self.run_queued, task, *args)
+        return True
+
+    def run(self, task: Callable, *args):
+        try:
+            task(*args)
+        except Exception:
+            self.failed.inc()
+            logger.exception('%s task failed', self.name)
+        else:
+            self.completed.inc()
+
+    def run_queued(self, task: Callable, *args):
+        close_old_connections()
+        try:
+            self.run(task, *args)
+        finally:
+            close_old_connections()
+            self.queue_depth.dec()
+            self.slots.release()
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix=self.name)
+            return self.executor
+
+    def shutdown(self, wait: bool = True):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)